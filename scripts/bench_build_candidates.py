@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Benchmark: gap-fill candidate generation, per-pair scans vs lock table.
+
+Builds synthetic cohorts (seeded, so runs are comparable) with the features
+the §5 filters care about — US/CN split, organizations, benchmarks only one
+country or one vendor reports, locale-suffixed names — and times
+``gap_fill_benchmarks.build_candidates`` against the previous implementation,
+kept below as ``reference_build_candidates``. The reference re-scanned the
+whole cohort for the origin and vendor locks of every (benchmark, gap) pair,
+O(B·N²), so it is only run up to ``--reference-max-models``; wherever both
+run, their candidate lists must be identical (same candidates, same order).
+
+Usage:
+    python scripts/bench_build_candidates.py [--sizes 20x60 100x150 1000x300] [--repeat 3]
+"""
+import argparse
+import random
+import statistics
+import time
+from dataclasses import astuple, dataclass
+from typing import Any, List, Tuple
+
+from gap_fill_benchmarks import (
+    GapCandidate,
+    QUALIFIED_THRESHOLD,
+    _fingerprint,
+    _has_value,
+    assign_tier,
+    build_candidates,
+    get_top_cohort,
+    is_locale_blocked,
+)
+from leaderboard_cells import CellStore
+
+DEFAULT_SIZES = ["20x60", "100x150", "250x300", "1000x300"]
+
+
+@dataclass
+class _Entry:
+    name: str
+    country: str
+    url: str
+    columns: CellStore
+
+
+def make_cohort(n_models: int, n_benchmarks: int, seed: int = 0) -> Tuple[List[_Entry], List[str]]:
+    rng = random.Random(seed)
+    orgs = [f"Org{i}" for i in range(max(4, n_models // 8))]
+    suffixes = ["", "", "", "", "", "", "-zh", "-en", "-ja"]
+    headers = [f"Bench{j}{rng.choice(suffixes)}" for j in range(n_benchmarks)]
+
+    # Per-benchmark shape: overall coverage, and whether only one country or
+    # one vendor reports it (which is what the §5 locks look for).
+    shapes = []
+    for _ in headers:
+        roll = rng.random()
+        lock = "country" if roll < 0.15 else "vendor" if roll < 0.25 else None
+        shapes.append((rng.uniform(0.2, 0.95), lock, rng.choice(["US", "CN"]), rng.choice(orgs)))
+
+    entries = []
+    for i in range(n_models):
+        country = "US" if i % 2 == 0 else "CN"
+        org = rng.choice(orgs)
+        cells = {"Organization": org, "Input$/M": "1.0", "Output$/M": "2.0"}
+        for b, (coverage, lock, lock_country, lock_org) in zip(headers, shapes):
+            if lock == "country" and country != lock_country:
+                continue
+            if lock == "vendor" and org != lock_org:
+                continue
+            cells[b] = f"{rng.uniform(10, 95):.1f}%" if rng.random() < coverage else rng.choice(["—", "-", ""])
+        entries.append(_Entry(f"model-{i}", country, f"/models/{i}", CellStore(cells)))
+    return entries, headers
+
+
+# The pre-index implementation, verbatim apart from inlining the lock helpers.
+def _origin_lock(benchmark: str, entries: List[Any]):
+    reporters = [e for e in entries if _has_value(e, benchmark)]
+    if not reporters:
+        return None
+    origins = {e.country for e in reporters}
+    return next(iter(origins)) if len(origins) == 1 else None
+
+
+def _vendor_internal_org(benchmark: str, entries: List[Any]):
+    reporters = [e for e in entries if _has_value(e, benchmark)]
+    if not reporters:
+        return None
+    orgs = {e.columns.get("Organization", "") for e in reporters if e.columns.get("Organization")}
+    return next(iter(orgs)) if len(orgs) == 1 else None
+
+
+def reference_build_candidates(combined_entries, benchmark_headers, enabled_tiers=frozenset({1, 2})):
+    top_cohort = get_top_cohort(combined_entries)
+    top_cohort_names = {(e.name, e.country) for e in top_cohort}
+    candidates: List[GapCandidate] = []
+    for benchmark in benchmark_headers:
+        top_cohort_count = sum(1 for e in top_cohort if _has_value(e, benchmark))
+        cohort_count = sum(1 for e in combined_entries if _has_value(e, benchmark))
+        tier = assign_tier(top_cohort_count)
+        if tier == 0 or tier not in enabled_tiers:
+            continue
+        for entry in combined_entries:
+            if _has_value(entry, benchmark):
+                continue
+            locked = _origin_lock(benchmark, combined_entries)
+            if locked is not None and locked != entry.country:
+                continue
+            if is_locale_blocked(entry.country, benchmark):
+                continue
+            vendor = _vendor_internal_org(benchmark, combined_entries)
+            if vendor is not None and entry.columns.get("Organization", "") != vendor:
+                continue
+            candidates.append(GapCandidate(
+                model_name=entry.name, model_country=entry.country, model_url=entry.url,
+                organization=entry.columns.get("Organization", ""), benchmark=benchmark,
+                cohort_count=cohort_count, top_cohort_count=top_cohort_count, tier=tier,
+                model_released=str(entry.columns.get("Released", "") or ""),
+                model_fingerprint=_fingerprint(entry, benchmark_headers),
+            ))
+    candidates.sort(key=lambda c: (
+        c.tier,
+        0 if (c.model_name, c.model_country) in top_cohort_names else 1,
+        max(0, QUALIFIED_THRESHOLD - c.top_cohort_count),
+        -c.top_cohort_count,
+    ))
+    return candidates
+
+
+def _time(fn, repeat: int):
+    runs = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - t0)
+    return statistics.median(runs) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gap-fill candidate generation")
+    parser.add_argument("--sizes", nargs="*", default=DEFAULT_SIZES, help="MODELSxBENCHMARKS cohort sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (median reported)")
+    parser.add_argument("--reference-max-models", type=int, default=250,
+                        help="Skip the O(B·N²) reference above this many models")
+    args = parser.parse_args()
+
+    print(f"{'cohort':>10} {'candidates':>11} {'reference ms':>13} {'lock table ms':>14}")
+    for size in args.sizes:
+        n_models, n_benchmarks = (int(x) for x in size.lower().split("x"))
+        entries, headers = make_cohort(n_models, n_benchmarks)
+
+        new_ms, got = _time(lambda: build_candidates(entries, headers), args.repeat)
+        if n_models <= args.reference_max_models:
+            ref_ms, expected = _time(lambda: reference_build_candidates(entries, headers), 1)
+            if [astuple(c) for c in got] != [astuple(c) for c in expected]:
+                raise SystemExit(f"{size}: candidate lists differ ({len(got)} vs {len(expected)})")
+            ref = f"{ref_ms:>13.1f}"
+            note = f"  ({ref_ms / new_ms:.0f}× faster, identical)"
+        else:
+            ref, note = f"{'skipped':>13}", ""
+        print(f"{size:>10} {len(got):>11,} {ref} {new_ms:>14.1f}{note}")
+
+
+if __name__ == "__main__":
+    main()
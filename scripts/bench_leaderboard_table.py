@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark: reading the leaderboard table cell by cell vs in one page.evaluate.
+
+Every ElementHandle call (``query_selector_all``, ``inner_text``,
+``inner_html``, ``get_attribute``) is a round trip between Python and the
+browser. The per-element reader needs roughly rows × columns of them; the
+bulk reader needs one. This loads a synthetic table shaped like llm-stats'
+(a Rank / Model / Country prefix, a Multimodal icon column, benchmark
+columns) into headless Chromium with ``page.set_content``, so there's no
+network involved, and for each size reports:
+
+- round trips, counted by proxying the page and every handle it returns;
+- median wall time over ``--repeat`` reads;
+- whether both readers returned the same rows.
+
+Usage:
+    python scripts/bench_leaderboard_table.py [--rows 20 100 300] [--columns 40] [--repeat 5]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from playwright.sync_api import sync_playwright  # noqa: E402
+from scrape_models import read_leaderboard_table, read_leaderboard_table_elements  # noqa: E402
+
+# ElementHandle / Page methods that cross to the browser.
+_ROUND_TRIPS = frozenset({"query_selector", "query_selector_all", "inner_text", "inner_html", "get_attribute", "evaluate"})
+
+
+class _Counted:
+    """A Page or ElementHandle that counts its round trips (and those of the handles it returns)."""
+
+    def __init__(self, target: Any, counter: List[int]):
+        self._target = target
+        self._counter = counter
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [self._wrap(v) for v in value]
+        if value is not None and hasattr(value, "inner_text"):
+            return _Counted(value, self._counter)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name not in _ROUND_TRIPS:
+            return attr
+
+        def call(*args, **kwargs):
+            self._counter[0] += 1
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
+
+def synthetic_table(rows: int, columns: int) -> str:
+    """A leaderboard-shaped table: Rank, Model, Country, Multimodal, then benchmarks."""
+    benchmarks = [f"Bench {j}" for j in range(max(0, columns - 4))]
+    head = "".join(f"<th>{h}</th>" for h in ["Rank", "Model", "Country", "Multimodal"] + benchmarks)
+    body = []
+    for i in range(rows):
+        flag = "🇺🇸" if i % 3 else "🇨🇳"
+        icon = '<svg class="lucide lucide-check text-green-500"></svg>' if i % 2 else '<svg class="lucide lucide-x"></svg>'
+        cells = [str(i + 1), f'<a href="/models/model-{i}">Model {i}</a>', flag, icon]
+        cells += [f"{(i * 7 + j * 13) % 1000 / 10:.1f}%" if (i + j) % 5 else "-" for j in range(len(benchmarks))]
+        body.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>")
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{''.join(body)}</tbody></table>"
+
+
+def measure(page: Any, reader: Callable[[Any], Tuple[list, list]], repeat: int) -> Tuple[int, float, Tuple[list, list]]:
+    """(round trips per read, median seconds per read, the last result)."""
+    counter = [0]
+    counted = _Counted(page, counter)
+    times = []
+    result = None
+    for _ in range(repeat):
+        counter[0] = 0
+        t0 = time.perf_counter()
+        result = reader(counted)
+        times.append(time.perf_counter() - t0)
+    return counter[0], statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-cell vs bulk leaderboard table reads")
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        try:
+            print(f"{'rows':>5} {'cols':>5}  {'reader':<9} {'round trips':>12} {'median ms':>10}  same")
+            for rows in args.rows:
+                page.set_content(synthetic_table(rows, args.columns))
+                per_cell = measure(page, read_leaderboard_table_elements, args.repeat)
+                bulk = measure(page, read_leaderboard_table, args.repeat)
+                same = "yes" if per_cell[2] == bulk[2] else "NO"
+                for label, (trips, seconds, _) in (("per-cell", per_cell), ("evaluate", bulk)):
+                    print(f"{rows:>5} {args.columns:>5}  {label:<9} {trips:>12,} {seconds * 1000:>10.1f}  {same}")
+                print(f"{'':>12}speedup {per_cell[1] / bulk[1]:.1f}x, {per_cell[0] - bulk[0]:,} round trips saved")
+        finally:
+            browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark: full json.load vs SnapshotReader for reading the latest snapshot.
+
+Each scenario runs in a fresh interpreter so peak RSS is measured in
+isolation; the reported RSS is the child's peak minus an empty interpreter's
+(that has imported the same modules), i.e. what reading the history costs.
+
+Scenarios, for every history file present:
+
+- ``json.load``  — what generate_og_image / post_to_instagram used to do.
+- ``cold``       — SnapshotReader with no sidecar index (builds and saves it).
+- ``warm``       — SnapshotReader with the index already on disk.
+- ``get(i)``     — warm, reading one snapshot from the middle of the history.
+
+Usage:
+    python scripts/bench_snapshot_reader.py [--repeat 5] [--files models.json data/history.ndjson ...]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+WORKSPACE = SCRIPTS_DIR.parent
+
+DEFAULT_FILES = ["models.json", "data/history.ndjson", "data/history.delta.ndjson"]
+
+# Executed in the child. Imports happen before the baseline RSS sample so
+# only the read itself is measured.
+_CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, {scripts!r})
+import snapshot_reader
+from pathlib import Path
+
+path = Path({path!r})
+mode = {mode!r}
+if mode == "cold":
+    snapshot_reader.index_path_for(path).unlink(missing_ok=True)
+
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+if mode == "json.load":
+    with open(path) as f:
+        data = json.load(f)
+    snap = data["history"][0]
+elif mode == "get(i)":
+    with snapshot_reader.SnapshotReader(path) as r:
+        snap = r.get(len(r) // 2)
+else:
+    with snapshot_reader.SnapshotReader(path) as r:
+        snap = r.latest()
+elapsed = time.perf_counter() - t0
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_kb": peak - base, "models": sum(map(len, snap["teams"].values()))}}))
+"""
+
+
+def run_child(path: Path, mode: str) -> dict:
+    code = _CHILD.format(scripts=str(SCRIPTS_DIR), path=str(path), mode=mode)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def bench_file(path: Path, repeat: int) -> None:
+    modes = ["json.load", "cold", "warm", "get(i)"]
+    if path.suffix == ".ndjson":
+        # A log isn't a JSON document; the equivalent full read is history_store's.
+        modes.remove("json.load")
+    print(f"\n{path.relative_to(WORKSPACE)} ({path.stat().st_size:,} bytes)")
+    print(f"  {'mode':<10} {'median ms':>10} {'peak ΔRSS':>12}")
+    baseline = None
+    for mode in modes:
+        runs = [run_child(path, mode) for _ in range(repeat)]
+        ms = statistics.median(r["seconds"] for r in runs) * 1000
+        rss = statistics.median(r["rss_kb"] for r in runs)
+        note = ""
+        if baseline is None:
+            baseline = (ms, rss)
+        else:
+            note = f"  ({baseline[0] / ms:.1f}× faster" + (f", {baseline[1] / rss:.0f}× less RSS)" if rss else ")")
+        print(f"  {mode:<10} {ms:>10.2f} {rss / 1024:>9.1f} MB{note}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SnapshotReader against a full json.load")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario (median reported)")
+    parser.add_argument("--files", nargs="*", default=DEFAULT_FILES, help="History files, relative to the repo root")
+    args = parser.parse_args()
+
+    found = False
+    for name in args.files:
+        path = WORKSPACE / name
+        if path.exists():
+            found = True
+            bench_file(path, args.repeat)
+    if not found:
+        print("No history files found to benchmark.")
+
+
+if __name__ == "__main__":
+    main()
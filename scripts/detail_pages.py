@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Fetching llm-stats model detail pages for Stage 3 enrichment.
+
+enrich_with_metadata used to visit the 20 detail pages one after another on
+the scraper's single page: ``goto``, wait for the DOM, sleep a second, read
+the HTML. Almost all of that time is spent waiting on the network and the
+settle delay, so it parallelizes well. DetailPageFetcher separates getting a
+page from using it:
+
+- **prefetch** queues every URL of the cohort (US then CN) up front. With
+  ``workers > 1`` a pool of worker threads loads them concurrently. Each
+  worker owns its own Playwright instance, browser and page, because the
+  sync API can't be shared across threads. At most ``per_host`` loads run
+  against one host at a time.
+- **get** blocks until one URL's page is available. enrich_with_metadata
+  asks for its entries in cohort order and merges them one by one, so the
+  shared canonical header map is resolved exactly as in the sequential
+  version, and the output doesn't depend on which load finished first.
+
+Enrichment only reads the meta description and the Next.js flight payload,
+and both are in the server-rendered HTML. So by default (``mode="http"``) a
+page is first fetched with a pooled ``requests.Session``, without
+navigating, rendering or re-serializing it in Chromium, and without the
+settle delay. The browser is only used for pages whose response doesn't
+carry the payload (FLIGHT_MARKER): an error status, a bot-check page, a
+changed site. Those go to the browser pool, which is started on the first
+fallback, so a run where every fetch succeeds never launches an extra
+browser. ``mode="browser"`` loads every page in Chromium, as before.
+
+``workers=1`` keeps the old behaviour: no threads, every page is loaded on
+demand, and a browser load uses the scraper's own page. A worker whose browser
+fails to launch just stops; if none is left, the URLs still queued are loaded
+on the scraper's page instead.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from playwright.sync_api import sync_playwright
+
+DETAIL_FETCH_MODES = ("http", "browser")
+DEFAULT_DETAIL_WORKERS = 4
+# Concurrent page loads against one host, whatever the pool size.
+MAX_DETAIL_LOADS_PER_HOST = 4
+DETAIL_PAGE_TIMEOUT_MS = 60000
+# Let the page finish hydrating after domcontentloaded.
+DETAIL_SETTLE_SECONDS = 1
+DETAIL_HTTP_TIMEOUT_SECONDS = 30
+DETAIL_USER_AGENT = "aiolympics-scraper/1.0 (+https://github.com/aiolympics)"
+# Next.js streams the flight payload into the HTML through this global. A
+# response without it has nothing to parse, so the page goes to the browser.
+FLIGHT_MARKER = "self.__next_f"
+
+
+@dataclass
+class DetailPage:
+    """What enrichment reads from one detail page."""
+    url: str
+    html: str = ""
+    description: Optional[str] = None
+    error: Optional[str] = None
+
+
+def load_detail_page(page, url: str) -> DetailPage:
+    """Navigate ``page`` to ``url`` and read its meta description and HTML."""
+    try:
+        page.goto(url, timeout=DETAIL_PAGE_TIMEOUT_MS)
+        page.wait_for_load_state("domcontentloaded")
+        time.sleep(DETAIL_SETTLE_SECONDS)
+    except Exception as e:
+        return DetailPage(url, error=str(e))
+
+    description = None
+    try:
+        desc_elem = page.query_selector("meta[name='description']")
+        if desc_elem:
+            description = desc_elem.get_attribute("content")
+    except Exception:
+        pass
+    try:
+        html = page.content()
+    except Exception:
+        html = ""
+    return DetailPage(url, html=html, description=description)
+
+
+class _MetaDescription(HTMLParser):
+    """The content of the first ``<meta name="description">``."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.content: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta" and self.content is None:
+            values = dict(attrs)
+            if (values.get("name") or "").lower() == "description":
+                self.content = values.get("content")
+
+
+def meta_description(html: str) -> Optional[str]:
+    head_end = html.find("</head>")
+    parser = _MetaDescription()
+    parser.feed(html[:head_end] if head_end >= 0 else html)
+    return parser.content
+
+
+def fetch_detail_page(session: requests.Session, url: str) -> Optional[DetailPage]:
+    """The page from a plain GET, or None if it needs the browser (error, no payload)."""
+    try:
+        resp = session.get(url, timeout=DETAIL_HTTP_TIMEOUT_SECONDS)
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+    if "charset" not in (resp.headers.get("Content-Type") or "").lower():
+        resp.encoding = "utf-8"  # Next.js pages are UTF-8; requests would assume Latin-1
+    html = resp.text
+    if FLIGHT_MARKER not in html:
+        return None
+    return DetailPage(url, html=html, description=meta_description(html))
+
+
+class _BrowserUnavailable(Exception):
+    """A pool worker couldn't start its browser; its URLs go back to the caller."""
+
+
+def _claim(future: Future) -> bool:
+    """Take ``future`` for loading. An HTTP task that fell back has already
+    claimed it, so the browser worker finishes the same future."""
+    if future.cancelled():
+        return False
+    return future.running() or future.set_running_or_notify_cancel()
+
+
+class DetailPageFetcher:
+    """Detail pages by URL, loaded by a pool of browsers or on the scraper's page."""
+
+    def __init__(
+        self,
+        page,
+        workers: int = DEFAULT_DETAIL_WORKERS,
+        *,
+        mode: str = "http",
+        headless: bool = True,
+        per_host: int = MAX_DETAIL_LOADS_PER_HOST,
+    ):
+        if mode not in DETAIL_FETCH_MODES:
+            raise ValueError(f"mode must be one of {DETAIL_FETCH_MODES}, got {mode!r}")
+        self.page = page
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.headless = headless
+        self.per_host = max(1, per_host)
+        self.fetched = 0  # pages served from the HTTP fetch
+        self.browser_loads = 0  # pages that needed Chromium
+        self._session: Optional[requests.Session] = None
+        self._http_pool: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._running = 0  # pool workers that haven't stopped
+        self._browsers_gone = False  # the last one has; no more browser loads in the pool
+        self._browser_urls = 0  # URLs ever queued for the browser pool
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _worker(self) -> None:
+        try:
+            with sync_playwright() as p:
+                try:
+                    browser = p.chromium.launch(headless=self.headless)
+                    page = browser.new_page()
+                except Exception as e:
+                    print(f"  Warning: detail-page worker couldn't start a browser - {e}")
+                    self._stopped(e)
+                    return
+                try:
+                    while not self._closed.is_set():
+                        url = self._queue.get()
+                        if url is None:
+                            break
+                        future = self._futures[url]
+                        if not _claim(future):
+                            continue
+                        with self._slot(url):
+                            detail = load_detail_page(page, url)
+                        with self._lock:
+                            self.browser_loads += 1
+                        future.set_result(detail)
+                finally:
+                    browser.close()
+        except Exception as e:
+            print(f"  Warning: detail-page worker stopped - {e}")
+            self._stopped(e)
+            return
+        self._stopped(None)
+
+    def _stopped(self, error: Optional[Exception]) -> None:
+        """Once the last worker is gone, hand every queued URL back to ``get``."""
+        with self._lock:
+            self._running -= 1
+            if self._running:
+                return
+            self._browsers_gone = True
+        reason = _BrowserUnavailable(str(error) if error else "pool closed")
+        while True:
+            try:
+                url = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if url is not None and _claim(self._futures[url]):
+                self._futures[url].set_exception(reason)
+
+    def _start_browsers(self) -> None:
+        """One browser per URL sent to the pool so far, up to ``workers``."""
+        with self._lock:
+            wanted = min(self.workers, self._browser_urls) - len(self._threads)
+            if self._closed.is_set() or wanted <= 0:
+                return
+            for _ in range(wanted):
+                thread = threading.Thread(
+                    target=self._worker, name=f"detail-page-{len(self._threads) + 1}", daemon=True
+                )
+                self._threads.append(thread)
+                self._running += 1
+                thread.start()
+
+    def _to_browser(self, url: str) -> None:
+        with self._lock:
+            gone = self._browsers_gone
+            if not gone:
+                self._browser_urls += 1
+                self._queue.put(url)
+        if gone:
+            self._futures[url].set_exception(_BrowserUnavailable("browser pool stopped"))
+        else:
+            self._start_browsers()
+
+    def _http_session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers["User-Agent"] = DETAIL_USER_AGENT
+            adapter = HTTPAdapter(pool_connections=self.per_host, pool_maxsize=max(self.workers, self.per_host))
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
+
+    def _fetch(self, url: str) -> Optional[DetailPage]:
+        with self._slot(url):
+            detail = fetch_detail_page(self._http_session(), url)
+        if detail is not None:
+            with self._lock:
+                self.fetched += 1
+        return detail
+
+    def _fetch_or_fall_back(self, url: str) -> None:
+        """Pool task: fetch ``url`` over HTTP, else queue it for the browser pool."""
+        future = self._futures[url]
+        if not _claim(future):
+            return
+        try:
+            detail = self._fetch(url)
+        except Exception:
+            detail = None
+        if detail is not None:
+            future.set_result(detail)
+        else:
+            self._to_browser(url)
+
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """Start loading ``urls`` in the background, in the given order."""
+        if self.workers == 1:
+            return
+        fresh = [u for u in dict.fromkeys(urls) if u and u not in self._futures]
+        for url in fresh:
+            self._futures[url] = Future()
+        if self.mode == "browser":
+            for url in fresh:
+                self._to_browser(url)
+            return
+        if self._http_pool is None:
+            self._http_pool = ThreadPoolExecutor(self.workers, thread_name_prefix="detail-fetch")
+        for url in fresh:
+            self._http_pool.submit(self._fetch_or_fall_back, url)
+
+    def get(self, url: str) -> DetailPage:
+        """The loaded page for ``url``, waiting for the pool if it's still loading."""
+        future = self._futures.get(url)
+        if future is not None:
+            try:
+                return future.result()
+            except _BrowserUnavailable:
+                pass
+        elif self.mode == "http":
+            detail = self._fetch(url)
+            if detail is not None:
+                return detail
+        self.browser_loads += 1
+        return load_detail_page(self.page, url)
+
+    def close(self) -> None:
+        """Stop the pools. Queued pages that haven't started are dropped."""
+        self._closed.set()
+        for future in self._futures.values():
+            future.cancel()
+        if self._http_pool is not None:
+            self._http_pool.shutdown(wait=True, cancel_futures=True)
+            self._http_pool = None
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -13,13 +13,26 @@ import json
 import os
 import re
 import time
-from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 import requests
 
+from gap_fill_cache import GapFillCache
+from gap_fill_ledger import BudgetLedger, Estimate, parse_usage
+from gap_fill_nulls import NullHistory, model_fingerprint
+from gap_fill_priority import WhatIfScorer
+from gap_fill_sources import EXTRACTOR_NAME, MAX_SOURCE_URLS, SourceDocCache, extract_score, usable_url
+from gap_fill_ttl import UNCACHED_BUCKET, TtlPolicy, TtlStats
+from leaderboard_cells import MISSING_VALUE_MARKERS, CellStore
+from participation_index import ParticipationIndex
+from rate_limiter import RateLimiter
+
 
 # -----------------------------------------------------------------------------
 # Constants from the spec
@@ -37,13 +50,29 @@ DEFAULT_MODEL_CHAIN: List[str] = ["gpt-5.4", "gpt-5.4-pro", "gpt-5.3"]
 REASONING_EFFORT = "low"
 DEFAULT_MAX_CALLS = 40
 
-# Minimum seconds between successive OpenAI calls. Each call consumes ~9K input
-# tokens because the web_search tool injects fetched page content into the
-# prompt context, so firing calls back-to-back concentrates token usage and
-# trips per-second rate limits even when the per-minute budget is fine.
-# 1.5 seconds between calls → ~40 calls/minute → ~360K tokens/minute, which
-# sits comfortably inside the 500K-per-minute TPM envelope.
+# Minimum seconds between successive OpenAI call *starts*, across all workers.
+# Each call consumes ~9K input tokens because the web_search tool injects
+# fetched page content into the prompt context, so firing calls back-to-back
+# concentrates token usage and trips per-second rate limits even when the
+# per-minute budget is fine. 1.5 seconds between calls → ~40 calls/minute →
+# ~360K tokens/minute, which sits comfortably inside the 500K-per-minute TPM
+# envelope. Calls may still overlap: each one spends tens of seconds in
+# web_search, and that wait is what the worker pool parallelizes.
 REQUEST_INTERVAL_SECONDS = 1.5
+RATE_LIMIT_TPM = 500_000
+# Token reservation for a call before any call in the run has reported its
+# `usage`; after that the limiter reserves the measured mean.
+ESTIMATED_TOKENS_PER_CALL = 9_000
+# Concurrent in-flight calls. Override with --gap-fill-workers; 1 is serial.
+DEFAULT_GAP_FILL_WORKERS = 4
+
+# Confidence levels, lowest first. A fill is applied when its confidence is at
+# least the pass's min_confidence (--gap-fill-min-confidence).
+CONFIDENCE_LEVELS: Tuple[str, ...] = ("low", "medium", "high")
+# What the source-page extractor's fills are recorded as. Its regex and table
+# matches haven't been checked against enough real pages to rank with a
+# high-confidence LLM answer, so the default min_confidence drops them.
+EXTRACTED_CONFIDENCE = "medium"
 
 # The top-tier reference for tiering is the full scraped cohort: top 10 of each
 # country by llm-stats raw leaderboard rank, combined → 20 models total. The
@@ -56,27 +85,51 @@ TIER_1_FLOOR = 15            # 15 of 20 (75%) — one fill from qualifying
 TIER_2_FLOOR = 8             # 8 of 20 (40%) — within reach with several fills
 # Tier 3 = ≤ 7 of 20, permanently off in v1.
 
-POSITIVE_CACHE_TTL_DAYS = 30
+# Positive results stay cached for as long as gap_fill_ttl's policy table
+# allows (by source type, confidence and model age; --gap-fill-ttl-policy).
 # Note: we deliberately do NOT cache negative results. A null score today
 # might get published tomorrow, and the gap-fill pass's whole point is to
-# discover newly-available scores. Re-querying nulls every run is the
-# correct trade-off (freshness > API cost).
+# discover newly-available scores. Cells that stay null are re-asked on an
+# exponential backoff instead (gap_fill_nulls), reset whenever the model's
+# llm-stats row changes.
 
 LOCALE_SUFFIXES: Tuple[str, ...] = ("-zh", "-ja", "-ko", "-de", "-fr", "-es", "-en")
 
-OPENAI_RESPONSES_URL = "https://api.openai.com/v1/responses"
-OPENAI_MODELS_URL = "https://api.openai.com/v1/models"
+# Every endpoint is resolved against OPENAI_BASE_URL when it is set, so the
+# whole pass can run offline against scripts/openai_stub_server.py.
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+# "sync" calls the Responses API directly; "batch" submits the same requests
+# through the Batch API (half price, separate rate limits, results within
+# BATCH_COMPLETION_WINDOW) and applies them on a later run.
+GAP_FILL_MODES: Tuple[str, ...] = ("sync", "batch")
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_PENDING_STATUSES: FrozenSet[str] = frozenset({"validating", "in_progress", "finalizing", "cancelling"})
+
+# Which lookups the call budget goes to first. "value" ranks them by the
+# expected change to the Pass 2 qualified set / top 10 per predicted token
+# (gap_fill_priority); "heuristic" keeps _group_by_model's fixed order.
+GAP_FILL_PRIORITIES: Tuple[str, ...] = ("value", "heuristic")
+
+# How gaps are grouped into lookups. "model" asks about one model per call.
+# "organization" asks about several models of the same organization in one
+# call, since their scores usually sit on the same vendor pages and a
+# single web_search session can read them all. Merged lookups are capped so
+# the answer stays well inside max_output_tokens.
+GAP_FILL_GROUPINGS: Tuple[str, ...] = ("model", "organization")
+MAX_MODELS_PER_LOOKUP = 3
+MAX_BENCHMARKS_PER_LOOKUP = 12
 
 REPO_ROOT = Path(__file__).parent.parent
 DATA_DIR = REPO_ROOT / "data"
-CACHE_FILE = DATA_DIR / "ai_gap_cache.json"
+CACHE_FILE = DATA_DIR / "ai_gap_cache.json"  # export of CACHE_LOG_FILE, same shape as ever
+CACHE_LOG_FILE = DATA_DIR / "ai_gap_cache.ndjson"
 AUDIT_FILE = DATA_DIR / "ai_fill_history.jsonl"
-
-# Mirror of MISSING_VALUE_MARKERS in scrape_models.py. Kept in sync manually
-# because importing across modules creates a circular dep at the helper level.
-MISSING_VALUE_MARKERS: FrozenSet[str] = frozenset(
-    {"", "-", "\u2013", "\u2014", "n/a", "N/A", "null", "None"}
-)
+BATCH_STATE_FILE = DATA_DIR / "ai_gap_batch.json"
+BATCH_INPUT_FILE = DATA_DIR / "ai_gap_batch_requests.jsonl"
+LEDGER_FILE = DATA_DIR / "ai_gap_ledger.jsonl"
+NULLS_FILE = DATA_DIR / "ai_gap_nulls.json"
+SOURCES_DIR = DATA_DIR / "ai_gap_sources"  # fetched source pages (not committed)
 
 
 # -----------------------------------------------------------------------------
@@ -95,6 +148,8 @@ class GapCandidate:
     cohort_count: int       # full cohort coverage (out of 20)
     top_cohort_count: int   # top-tier reference coverage (out of 20)
     tier: int               # 1, 2, or 3 (3 is permanently off)
+    model_released: str = ""  # llm-stats "Released" month, for the cache TTL
+    model_fingerprint: str = ""  # resets the cell's null backoff when it changes
 
 
 # -----------------------------------------------------------------------------
@@ -102,6 +157,12 @@ class GapCandidate:
 # -----------------------------------------------------------------------------
 
 
+def openai_url(path: str) -> str:
+    """Absolute URL for an API path like "/responses", honoring OPENAI_BASE_URL."""
+    base = os.environ.get("OPENAI_BASE_URL") or DEFAULT_OPENAI_BASE_URL
+    return base.rstrip("/") + path
+
+
 def resolve_openai_key() -> Optional[str]:
     """Read OPENAI_API_KEY from the environment.
 
@@ -113,21 +174,12 @@ def resolve_openai_key() -> Optional[str]:
     return key if key else None
 
 
-def load_cache() -> Dict[str, Dict[str, Any]]:
-    if not CACHE_FILE.exists():
-        return {}
-    try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError) as e:
-        print(f"[gap-fill] Warning: corrupted ai_gap_cache.json ({e}); starting fresh")
-        return {}
-
+def load_cache(policy: Optional[TtlPolicy] = None) -> GapFillCache:
+    """Open the cache log (seeding it from ai_gap_cache.json on first use).
 
-def save_cache(cache: Dict[str, Dict[str, Any]]) -> None:
-    DATA_DIR.mkdir(exist_ok=True)
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+    ``policy`` decides which entries compaction treats as expired.
+    """
+    return GapFillCache(CACHE_LOG_FILE, CACHE_FILE, partial(cache_is_fresh, policy=policy)).load()
 
 
 def append_audit_entry(entry: Dict[str, Any]) -> None:
@@ -136,8 +188,16 @@ def append_audit_entry(entry: Dict[str, Any]) -> None:
         f.write(json.dumps(entry, ensure_ascii=False) + "\n")
 
 
-def cache_is_fresh(entry: Dict[str, Any], now: datetime) -> bool:
-    """Whether a cached entry is still within its TTL.
+def cache_is_fresh(
+    entry: Dict[str, Any],
+    now: datetime,
+    policy: Optional[TtlPolicy] = None,
+    released: Any = None,
+) -> bool:
+    """Whether a cached entry is still within the TTL ``policy`` gives it.
+
+    ``policy`` defaults to gap_fill_ttl.DEFAULT_TTL_POLICY. ``released`` is
+    the model's llm-stats release month, for entries that predate storing it.
 
     Only positive entries (score is not None) are cached at all — we
     deliberately do NOT cache null/missing results because a vendor may
@@ -145,16 +205,7 @@ def cache_is_fresh(entry: Dict[str, Any], now: datetime) -> bool:
     If an old negative entry is still in the file from an earlier version,
     treat it as expired so it gets re-queried.
     """
-    if entry.get("score") is None:
-        return False
-    cached_at_str = entry.get("cached_at")
-    if not cached_at_str:
-        return False
-    try:
-        cached_at = datetime.fromisoformat(cached_at_str)
-    except ValueError:
-        return False
-    return (now - cached_at) < timedelta(days=POSITIVE_CACHE_TTL_DAYS)
+    return (policy or TtlPolicy()).is_fresh(entry, now, released)
 
 
 # -----------------------------------------------------------------------------
@@ -163,17 +214,24 @@ def cache_is_fresh(entry: Dict[str, Any], now: datetime) -> bool:
 
 
 def _has_value(entry: Any, benchmark: str) -> bool:
-    val = entry.columns.get(benchmark, "")
-    return str(val).strip() not in MISSING_VALUE_MARKERS
+    cells = entry.columns
+    if isinstance(cells, CellStore):
+        return cells.is_reported(benchmark)
+    return str(cells.get(benchmark, "")).strip() not in MISSING_VALUE_MARKERS
+
+
+def build_gap_index(entries: List[Any], benchmark_headers: List[str]) -> ParticipationIndex:
+    """Reporter bitsets under gap-fill's notion of a value (see _has_value)."""
+    return ParticipationIndex(entries, benchmark_headers, reported=True)
 
 
 def origin_lock(benchmark: str, entries: List[Any]) -> Optional[str]:
-    """If every reporter belongs to a single country, return that country."""
-    reporters = [e for e in entries if _has_value(e, benchmark)]
-    if not reporters:
-        return None
-    origins = {e.country for e in reporters}
-    return next(iter(origins)) if len(origins) == 1 else None
+    """If every reporter belongs to a single country, return that country.
+
+    One-off form; loops over many benchmarks should build one index with
+    build_gap_index and ask it directly.
+    """
+    return build_gap_index(entries, [benchmark]).origin_lock(benchmark)
 
 
 def is_origin_blocked(model_origin: str, benchmark: str, entries: List[Any]) -> bool:
@@ -207,11 +265,7 @@ def is_locale_blocked(model_country: str, benchmark: str) -> bool:
 
 def vendor_internal_org(benchmark: str, entries: List[Any]) -> Optional[str]:
     """If every reporter belongs to a single Organization, return it."""
-    reporters = [e for e in entries if _has_value(e, benchmark)]
-    if not reporters:
-        return None
-    orgs = {e.columns.get("Organization", "") for e in reporters if e.columns.get("Organization")}
-    return next(iter(orgs)) if len(orgs) == 1 else None
+    return build_gap_index(entries, [benchmark]).vendor_internal_org(benchmark)
 
 
 def is_vendor_blocked(entry: Any, benchmark: str, entries: List[Any]) -> bool:
@@ -240,7 +294,7 @@ def get_top_cohort(combined_entries: List[Any]) -> List[Any]:
 
 
 def count_cohort_participation(benchmark: str, top_cohort: List[Any]) -> int:
-    return sum(1 for e in top_cohort if _has_value(e, benchmark))
+    return build_gap_index(top_cohort, [benchmark]).count(benchmark)
 
 
 def assign_tier(cohort_count: int) -> int:
@@ -262,19 +316,65 @@ def assign_tier(cohort_count: int) -> int:
     return 3
 
 
+def build_lock_table(
+    index: ParticipationIndex,
+    benchmark_headers: List[str],
+) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """Per benchmark, its (origin lock, vendor-internal org) — §5.1 and §5.4.
+
+    Both depend only on the benchmark's reporters, so they're computed once
+    per benchmark instead of once per (benchmark, gap) pair.
+    """
+    return {b: (index.origin_lock(b), index.vendor_internal_org(b)) for b in benchmark_headers}
+
+
+def _fillable_mask(index: ParticipationIndex, benchmark: str, lock: Tuple[Optional[str], Optional[str]]) -> int:
+    """Entries missing ``benchmark`` that survive the §5.1 / §5.2 / §5.4 filters."""
+    gaps = index.all_mask & ~index.reporters(benchmark)
+    origin, vendor = lock
+    if origin is not None:
+        gaps &= index.country_mask[origin]
+    if vendor is not None:
+        gaps &= index.org_mask[vendor]
+    for country, mask in index.country_mask.items():
+        if is_locale_blocked(country, benchmark):
+            gaps &= ~mask
+    return gaps
+
+
+def _fingerprint(entry: Any, benchmark_headers: List[str]) -> str:
+    """model_fingerprint of an entry's llm-stats row (cells gap-fill wrote don't count)."""
+    provenance = entry.columns.get("_provenance")
+    filled = {b for b, p in provenance.items() if p.get("source") == "ai_filled"} if isinstance(provenance, dict) else set()
+    reported = [b for b in benchmark_headers if b not in filled and _has_value(entry, b)]
+    return model_fingerprint(entry.url, str(entry.columns.get("Released", "") or ""), reported)
+
+
 def build_candidates(
     combined_entries: List[Any],
     benchmark_headers: List[str],
     enabled_tiers: FrozenSet[int] = frozenset({1, 2}),
 ) -> List[GapCandidate]:
-    """Build the gap candidate list with §5 filters and §6 tiering applied."""
+    """Build the gap candidate list with §5 filters and §6 tiering applied.
+
+    Works on bit rows rather than per-pair scans: the lock table gives each
+    benchmark's origin / vendor lock once, and each benchmark's gap row
+    (entries not reporting it, minus everyone a filter blocks) is a handful
+    of mask operations. Only surviving gaps are materialized, in cohort order.
+    """
     top_cohort = get_top_cohort(combined_entries)
     top_cohort_names = {(e.name, e.country) for e in top_cohort}
-    candidates: List[GapCandidate] = []
+    index = build_gap_index(combined_entries, benchmark_headers)
+    top_mask = index.mask_of(top_cohort)
+    locks = build_lock_table(index, benchmark_headers)
+    # Matches on (name, country) like the sort always has, so a duplicate-named
+    # row outside the top cohort still sorts with it.
+    in_top = [(e.name, e.country) in top_cohort_names for e in combined_entries]
+    fingerprints: Dict[int, str] = {}
+    keyed: List[Tuple[Tuple[int, int, int, int], GapCandidate]] = []
 
     for benchmark in benchmark_headers:
-        top_cohort_count = count_cohort_participation(benchmark, top_cohort)
-        cohort_count = sum(1 for e in combined_entries if _has_value(e, benchmark))
+        top_cohort_count = index.count(benchmark, top_mask)
         tier = assign_tier(top_cohort_count)
 
         # §5.5 already-qualified filter
@@ -284,32 +384,29 @@ def build_candidates(
         if tier not in enabled_tiers:
             continue
 
-        for entry in combined_entries:
-            if _has_value(entry, benchmark):
-                continue  # not a gap
-
-            # §5.1 origin lock
-            if is_origin_blocked(entry.country, benchmark, combined_entries):
-                continue
-            # §5.2 locale suffix
-            if is_locale_blocked(entry.country, benchmark):
-                continue
-            # §5.4 vendor-internal lock
-            if is_vendor_blocked(entry, benchmark, combined_entries):
-                continue
-
-            candidates.append(
-                GapCandidate(
-                    model_name=entry.name,
-                    model_country=entry.country,
-                    model_url=entry.url,
-                    organization=entry.columns.get("Organization", ""),
-                    benchmark=benchmark,
-                    cohort_count=cohort_count,
-                    top_cohort_count=top_cohort_count,
-                    tier=tier,
-                )
+        cohort_count = index.count(benchmark)
+        gaps = _fillable_mask(index, benchmark, locks[benchmark])
+        distance = max(0, QUALIFIED_THRESHOLD - top_cohort_count)
+        while gaps:
+            low = gaps & -gaps
+            gaps ^= low
+            i = low.bit_length() - 1
+            entry = combined_entries[i]
+            if i not in fingerprints:
+                fingerprints[i] = _fingerprint(entry, benchmark_headers)
+            candidate = GapCandidate(
+                model_name=entry.name,
+                model_country=entry.country,
+                model_url=entry.url,
+                organization=entry.columns.get("Organization", ""),
+                benchmark=benchmark,
+                cohort_count=cohort_count,
+                top_cohort_count=top_cohort_count,
+                tier=tier,
+                model_released=str(entry.columns.get("Released", "") or ""),
+                model_fingerprint=fingerprints[i],
             )
+            keyed.append(((tier, 0 if in_top[i] else 1, distance, -top_cohort_count), candidate))
 
     # Sort priority within candidates:
     #   1. tier ascending (T1 first)
@@ -317,15 +414,8 @@ def build_candidates(
     #   3. distance to qualifying ascending (closer first)
     #   4. top_cohort_count descending (tie-breaker: prefer benchmarks with
     #      higher coverage within their tier)
-    candidates.sort(
-        key=lambda c: (
-            c.tier,
-            0 if (c.model_name, c.model_country) in top_cohort_names else 1,
-            max(0, QUALIFIED_THRESHOLD - c.top_cohort_count),
-            -c.top_cohort_count,
-        )
-    )
-    return candidates
+    keyed.sort(key=lambda kc: kc[0])
+    return [c for _, c in keyed]
 
 
 # -----------------------------------------------------------------------------
@@ -344,7 +434,7 @@ def discover_available_model(api_key: str, chain: Optional[List[str]] = None) ->
         chain = DEFAULT_MODEL_CHAIN
     headers = {"Authorization": f"Bearer {api_key}"}
     try:
-        resp = requests.get(OPENAI_MODELS_URL, headers=headers, timeout=10)
+        resp = requests.get(openai_url("/models"), headers=headers, timeout=10)
         if resp.status_code != 200:
             print(f"[gap-fill] /v1/models returned {resp.status_code}; trying chain[0] blindly")
             return chain[0]
@@ -428,6 +518,33 @@ def build_prompt_batch(
     return _SYSTEM_PROMPT, user
 
 
+def build_prompt_models(organization: str, models: List[Tuple[str, str, str, List[str]]]) -> Tuple[str, str]:
+    """Build (system, user) messages for one lookup covering several models.
+
+    ``models`` holds (name, country, llm-stats url, benchmarks) per model, all
+    from ``organization``. The system message is the same `_SYSTEM_PROMPT`,
+    so multi-model calls share the cached prefix with per-model ones. The
+    user message repeats the per-model block of build_prompt_batch once per
+    model, after one line asking for the results to be kept apart.
+    """
+    blocks = []
+    for name, country, url, benchmarks in models:
+        bench_list = "\n".join(f"  - {b}" for b in benchmarks)
+        blocks.append(
+            f"Model: {name}\n"
+            f"Country: {country}\n"
+            f"llm-stats page: {url}\n"
+            f"Benchmarks:\n{bench_list}"
+        )
+    user = (
+        f"Organization: {organization or 'unknown'}\n"
+        "Several models, one results entry per model. A score reported for one "
+        "of them is never a score for another.\n\n"
+        + "\n\n".join(blocks)
+    )
+    return _SYSTEM_PROMPT, user
+
+
 _RESULT_SCHEMA_PROPERTIES = {
     "benchmark": {"type": "string"},
     "score": {"type": ["string", "null"]},
@@ -453,23 +570,45 @@ _RESULT_REQUIRED = [
     "confidence",
     "notes",
 ]
+_MODEL_RESULTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "model": {"type": "string"},
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": _RESULT_SCHEMA_PROPERTIES,
+                "required": _RESULT_REQUIRED,
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["model", "results"],
+    "additionalProperties": False,
+}
+# Multi-model lookups wrap one _MODEL_RESULTS_SCHEMA object per model.
+_MODELS_SCHEMA = {
+    "type": "object",
+    "properties": {"models": {"type": "array", "items": _MODEL_RESULTS_SCHEMA}},
+    "required": ["models"],
+    "additionalProperties": False,
+}
 
 
-def query_openai_responses(
+def build_responses_body(
     system: str,
     user: str,
     *,
     model: str,
-    api_key: str,
     max_output_tokens: int = 1200,
-    max_retries: int = 6,
-) -> Optional[Dict[str, Any]]:
-    """Single Responses API call with retries. Returns parsed JSON or None.
+    multi_model: bool = False,
+) -> Dict[str, Any]:
+    """Request body for one batched lookup, shared by sync calls and Batch API lines.
 
     The schema expects a batched response: one `model` field and a `results`
-    array with one entry per benchmark asked about. Caller is responsible for
-    sizing `max_output_tokens` relative to the number of benchmarks in the
-    batch (the orchestrator does this below).
+    array with one entry per benchmark asked about. With ``multi_model`` it
+    expects a `models` array holding one such object per model instead.
     """
     # OpenAI quirks I learned the hard way:
     # 1. gpt-5.4-pro rejects `temperature`. Reasoning models pick their own.
@@ -478,7 +617,7 @@ def query_openai_responses(
     # 3. The schema must be `strict: true` and every field must be in `required`,
     #    even nullable ones — set the field's type to ["string", "null"] if it
     #    can be null, but keep it in the required array.
-    body = {
+    return {
         "model": model,
         "input": [
             {"role": "system", "content": system},
@@ -491,48 +630,66 @@ def query_openai_responses(
         "text": {
             "format": {
                 "type": "json_schema",
-                "name": "benchmark_lookup_batch",
+                "name": "benchmark_lookup_models" if multi_model else "benchmark_lookup_batch",
                 "strict": True,
-                "schema": {
-                    "type": "object",
-                    "properties": {
-                        "model": {"type": "string"},
-                        "results": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": _RESULT_SCHEMA_PROPERTIES,
-                                "required": _RESULT_REQUIRED,
-                                "additionalProperties": False,
-                            },
-                        },
-                    },
-                    "required": ["model", "results"],
-                    "additionalProperties": False,
-                },
+                "schema": _MODELS_SCHEMA if multi_model else _MODEL_RESULTS_SCHEMA,
             }
         },
         "store": False,
     }
+
+
+def query_openai_responses(
+    system: str,
+    user: str,
+    *,
+    model: str,
+    api_key: str,
+    max_output_tokens: int = 1200,
+    max_retries: int = 6,
+    limiter: Optional[RateLimiter] = None,
+    multi_model: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """Single Responses API call with retries. Returns parsed JSON or None.
+
+    Caller is responsible for sizing `max_output_tokens` relative to the
+    number of benchmarks in the batch (see max_output_tokens_for).
+
+    With a shared ``limiter``, every attempt waits for request and token
+    budget first, reports the tokens it actually used, and a 429 pauses all
+    workers for its Retry-After instead of only this one.
+    """
+    body = build_responses_body(
+        system, user, model=model, max_output_tokens=max_output_tokens, multi_model=multi_model
+    )
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
 
     for attempt in range(max_retries):
+        reserved = limiter.acquire() if limiter else 0
         try:
-            resp = requests.post(OPENAI_RESPONSES_URL, headers=headers, json=body, timeout=120)
+            resp = requests.post(openai_url("/responses"), headers=headers, json=body, timeout=120)
         except requests.RequestException as e:
+            if limiter:
+                limiter.settle(reserved, None)
             print(f"[gap-fill] network error ({e}); retry {attempt + 1}/{max_retries}")
             time.sleep(2 ** attempt)
             continue
 
         if resp.status_code == 200:
             try:
-                return resp.json()
+                data = resp.json()
             except ValueError as e:
                 print(f"[gap-fill] invalid JSON in 200 response: {e}")
-                return None
+                data = None
+            if limiter:
+                used = usage_tokens(data) if data is not None else None
+                limiter.settle(reserved, reserved if used is None else used)
+            return data
+        if limiter:
+            limiter.settle(reserved, None)
         if resp.status_code == 429:
             # Honor Retry-After if present. Add exponential backoff on top so
             # repeated 429s back off rather than hammer at a fixed interval.
@@ -542,7 +699,10 @@ def query_openai_responses(
                 retry_after = 0.0
             backoff = max(retry_after, 2.0 * (2 ** attempt))
             print(f"[gap-fill] 429 rate limit; sleeping {backoff:.1f}s (attempt {attempt + 1}/{max_retries})")
-            time.sleep(backoff)
+            if limiter:
+                limiter.pause(backoff)
+            else:
+                time.sleep(backoff)
             continue
         if 500 <= resp.status_code < 600:
             print(f"[gap-fill] {resp.status_code} from OpenAI; retry {attempt + 1}/{max_retries}")
@@ -555,6 +715,20 @@ def query_openai_responses(
     return None
 
 
+def usage_tokens(raw: Dict[str, Any]) -> Optional[int]:
+    """Total tokens billed for a Responses API result, from its `usage` block."""
+    usage = raw.get("usage") if isinstance(raw, dict) else None
+    if not isinstance(usage, dict):
+        return None
+    total = usage.get("total_tokens")
+    if isinstance(total, int):
+        return total
+    parts = [usage.get("input_tokens"), usage.get("output_tokens")]
+    if all(isinstance(p, int) for p in parts):
+        return sum(parts)
+    return None
+
+
 def extract_json_from_response(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Pull the strict JSON object out of an OpenAI Responses API result.
 
@@ -740,6 +914,40 @@ def validate_batch_response(
     return out
 
 
+def validate_models_response(
+    parsed: Dict[str, Any],
+    expected: Dict[str, List[str]],
+) -> Optional[Dict[str, Dict[str, Dict[str, Any]]]]:
+    """Validate a multi-model response. Returns {model: {benchmark: validated_entry}}.
+
+    ``expected`` maps each model asked about to its benchmarks. Every object
+    in the `models` array is matched to one of those models (exact name
+    first, then case-insensitive) and its `results` go through
+    validate_batch_response, so validation stays per (model, benchmark).
+    Objects for models we didn't ask about are dropped. Returns None only if
+    there is no `models` array at all.
+    """
+    if not isinstance(parsed, dict):
+        return None
+    models = parsed.get("models")
+    if not isinstance(models, list):
+        return None
+
+    expected_lookup = {m.lower().strip(): m for m in expected}
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for item in models:
+        if not isinstance(item, dict):
+            continue
+        raw_model = str(item.get("model", "")).strip()
+        canonical = raw_model if raw_model in expected else expected_lookup.get(raw_model.lower())
+        if canonical is None:
+            continue
+        validated = validate_batch_response(item, expected[canonical])
+        if validated:
+            out.setdefault(canonical, {}).update(validated)
+    return out
+
+
 # -----------------------------------------------------------------------------
 # Orchestration
 # -----------------------------------------------------------------------------
@@ -826,6 +1034,814 @@ def _group_by_model(
     return items
 
 
+def _group_by_organization(
+    groups: List[Tuple[GapCandidate, List[GapCandidate]]],
+    max_models: int = MAX_MODELS_PER_LOOKUP,
+    max_benchmarks: int = MAX_BENCHMARKS_PER_LOOKUP,
+) -> List[Tuple[GapCandidate, List[GapCandidate]]]:
+    """Merge per-model groups of one organization into multi-model lookups.
+
+    Walks the groups in their _group_by_model order. Each one joins the
+    latest lookup of its (organization, country) while that lookup has room
+    for another model within ``max_models`` models and ``max_benchmarks``
+    gaps; otherwise it starts a new lookup. A merged lookup therefore keeps
+    the position, and representative, of its highest-priority model. Models
+    without an organization are never merged. The caps count gaps before the
+    cache is consulted, so a lookup can end up asking about fewer.
+    """
+    merged: List[Tuple[GapCandidate, List[GapCandidate]]] = []
+    latest: Dict[Tuple[str, str], int] = {}
+    for rep, cands in groups:
+        key = (rep.organization, rep.model_country)
+        i = latest.get(key) if rep.organization else None
+        if i is not None:
+            members = merged[i][1]
+            if (
+                len({c.model_name for c in members}) < max_models
+                and len(members) + len(cands) <= max_benchmarks
+            ):
+                members.extend(cands)
+                continue
+        latest[key] = len(merged)
+        merged.append((rep, list(cands)))
+    return merged
+
+
+def _lookup_models(batch_candidates: List[GapCandidate]) -> Dict[str, List[GapCandidate]]:
+    """The candidates of one lookup by model name, in the order the models first appear."""
+    by_model: Dict[str, List[GapCandidate]] = {}
+    for cand in batch_candidates:
+        by_model.setdefault(cand.model_name, []).append(cand)
+    return by_model
+
+
+def max_output_tokens_for(n_benchmarks: int) -> int:
+    """Size max_output_tokens to a batch of ``n_benchmarks``.
+
+    max_output_tokens on the Responses API is a hard cap on REASONING +
+    VISIBLE output combined. Reasoning models spend ~1500+ hidden tokens
+    per call even at `effort: "low"`, so the cap needs to be much bigger
+    than the visible-JSON estimate alone. Measured values on real calls:
+      - Reasoning overhead per call: ~1500–2500 tokens
+      - Visible JSON per result: ~200 tokens
+      - Schema/wrapper overhead: ~200 tokens
+    Floor of 5000 so single-benchmark batches still have headroom for
+    several web_search tool calls + reasoning between them without
+    risking a truncated final message item.
+    """
+    return max(5000, 2500 + 300 * n_benchmarks)
+
+
+@dataclass
+class GapFillStats:
+    """Counters reported at the end of a pass."""
+    cache_hits: int = 0
+    api_calls: int = 0
+    schema_failures: int = 0
+    fills_dropped_low_conf: int = 0
+    fills_accepted: int = 0
+    batch_results: int = 0
+    null_backoff_skips: int = 0
+    source_fills: int = 0
+    model_lookups: int = 0  # models the live calls covered; more than api_calls when grouped
+
+    def report(self) -> None:
+        print()
+        print(f"[gap-fill] cache hits              : {self.cache_hits}")
+        print(f"[gap-fill] live API calls          : {self.api_calls}")
+        if self.model_lookups > self.api_calls:
+            print(f"[gap-fill] calls saved by grouping : {self.model_lookups - self.api_calls} "
+                  f"({self.model_lookups} models in {self.api_calls} calls)")
+        print(f"[gap-fill] skipped, null backoff   : {self.null_backoff_skips}")
+        print(f"[gap-fill] from cached sources     : {self.source_fills}")
+        if self.batch_results:
+            print(f"[gap-fill] batch results collected : {self.batch_results}")
+        print(f"[gap-fill] schema failures         : {self.schema_failures}")
+        print(f"[gap-fill] dropped low-confidence  : {self.fills_dropped_low_conf}")
+        print(f"[gap-fill] fills accepted          : {self.fills_accepted}")
+
+
+@dataclass
+class _FillContext:
+    """What every way of applying results (cache, live call, batch) shares."""
+    combined_entries: List[Any]
+    cache: GapFillCache
+    now: datetime
+    model: str
+    min_confidence: str
+    scraper_run_ts: str
+    ledger: BudgetLedger
+    nulls: NullHistory
+    ttl: TtlPolicy = field(default_factory=TtlPolicy)
+    stats: GapFillStats = field(default_factory=GapFillStats)
+    ttl_stats: TtlStats = field(default_factory=TtlStats)
+    sources: Optional[SourceDocCache] = None
+
+
+# (representative, cache-resolved candidates with their cache entries,
+#  candidates that still need a lookup)
+PlannedGroup = Tuple[GapCandidate, List[Tuple[GapCandidate, Dict[str, Any]]], List[GapCandidate]]
+
+
+def _plan_groups(
+    groups: List[Tuple[GapCandidate, List[GapCandidate]]],
+    ctx: _FillContext,
+    max_calls: int,
+    order: Optional[Callable[[List[PlannedGroup]], List[PlannedGroup]]] = None,
+) -> List[PlannedGroup]:
+    """Split each group into cache-resolved vs needs-fetch, in priority order.
+
+    ``order``, if given, re-sorts the split groups before the cap is applied.
+    Once max_calls lookups are queued, later groups keep only their
+    cache-resolved cells, which cost nothing.
+    cache_is_fresh() only returns True for positive entries, so null scores
+    fall through to a lookup, unless the cell is still inside its null
+    backoff (counted in ``ctx.stats.null_backoff_skips``). ``ctx.ttl_stats``
+    gets a hit or miss per admitted candidate, under the TTL rule of its
+    cache entry.
+    """
+    split: List[PlannedGroup] = []
+    for rep, cands in groups:
+        cached: List[Tuple[GapCandidate, Dict[str, Any]]] = []
+        batch_candidates: List[GapCandidate] = []
+        for cand in cands:
+            cache_entry = ctx.cache.lookup(cand.model_name, cand.benchmark)
+            if cache_entry and cache_is_fresh(cache_entry, ctx.now, ctx.ttl, cand.model_released):
+                cached.append((cand, cache_entry))
+            elif ctx.nulls.is_due(cand.model_name, cand.benchmark, cand.model_fingerprint, ctx.now):
+                batch_candidates.append(cand)
+            else:
+                ctx.stats.null_backoff_skips += 1
+        if cached or batch_candidates:
+            split.append((rep, cached, batch_candidates))
+    if order is not None:
+        split = order(split)
+
+    plan: List[PlannedGroup] = []
+    planned_calls = 0
+    capped = False
+    for rep, cached, batch_candidates in split:
+        if batch_candidates and planned_calls >= max_calls:
+            if not capped:
+                print(f"[gap-fill] hit max_calls={max_calls}; no further lookups")
+                capped = True
+            batch_candidates = []
+            if not cached:
+                continue
+        if batch_candidates:
+            planned_calls += 1
+        plan.append((rep, cached, batch_candidates))
+        for cand, _ in cached:
+            ctx.ttl_stats.record(_ttl_bucket(ctx, cand), hit=True)
+        for cand in batch_candidates:
+            ctx.ttl_stats.record(_ttl_bucket(ctx, cand), hit=False)
+    if ctx.stats.null_backoff_skips:
+        print(f"[gap-fill] {ctx.stats.null_backoff_skips} cells skipped: null on recent lookups, not due again yet")
+    return plan
+
+
+def _ttl_bucket(ctx: _FillContext, cand: GapCandidate) -> str:
+    """The TTL rule a candidate's cache entry falls under, for ctx.ttl_stats."""
+    cache_entry = ctx.cache.lookup(cand.model_name, cand.benchmark)
+    rule = ctx.ttl.rule_for(cache_entry, ctx.now, cand.model_released) if cache_entry else None
+    return rule.name if rule else UNCACHED_BUCKET
+
+
+def _order_by_value(
+    plan: List[PlannedGroup],
+    scorer: WhatIfScorer,
+    ledger: BudgetLedger,
+) -> List[PlannedGroup]:
+    """Sort lookups by expected Pass 2 impact per predicted token, best first.
+
+    Cache-only groups cost nothing and keep the front. Ties, including every
+    lookup with no estimated impact, keep their _group_by_model order.
+    """
+    keyed = []
+    for position, group in enumerate(plan):
+        rep, _, batch_candidates = group
+        if not batch_candidates:
+            keyed.append(((0, 0.0, position), group))
+            continue
+        # Per-model impacts are summed for a multi-model lookup; each is
+        # scored as if it were the only fill.
+        impact = sum(
+            scorer.impact(cands[0].model_name, cands[0].model_country, [c.benchmark for c in cands])
+            for cands in _lookup_models(batch_candidates).values()
+        )
+        n = len(batch_candidates)
+        tokens = ledger.estimate(n, max_output_tokens_for(n)).tokens
+        keyed.append(((1, -impact / tokens, position), group))
+    keyed.sort(key=lambda item: item[0])
+    movers = sum(1 for key, _ in keyed if key[1] < 0)
+    print(f"[gap-fill] value ordering: {movers} of {sum(1 for _, _, b in plan if b)} lookups "
+          f"could move the Pass 2 qualified set or top {len(scorer.top)}")
+    return [group for _, group in keyed]
+
+
+def _cited_sources(ctx: _FillContext) -> Dict[str, Dict[str, str]]:
+    """Model name → {url: source_type} of every page cited for it, newest first.
+
+    Reads the gap cache and the audit log, so a page cited for a fill that
+    has since been superseded is still known.
+    """
+    cited: List[Tuple[str, str, str, str]] = []  # (ts, model, url, source_type)
+    for model, benchmarks in ctx.cache.export().items():
+        for entry in benchmarks.values():
+            cited.append((entry.get("cached_at") or "", model, entry.get("source_url"), entry.get("source_type") or ""))
+    if AUDIT_FILE.exists():
+        with open(AUDIT_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                cited.append((entry.get("ts") or "", entry.get("model"), entry.get("source_url"), entry.get("source_type") or ""))
+    by_model: Dict[str, Dict[str, str]] = {}
+    for _, model, url, source_type in sorted(cited, key=lambda c: c[0], reverse=True):
+        if model and usable_url(url):
+            by_model.setdefault(model, {}).setdefault(url, source_type)
+    return by_model
+
+
+def meets_confidence(confidence: str, min_confidence: str) -> bool:
+    """Whether a fill at ``confidence`` is applied under ``min_confidence``."""
+    rank = {level: i for i, level in enumerate(CONFIDENCE_LEVELS)}
+    return rank.get(confidence, 0) >= rank.get(min_confidence, len(CONFIDENCE_LEVELS) - 1)
+
+
+def _is_percent_benchmark(entries: List[Any], benchmark: str) -> bool:
+    values = [str(e.columns.get(benchmark, "")).strip() for e in entries if _has_value(e, benchmark)]
+    return sum(v.endswith("%") for v in values) * 2 > len(values)
+
+
+def _fill_from_sources(
+    ctx: _FillContext,
+    groups: List[Tuple[GapCandidate, List[GapCandidate]]],
+) -> List[Tuple[GapCandidate, List[GapCandidate]]]:
+    """Fill what cached source pages already answer; return the groups minus those cells.
+
+    For each candidate without a fresh cache entry, the pages cited for the
+    model (then for its organization's other models in the cohort) are read
+    through ``ctx.sources`` and handed to gap_fill_sources.extract_score. A
+    hit is cached and applied like an LLM result at EXTRACTED_CONFIDENCE,
+    with EXTRACTOR_NAME as its llm_model. Runs before planning, so answered
+    cells never use a call.
+    """
+    cited = _cited_sources(ctx)
+    siblings: Dict[str, List[str]] = {}
+    for e in ctx.combined_entries:
+        org = e.columns.get("Organization", "")
+        if org and e.name in cited:
+            siblings.setdefault(org, []).append(e.name)
+    percent: Dict[str, bool] = {}
+
+    remaining_groups = []
+    for rep, cands in groups:
+        pages = [(url, source_type, True) for url, source_type in cited.get(rep.model_name, {}).items()]
+        for sibling in siblings.get(rep.organization, []):
+            if sibling != rep.model_name:
+                pages += [(url, source_type, False) for url, source_type in cited[sibling].items()]
+        seen = set()
+        pages = [p for p in pages if not (p[0] in seen or seen.add(p[0]))][:MAX_SOURCE_URLS]
+        if not pages:
+            remaining_groups.append((rep, cands))
+            continue
+
+        remaining = []
+        for cand in cands:
+            cache_entry = ctx.cache.lookup(cand.model_name, cand.benchmark)
+            if cache_entry and cache_is_fresh(cache_entry, ctx.now, ctx.ttl, cand.model_released):
+                remaining.append(cand)  # _plan_groups applies it
+                continue
+            if cand.benchmark not in percent:
+                percent[cand.benchmark] = _is_percent_benchmark(ctx.combined_entries, cand.benchmark)
+            for url, source_type, own_page in pages:
+                doc = ctx.sources.get(url, ctx.now)
+                found = doc and extract_score(doc, cand.model_name, cand.benchmark,
+                                              own_page=own_page, percent=percent[cand.benchmark])
+                if found:
+                    break
+            else:
+                remaining.append(cand)
+                continue
+            score, how = found
+            print(f"[gap-fill] {cand.model_name} ({cand.model_country}): {cand.benchmark} found in a {how} on {url}")
+            entry = {
+                "benchmark": cand.benchmark,
+                "score": score,
+                "source_url": url,
+                "source_type": source_type or None,  # unknown when the citation had none
+                "confidence": EXTRACTED_CONFIDENCE,
+                "notes": f"extracted from a {how} on a previously cited page",
+            }
+            ctx.stats.source_fills += 1
+            _accept_result(ctx, cand, entry, EXTRACTOR_NAME)
+        if remaining:
+            remaining_groups.append((rep, remaining))
+    return remaining_groups
+
+
+def _prompt_for(rep: GapCandidate, batch_candidates: List[GapCandidate]) -> Tuple[str, str]:
+    by_model = _lookup_models(batch_candidates)
+    if len(by_model) > 1:
+        return build_prompt_models(
+            rep.organization,
+            [(cands[0].model_name, cands[0].model_country, cands[0].model_url, [c.benchmark for c in cands])
+             for cands in by_model.values()],
+        )
+    return build_prompt_batch(
+        model_name=rep.model_name,
+        model_country=rep.model_country,
+        model_url=rep.model_url,
+        organization=rep.organization,
+        benchmarks=[c.benchmark for c in batch_candidates],
+    )
+
+
+def _apply_cached(ctx: _FillContext, cached: List[Tuple[GapCandidate, Dict[str, Any]]]) -> None:
+    for cand, cache_entry in cached:
+        ctx.stats.cache_hits += 1
+        if cand.model_released and not cache_entry.get("model_released"):
+            # Cached before entries recorded the release month. Store it, so
+            # compaction judges the entry by the same TTL rule as this lookup.
+            cache_entry = {**cache_entry, "model_released": cand.model_released}
+            ctx.cache.put(cand.model_name, cand.benchmark, cache_entry)
+        if not meets_confidence(cache_entry.get("confidence", "low"), ctx.min_confidence):
+            ctx.stats.fills_dropped_low_conf += 1
+            continue
+        if _apply_fill(ctx.combined_entries, cand, cache_entry, cache_entry.get("llm_model", ctx.model)):
+            ctx.stats.fills_accepted += 1
+
+
+def _apply_response(
+    ctx: _FillContext,
+    raw: Dict[str, Any],
+    batch_candidates: List[GapCandidate],
+    llm_model: str,
+) -> None:
+    """Validate one lookup's Responses API result and apply it to its candidates.
+
+    A multi-model lookup is recognised by the `models` array in its answer,
+    not by its candidates: a collected batch result may have only one of its
+    models' cells still open.
+    """
+    parsed = extract_json_from_response(raw)
+    if parsed is None:
+        ctx.stats.schema_failures += 1
+        print("  → no valid JSON in response")
+        return
+
+    by_model = _lookup_models(batch_candidates)
+    multi_model = isinstance(parsed, dict) and "models" in parsed
+    if multi_model:
+        validated_by_model = validate_models_response(
+            parsed, {name: [c.benchmark for c in cands] for name, cands in by_model.items()}
+        )
+    else:
+        validated_map = validate_batch_response(parsed, [c.benchmark for c in batch_candidates])
+        validated_by_model = None if validated_map is None else {batch_candidates[0].model_name: validated_map}
+    if validated_by_model is None:
+        ctx.stats.schema_failures += 1
+        print("  → batch schema validation failed")
+        return
+
+    # Apply each validated result to its matching candidate
+    for cand in batch_candidates:
+        if multi_model and cand is by_model[cand.model_name][0]:
+            print(f"  {cand.model_name}:")
+        entry = validated_by_model.get(cand.model_name, {}).get(cand.benchmark)
+        if entry is None:
+            # Model omitted this benchmark from its response. Treat as a
+            # soft null — do NOT cache it, because a vendor may publish
+            # the missing score between now and the next scrape run.
+            print(f"  · {cand.benchmark}: omitted from response")
+            continue
+
+        # Null / missing scores are deliberately NOT cached — see
+        # cache_is_fresh() for the rationale (freshness over cost). They
+        # only push back the cell's next lookup (gap_fill_nulls).
+        if entry["score"] is None:
+            ctx.nulls.record_null(cand.model_name, cand.benchmark, cand.model_fingerprint, ctx.now)
+            print(f"  · {cand.benchmark}: null ({(entry.get('notes') or '')[:60]})")
+            continue
+        _accept_result(ctx, cand, entry, llm_model)
+
+
+def _accept_result(ctx: _FillContext, cand: GapCandidate, entry: Dict[str, Any], llm_model: str) -> bool:
+    """Cache a validated positive result and, if confident enough, fill the cell.
+
+    Returns True if the cell was filled.
+    """
+    ctx.nulls.clear(cand.model_name, cand.benchmark)
+
+    # Positive result: cache it so the next scrape can skip the call.
+    # The put is durable immediately, so a crash later in the pass
+    # doesn't lose it.
+    cache_entry = {**entry, "cached_at": ctx.now.isoformat(), "llm_model": llm_model}
+    if cand.model_released:
+        cache_entry["model_released"] = cand.model_released
+    ctx.cache.put(cand.model_name, cand.benchmark, cache_entry)
+
+    if not meets_confidence(entry["confidence"], ctx.min_confidence):
+        ctx.stats.fills_dropped_low_conf += 1
+        print(f"  · {cand.benchmark}: dropped (confidence={entry['confidence']})")
+        return False
+
+    if not _apply_fill(ctx.combined_entries, cand, entry, llm_model):
+        return False
+    append_audit_entry(
+        {
+            "ts": ctx.now.isoformat(),
+            "model": cand.model_name,
+            "benchmark": cand.benchmark,
+            "score": _format_score(entry["score"]),
+            "source_url": entry.get("source_url", ""),
+            "source_type": entry.get("source_type", ""),
+            "confidence": entry["confidence"],
+            "llm_model": llm_model,
+            "scraper_run": ctx.scraper_run_ts,
+        }
+    )
+    ctx.stats.fills_accepted += 1
+    print(
+        f"  · {cand.benchmark}: ACCEPTED {entry['score']} "
+        f"({(entry.get('source_url') or '')[:50]})"
+    )
+    return True
+
+
+def _announce_call(ctx: _FillContext, batch_candidates: List[GapCandidate], max_calls: int) -> None:
+    tier_summary = ",".join(f"T{c.tier}" for c in batch_candidates)
+    print(
+        f"[gap-fill] [{ctx.stats.api_calls}/{max_calls}] {_lookup_label(batch_candidates)} "
+        f"→ {len(batch_candidates)} benchmarks [{tier_summary}]"
+    )
+
+
+def _lookup_label(batch_candidates: List[GapCandidate]) -> str:
+    first = batch_candidates[0]
+    return f"{' + '.join(_lookup_models(batch_candidates))} ({first.model_country})"
+
+
+def _estimate_lookup(ctx: _FillContext, batch_candidates: List[GapCandidate]) -> Tuple[Estimate, Optional[str]]:
+    """Predicted cost of one lookup, and the budget it would break (None if it fits)."""
+    n = len(batch_candidates)
+    estimate = ctx.ledger.estimate(n, max_output_tokens_for(n))
+    return estimate, ctx.ledger.would_exceed(estimate)
+
+
+def _new_limiter() -> RateLimiter:
+    return RateLimiter(
+        requests_per_minute=60.0 / REQUEST_INTERVAL_SECONDS,
+        tokens_per_minute=RATE_LIMIT_TPM,
+        initial_tokens_per_call=ESTIMATED_TOKENS_PER_CALL,
+    )
+
+
+def _lookup_call(
+    ctx: _FillContext,
+    api_key: str,
+    limiter: RateLimiter,
+    rep: GapCandidate,
+    batch_candidates: List[GapCandidate],
+) -> Optional[Dict[str, Any]]:
+    """One live lookup; runs on a worker thread and only reads ``ctx``."""
+    system, user = _prompt_for(rep, batch_candidates)
+    return query_openai_responses(
+        system,
+        user,
+        model=ctx.model,
+        api_key=api_key,
+        max_output_tokens=max_output_tokens_for(len(batch_candidates)),
+        limiter=limiter,
+        multi_model=len(_lookup_models(batch_candidates)) > 1,
+    )
+
+
+def _run_sync_calls(
+    ctx: _FillContext,
+    plan: List[PlannedGroup],
+    api_key: str,
+    max_calls: int,
+    workers: int,
+    limiter: Optional[RateLimiter] = None,
+) -> None:
+    """Issue the planned lookups on a worker pool and apply them in plan order.
+
+    Up to ``workers`` calls are in flight at once, paced by one shared
+    RateLimiter. Results are applied in plan order as they are collected, so
+    the filled cells, cache and audit log don't depend on which call happened
+    to finish first.
+
+    Each lookup is admitted only if the ledger predicts it fits the token /
+    cost budget, counting in-flight calls at their prediction until their real
+    ``usage`` is recorded. A lookup that doesn't fit while calls are still in
+    flight waits for them to settle; the first one that doesn't fit on settled
+    usage alone stops any further calls. Cache hits of the remaining groups
+    are still applied, since they cost nothing. With more than one worker the
+    prediction a lookup is admitted on depends on how many earlier calls have
+    already settled, so exactly where a budget cuts off can vary by a call
+    between runs.
+
+    ``limiter`` is shared with calls made elsewhere in the pass (the
+    pipelined lookups); by default the calls get one of their own.
+    """
+    limiter = limiter or _new_limiter()
+    workers = max(1, workers)
+    planned_calls = sum(1 for _, _, batch_candidates in plan if batch_candidates)
+    if planned_calls:
+        print(f"[gap-fill] {planned_calls} live calls, {min(workers, planned_calls)} in flight at a time")
+
+    # (group, its future and admitted estimate — None for cache-only or
+    # over-budget groups), in plan order.
+    queued: deque = deque()
+    running: set = set()
+    next_group = 0
+    over_budget: Optional[str] = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gap-fill") as pool:
+        while True:
+            while next_group < len(plan) and len(running) < workers:
+                rep, cached, batch_candidates = plan[next_group]
+                future: Optional[Future] = None
+                estimate: Optional[Estimate] = None
+                if batch_candidates and over_budget is None:
+                    estimate, exceeded = _estimate_lookup(ctx, batch_candidates)
+                    if exceeded is not None and any(q[3] is not None for q in queued):
+                        break  # Decide once the calls still in flight have settled
+                    if exceeded is not None:
+                        over_budget = exceeded
+                        print(f"[gap-fill] next lookup ({_lookup_label(batch_candidates)}) would exceed the "
+                              f"{over_budget}; no further calls")
+                        estimate = None
+                    else:
+                        ctx.ledger.reserve(estimate)
+                        future = pool.submit(_lookup_call, ctx, api_key, limiter, rep, batch_candidates)
+                        running.add(future)
+                queued.append((rep, cached, batch_candidates, future, estimate))
+                next_group += 1
+
+            while queued and (queued[0][3] is None or queued[0][3].done()):
+                rep, cached, batch_candidates, future, estimate = queued.popleft()
+                _apply_cached(ctx, cached)
+                if future is None:
+                    continue  # Cache-resolved, or cut off by the budget
+
+                ctx.stats.api_calls += 1
+                ctx.stats.model_lookups += len(_lookup_models(batch_candidates))
+                _announce_call(ctx, batch_candidates, max_calls)
+                raw = future.result()
+                ctx.ledger.record(_lookup_label(batch_candidates), len(batch_candidates), parse_usage(raw), estimate)
+                if raw is not None:
+                    _apply_response(ctx, raw, batch_candidates, ctx.model)
+
+            if not queued and next_group >= len(plan):
+                break
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                running -= done
+
+
+# -----------------------------------------------------------------------------
+# OpenAI Batch API mode
+# -----------------------------------------------------------------------------
+
+
+def _openai_request(
+    method: str,
+    path: str,
+    api_key: str,
+    *,
+    max_retries: int = 4,
+    timeout: int = 60,
+    **kwargs: Any,
+) -> Optional[requests.Response]:
+    """One control-plane request (files / batches) with basic retries.
+
+    Returns the response on 2xx, None on anything else after retries.
+    """
+    headers = {"Authorization": f"Bearer {api_key}"}
+    for attempt in range(max_retries):
+        try:
+            resp = requests.request(method, openai_url(path), headers=headers, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            print(f"[gap-fill] network error on {path} ({e}); retry {attempt + 1}/{max_retries}")
+            time.sleep(2 ** attempt)
+            continue
+        if 200 <= resp.status_code < 300:
+            return resp
+        if resp.status_code == 429 or resp.status_code >= 500:
+            try:
+                retry_after = float(resp.headers.get("Retry-After", "0"))
+            except ValueError:
+                retry_after = 0.0
+            print(f"[gap-fill] {resp.status_code} on {path}; retry {attempt + 1}/{max_retries}")
+            time.sleep(max(retry_after, 2 ** attempt))
+            continue
+        print(f"[gap-fill] {method} {path} returned {resp.status_code}: {resp.text[:200]}")
+        return None
+    return None
+
+
+def load_batch_state() -> Optional[Dict[str, Any]]:
+    if not BATCH_STATE_FILE.exists():
+        return None
+    try:
+        with open(BATCH_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"[gap-fill] Warning: unreadable {BATCH_STATE_FILE.name} ({e}); ignoring it")
+        return None
+
+
+def save_batch_state(state: Optional[Dict[str, Any]]) -> None:
+    """Persist the submitted batch, or remove the state file when ``state`` is None."""
+    if state is None:
+        BATCH_STATE_FILE.unlink(missing_ok=True)
+        return
+    DATA_DIR.mkdir(exist_ok=True)
+    with open(BATCH_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+
+def write_batch_input(
+    calls: List[Tuple[GapCandidate, List[GapCandidate]]],
+    model: str,
+) -> List[Dict[str, Any]]:
+    """Serialize one Responses API request per lookup into BATCH_INPUT_FILE.
+
+    Returns the per-request metadata (custom_id → the candidates it covers)
+    that the collecting run needs to route results back.
+    """
+    requests_meta: List[Dict[str, Any]] = []
+    DATA_DIR.mkdir(exist_ok=True)
+    with open(BATCH_INPUT_FILE, "w", encoding="utf-8") as f:
+        for i, (rep, batch_candidates) in enumerate(calls):
+            custom_id = f"gap-{i:03d}"
+            system, user = _prompt_for(rep, batch_candidates)
+            body = build_responses_body(
+                system,
+                user,
+                model=model,
+                max_output_tokens=max_output_tokens_for(len(batch_candidates)),
+                multi_model=len(_lookup_models(batch_candidates)) > 1,
+            )
+            line = {"custom_id": custom_id, "method": "POST", "url": "/v1/responses", "body": body}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            requests_meta.append({"custom_id": custom_id, "candidates": [asdict(c) for c in batch_candidates]})
+    return requests_meta
+
+
+def submit_gap_fill_batch(
+    calls: List[Tuple[GapCandidate, List[GapCandidate]]],
+    *,
+    model: str,
+    api_key: str,
+    scraper_run_ts: str,
+) -> Optional[str]:
+    """Upload the lookups as a batch input file, create the batch, persist its id."""
+    requests_meta = write_batch_input(calls, model)
+    with open(BATCH_INPUT_FILE, "rb") as f:
+        upload = _openai_request(
+            "POST", "/files", api_key,
+            files={"file": (BATCH_INPUT_FILE.name, f, "application/jsonl")},
+            data={"purpose": "batch"},
+        )
+    if upload is None:
+        print("[gap-fill] batch input upload failed; nothing submitted")
+        return None
+    input_file_id = upload.json().get("id")
+
+    created = _openai_request(
+        "POST", "/batches", api_key,
+        json={
+            "input_file_id": input_file_id,
+            "endpoint": "/v1/responses",
+            "completion_window": BATCH_COMPLETION_WINDOW,
+            "metadata": {"purpose": "aiolympics gap-fill", "scraper_run": scraper_run_ts},
+        },
+    )
+    if created is None:
+        print("[gap-fill] batch creation failed; nothing submitted")
+        return None
+    batch_id = created.json().get("id")
+
+    save_batch_state(
+        {
+            "batch_id": batch_id,
+            "input_file_id": input_file_id,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "llm_model": model,
+            "scraper_run": scraper_run_ts,
+            "requests": requests_meta,
+        }
+    )
+    print(f"[gap-fill] submitted batch {batch_id} with {len(calls)} lookups; results are applied on a later run")
+    return batch_id
+
+
+def _admit_batch_calls(ctx: _FillContext, plan: List[PlannedGroup]) -> List[Tuple[GapCandidate, List[GapCandidate], Estimate]]:
+    """The planned lookups that fit the budget at batch pricing, in plan order.
+
+    Admitted lookups are counted as deferred spend: they are billed when the
+    batch runs, but they use up this run's budget now.
+    """
+    admitted = []
+    for rep, _, batch_candidates in plan:
+        if not batch_candidates:
+            continue
+        estimate, over_budget = _estimate_lookup(ctx, batch_candidates)
+        if over_budget is not None:
+            print(f"[gap-fill] next lookup ({_lookup_label(batch_candidates)}) would exceed the {over_budget}; "
+                  f"submitting {len(admitted)} lookups")
+            break
+        ctx.ledger.defer(estimate)
+        admitted.append((rep, batch_candidates, estimate))
+    return admitted
+
+
+def _still_open(ctx: _FillContext, cand: GapCandidate) -> bool:
+    """Whether the candidate's cell is still a gap in this run's cohort."""
+    for entry in ctx.combined_entries:
+        if entry.name == cand.model_name and entry.country == cand.model_country:
+            return not _has_value(entry, cand.benchmark)
+    return False
+
+
+def collect_gap_fill_batch(ctx: _FillContext, api_key: str) -> bool:
+    """Apply the results of the batch an earlier run submitted, if it finished.
+
+    Returns True while that batch is still running (so no new one should be
+    submitted). Finished, failed, expired or cancelled batches clear the
+    saved state; any output they produced is applied first. Results only
+    land on cells that are still gaps in this run — a score that appeared on
+    llm-stats in the meantime wins.
+    """
+    state = load_batch_state()
+    if not state:
+        return False
+    batch_id = state.get("batch_id")
+    resp = _openai_request("GET", f"/batches/{batch_id}", api_key)
+    if resp is None:
+        print(f"[gap-fill] could not look up batch {batch_id}; will retry next run")
+        return True
+    batch = resp.json()
+    status = batch.get("status")
+    if status in BATCH_PENDING_STATUSES:
+        counts = batch.get("request_counts") or {}
+        print(
+            f"[gap-fill] batch {batch_id} still {status} "
+            f"({counts.get('completed', 0)}/{counts.get('total', '?')} done); not submitting another"
+        )
+        return True
+
+    print(f"[gap-fill] collecting batch {batch_id} ({status})")
+    output_file_id = batch.get("output_file_id")
+    if output_file_id:
+        content = _openai_request("GET", f"/files/{output_file_id}/content", api_key, timeout=120)
+        if content is None:
+            print(f"[gap-fill] could not download batch output {output_file_id}; will retry next run")
+            return True
+        by_id = {r["custom_id"]: r for r in state.get("requests", [])}
+        llm_model = state.get("llm_model", ctx.model)
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                ctx.stats.schema_failures += 1
+                continue
+            meta = by_id.get(result.get("custom_id"))
+            if meta is None:
+                continue
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                error = result.get("error") or response.get("body", {}).get("error")
+                print(f"[gap-fill] {result.get('custom_id')}: request failed ({error})")
+                continue
+            candidates = [GapCandidate(**c) for c in meta["candidates"]]
+            ctx.ledger.record(
+                f"{result['custom_id']} {_lookup_label(candidates)}",
+                len(candidates),
+                parse_usage(response.get("body")),
+                batch=True,
+                model=llm_model,
+            )
+            open_candidates = [c for c in candidates if _still_open(ctx, c)]
+            ctx.stats.batch_results += 1
+            if not open_candidates:
+                continue
+            print(f"[gap-fill] batch {result['custom_id']}: {_lookup_label(open_candidates)} "
+                  f"→ {len(open_candidates)} benchmarks")
+            _apply_response(ctx, response.get("body") or {}, open_candidates, llm_model)
+    elif status != "completed":
+        print(f"[gap-fill] batch {batch_id} ended {status} without output; dropping it")
+
+    save_batch_state(None)
+    return False
+
+
 def run_gap_filling_pass(
     combined_entries: List[Any],
     benchmark_headers: List[str],
@@ -833,6 +1849,15 @@ def run_gap_filling_pass(
     max_calls: int = DEFAULT_MAX_CALLS,
     min_confidence: str = "high",
     scraper_run_ts: str = "",
+    workers: int = DEFAULT_GAP_FILL_WORKERS,
+    mode: str = "sync",
+    token_budget: Optional[int] = None,
+    cost_budget: Optional[float] = None,
+    priority: str = "value",
+    known_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+    ttl_policy: Optional[TtlPolicy] = None,
+    source_pages: bool = False,
+    grouping: str = "model",
 ) -> int:
     """Orchestrate one gap-filling pass. Mutates combined_entries in place.
 
@@ -842,13 +1867,90 @@ def run_gap_filling_pass(
     per model, asking for all the model's missing benchmarks in a single
     request. This amortizes the ~8K-token web_search content cost across
     N benchmarks, producing a 2–3× token saving versus the original per-
-    benchmark approach.
+    benchmark approach. With ``grouping="organization"`` up to
+    MAX_MODELS_PER_LOOKUP models of one organization share a call (see
+    _group_by_organization), and the pass reports how many per-model calls
+    that saved.
+
+    **Modes:** "sync" runs the lookups now on a rate-limited worker pool.
+    "batch" first collects the batch a previous run submitted (if it has
+    finished), then submits this run's lookups as a new Batch API job — so
+    fills land one run late, at batch pricing.
+
+    **Budgets:** ``token_budget`` / ``cost_budget`` (USD) stop the pass before
+    the first lookup predicted to push this run's usage past either one —
+    see gap_fill_ledger. ``max_calls`` still applies on top. Each run's
+    token and dollar ledger is appended to LEDGER_FILE.
+
+    **Priority:** with ``priority="value"`` the lookups are ordered by their
+    expected effect on the Pass 2 qualified set and top 10 per predicted
+    token, from what-if rescoring of the current cells (``known_ranges`` are
+    the scraper's fixed benchmark ranges). ``"heuristic"`` keeps the
+    _group_by_model order.
+
+    **Cache TTL:** ``ttl_policy`` (default gap_fill_ttl.DEFAULT_TTL_POLICY)
+    sets how long each cached result is reused, by source type, confidence
+    and model age. Hits and misses per policy rule are reported at the end.
+
+    **Source pages:** with ``source_pages`` (opt-in), pages already cited for
+    a model or its siblings are fetched once into SOURCES_DIR and read by a
+    deterministic extractor before any lookup is planned; see
+    gap_fill_sources. Its fills are EXTRACTED_CONFIDENCE, so the step only
+    runs when ``min_confidence`` admits them.
     """
+    _check_options(mode, priority, grouping)
+    opened = _open_pass(
+        combined_entries,
+        min_confidence=min_confidence,
+        scraper_run_ts=scraper_run_ts,
+        mode=mode,
+        token_budget=token_budget,
+        cost_budget=cost_budget,
+        ttl_policy=ttl_policy,
+        source_pages=source_pages,
+    )
+    if opened is None:
+        return 0
+    ctx, api_key = opened
+    return _fill_pass(
+        ctx,
+        api_key,
+        benchmark_headers,
+        max_calls=max_calls,
+        workers=workers,
+        mode=mode,
+        priority=priority,
+        known_ranges=known_ranges,
+        grouping=grouping,
+    )
+
+
+def _check_options(mode: str, priority: str, grouping: str) -> None:
+    if mode not in GAP_FILL_MODES:
+        raise ValueError(f"unknown gap-fill mode {mode!r} (expected one of {GAP_FILL_MODES})")
+    if priority not in GAP_FILL_PRIORITIES:
+        raise ValueError(f"unknown gap-fill priority {priority!r} (expected one of {GAP_FILL_PRIORITIES})")
+    if grouping not in GAP_FILL_GROUPINGS:
+        raise ValueError(f"unknown gap-fill grouping {grouping!r} (expected one of {GAP_FILL_GROUPINGS})")
+
+
+def _open_pass(
+    combined_entries: List[Any],
+    *,
+    min_confidence: str,
+    scraper_run_ts: str,
+    mode: str,
+    token_budget: Optional[int],
+    cost_budget: Optional[float],
+    ttl_policy: Optional[TtlPolicy],
+    source_pages: bool,
+) -> Optional[Tuple[_FillContext, str]]:
+    """Resolve the key and model and load the pass's state. None if the pass can't run."""
     api_key = resolve_openai_key()
     if not api_key:
         print("\n[gap-fill] OPENAI_API_KEY not set; skipping gap-filling pass.")
         print("           Set it in .env (local) or via the OPENAI_API_KEY GitHub Actions secret (CI).")
-        return 0
+        return None
 
     print("\n--- Gap-Filling Pass ---")
 
@@ -860,164 +1962,353 @@ def run_gap_filling_pass(
     model = discover_available_model(api_key, chain=chain)
     if not model:
         print("[gap-fill] no usable model in chain; skipping pass.")
-        return 0
+        return None
     print(f"[gap-fill] using model: {model}")
 
+    if source_pages and not meets_confidence(EXTRACTED_CONFIDENCE, min_confidence):
+        # Its fills would be cached and then dropped, and the cache entry would
+        # keep the cell from an LLM lookup until it expired.
+        print(f"[gap-fill] source pages skipped: extracted fills are {EXTRACTED_CONFIDENCE} "
+              f"confidence, below min_confidence={min_confidence}")
+        source_pages = False
+
+    ttl_policy = ttl_policy or TtlPolicy()
+    ctx = _FillContext(
+        combined_entries=combined_entries,
+        cache=load_cache(ttl_policy),
+        nulls=NullHistory(NULLS_FILE).load(),
+        now=datetime.now(timezone.utc),
+        model=model,
+        min_confidence=min_confidence,
+        scraper_run_ts=scraper_run_ts,
+        ledger=BudgetLedger(
+            model,
+            token_budget=token_budget,
+            cost_budget=cost_budget,
+            default_input_tokens=ESTIMATED_TOKENS_PER_CALL,
+            batch=mode == "batch",
+        ),
+        ttl=ttl_policy,
+        sources=SourceDocCache(SOURCES_DIR) if source_pages else None,
+    )
+    if ctx.ledger.limited:
+        print(f"[gap-fill] budget: {ctx.ledger.describe_budget()}")
+    return ctx, api_key
+
+
+def _fill_pass(
+    ctx: _FillContext,
+    api_key: str,
+    benchmark_headers: List[str],
+    *,
+    max_calls: int,
+    workers: int,
+    mode: str,
+    priority: str,
+    known_ranges: Optional[Dict[str, Tuple[float, float]]],
+    grouping: str,
+    pipeline: Optional["GapFillPipeline"] = None,
+) -> int:
+    """Everything after _open_pass: candidates, planning, the lookups and the report.
+
+    With a ``pipeline``, the lookups it started during enrichment are
+    collected first and their cells leave the candidate list; the rest of
+    the pass gets whatever is left of ``max_calls``.
+    """
+    combined_entries = ctx.combined_entries
+    batch_pending = collect_gap_fill_batch(ctx, api_key) if mode == "batch" else False
+
+    # Built after collecting so cells a finished batch just filled aren't
+    # asked about again.
     candidates = build_candidates(combined_entries, benchmark_headers, enabled_tiers=frozenset({1, 2}))
     print(f"[gap-fill] {len(candidates)} candidate gaps after §5 filters and §6 tiering")
+    if pipeline is not None:
+        candidates = pipeline.collect(candidates, max_calls)
     if not candidates:
-        return 0
+        ctx.cache.close(ctx.now)
+        ctx.nulls.save(ctx.now)
+        if ctx.stats.batch_results or ctx.stats.api_calls:
+            _finish(ctx, mode)
+        return ctx.stats.fills_accepted
 
     top_cohort_set = {(e.name, e.country) for e in get_top_cohort(combined_entries)}
     groups = _group_by_model(candidates, top_cohort_names=top_cohort_set)
     print(f"[gap-fill] grouped into {len(groups)} per-model batches")
+    if ctx.sources is not None:
+        groups = _fill_from_sources(ctx, groups)
+    if grouping == "organization":
+        groups = _group_by_organization(groups)
+
+    order = None
+    if priority == "value":
+        # Scored from the cells as they are now, before this run's fills.
+        scorer = WhatIfScorer(combined_entries, benchmark_headers, known_ranges or {})
+        order = partial(_order_by_value, scorer=scorer, ledger=ctx.ledger)
+    plan = _plan_groups(groups, ctx, max_calls - ctx.stats.api_calls, order)
+    if grouping == "organization":
+        lookups = [b for _, _, b in plan if b]
+        models = sum(len(_lookup_models(b)) for b in lookups)
+        print(f"[gap-fill] organization grouping: {len(lookups)} lookups for {models} models "
+              f"({models - len(lookups)} fewer than one per model)")
+    if mode == "batch":
+        for _, cached, _ in plan:
+            _apply_cached(ctx, cached)
+        admitted = _admit_batch_calls(ctx, plan) if not batch_pending else []
+        if admitted:
+            calls = [(rep, batch_candidates) for rep, batch_candidates, _ in admitted]
+            if submit_gap_fill_batch(calls, model=ctx.model, api_key=api_key, scraper_run_ts=ctx.scraper_run_ts) is None:
+                for _, _, estimate in admitted:
+                    ctx.ledger.withdraw(estimate)
+    else:
+        _run_sync_calls(ctx, plan, api_key, max_calls, workers, pipeline.limiter if pipeline else None)
 
-    cache = load_cache()
-    now = datetime.now(timezone.utc)
+    ctx.cache.close(ctx.now)
+    ctx.nulls.save(ctx.now)
+    _finish(ctx, mode)
+    return ctx.stats.fills_accepted
 
-    cache_hits = 0
-    schema_failures = 0
-    fills_accepted = 0
-    fills_dropped_low_conf = 0
-    api_calls = 0
 
-    for rep, cands in groups:
-        if api_calls >= max_calls:
-            print(f"[gap-fill] hit max_calls={max_calls}; stopping")
-            break
+def _finish(ctx: _FillContext, mode: str) -> None:
+    """End-of-pass report, plus this run's line in LEDGER_FILE."""
+    ctx.stats.report()
+    ctx.ttl_stats.report(ctx.ttl)
+    if ctx.sources is not None:
+        print(f"[gap-fill] source pages            : {ctx.sources.hits} cached, "
+              f"{ctx.sources.fetched} fetched, {ctx.sources.failed} failed")
+    print(f"[gap-fill] usage                   : {ctx.ledger.summary()}")
+    ctx.ledger.write(LEDGER_FILE, run=ctx.scraper_run_ts or ctx.now.isoformat(), mode=mode)
 
-        model_name = rep.model_name
-        # Split into cached vs needs-fetch partitions. cache_is_fresh() only
-        # returns True for positive entries, so null scores always fall
-        # through to the batch.
-        batch_benchmarks: List[str] = []
-        batch_candidates: List[GapCandidate] = []
-        for cand in cands:
-            cache_entry = cache.get(cand.model_name, {}).get(cand.benchmark)
-            if cache_entry and cache_is_fresh(cache_entry, now):
-                cache_hits += 1
-                cached_conf = cache_entry.get("confidence", "low")
-                if min_confidence == "high" and cached_conf != "high":
-                    fills_dropped_low_conf += 1
-                    continue
-                if _apply_fill(combined_entries, cand, cache_entry, cache_entry.get("llm_model", model)):
-                    fills_accepted += 1
-                continue
-            batch_benchmarks.append(cand.benchmark)
-            batch_candidates.append(cand)
 
-        if not batch_benchmarks:
-            continue  # Every candidate in this group was cache-resolved
+# -----------------------------------------------------------------------------
+# Pipelined mode
+# -----------------------------------------------------------------------------
 
-        # Live LLM call for the batch
-        if api_calls > 0:
-            time.sleep(REQUEST_INTERVAL_SECONDS)
-        api_calls += 1
 
-        tier_summary = ",".join(f"T{c.tier}" for c in batch_candidates)
-        print(
-            f"[gap-fill] [{api_calls}/{max_calls}] {model_name} ({rep.model_country}) "
-            f"→ {len(batch_benchmarks)} benchmarks [{tier_summary}]"
-        )
+@dataclass
+class _EarlyLookup:
+    """A lookup GapFillPipeline started during enrichment."""
+    candidates: List[GapCandidate]
+    future: Future
+    estimate: Estimate
+    cancelled: bool = False
+
+
+def _cell_key(cand: GapCandidate) -> Tuple[str, str, str]:
+    return cand.model_name, cand.model_country, cand.benchmark
+
+
+class GapFillPipeline:
+    """Sync-mode gap-fill that starts lookups while detail pages are still being scraped.
+
+    Normally the pass waits for enrichment of both countries and the sparse
+    drop. Most candidates are already predictable before then, though: a
+    model's own cells are final once its detail page is parsed, and the rest
+    of the cohort can be approximated from the leaderboard table plus the
+    previous snapshot. The scraper calls ``model_ready`` after each detail
+    page. The pipeline then rebuilds the candidates against that predicted
+    cohort and starts one lookup for the model's gaps on its worker pool,
+    within ``max_calls`` and the ledger budget.
+
+    Nothing is applied during enrichment. The sparse drop must count only
+    llm-stats cells, and a prediction can be wrong. Each ``model_ready``
+    re-checks the queued lookups that haven't started. One whose cells no
+    longer apply (late-arriving cells made them reported, qualified or
+    hopeless) is cancelled, and resubmitted with whatever cells are left.
+    ``finish`` runs the pass on the final cells. The early results are
+    applied only to cells that are still final candidates, in the order the
+    lookups started. Every other candidate goes through the usual
+    cache / source page / planning path with the calls that remain.
+
+    Early lookups are single-model and start in enrichment order, so value
+    ordering and organization grouping only apply to the rest. Models with
+    previously cited pages (their own or their organization's) are left to
+    the final pass, which reads those pages before calling anyone, as are
+    cells still inside a null backoff.
+    """
 
-        # Size max_output_tokens to the batch.
-        #
-        # max_output_tokens on the Responses API is a hard cap on REASONING +
-        # VISIBLE output combined. Reasoning models spend ~1500+ hidden tokens
-        # per call even at `effort: "low"`, so the cap needs to be much bigger
-        # than the visible-JSON estimate alone. Measured values on real calls:
-        #   - Reasoning overhead per call: ~1500–2500 tokens
-        #   - Visible JSON per result: ~200 tokens
-        #   - Schema/wrapper overhead: ~200 tokens
-        # Floor of 5000 so single-benchmark batches still have headroom for
-        # several web_search tool calls + reasoning between them without
-        # risking a truncated final message item.
-        max_out = max(5000, 2500 + 300 * len(batch_benchmarks))
-
-        system, user = build_prompt_batch(
-            model_name=model_name,
-            model_country=rep.model_country,
-            model_url=rep.model_url,
-            organization=rep.organization,
-            benchmarks=batch_benchmarks,
-        )
-        raw = query_openai_responses(
-            system,
-            user,
-            model=model,
-            api_key=api_key,
-            max_output_tokens=max_out,
+    def __init__(
+        self,
+        entries: List[Any],
+        benchmark_headers: List[str],
+        *,
+        canonicalize: Callable[[str], str],
+        prior_rows: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None,
+        max_calls: int = DEFAULT_MAX_CALLS,
+        min_confidence: str = "high",
+        scraper_run_ts: str = "",
+        workers: int = DEFAULT_GAP_FILL_WORKERS,
+        token_budget: Optional[int] = None,
+        cost_budget: Optional[float] = None,
+        priority: str = "value",
+        known_ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        ttl_policy: Optional[TtlPolicy] = None,
+        source_pages: bool = False,
+        grouping: str = "model",
+    ):
+        """``entries`` are the leaderboard rows in cohort order. ``prior_rows``
+        maps (model, origin) to that model's row in the previous snapshot,
+        whose keys ``canonicalize`` matches to benchmark headers."""
+        _check_options("sync", priority, grouping)
+        self.max_calls = max_calls
+        self._options = dict(max_calls=max_calls, workers=workers, mode="sync", priority=priority,
+                             known_ranges=known_ranges, grouping=grouping)
+        self._entries = list(entries)
+        self._canonicalize = canonicalize
+        self._prior = {
+            key: {canonicalize(k): v for k, v in row.items() if isinstance(v, str)}
+            for key, row in (prior_rows or {}).items()
+        }
+        self._ready: set = set()
+        self._lookups: List[_EarlyLookup] = []
+        self._started = 0
+        self._cancelled = 0
+        self.limiter = _new_limiter()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        opened = _open_pass(
+            self._entries,
+            min_confidence=min_confidence,
+            scraper_run_ts=scraper_run_ts,
+            mode="sync",
+            token_budget=token_budget,
+            cost_budget=cost_budget,
+            ttl_policy=ttl_policy,
+            source_pages=source_pages,
         )
-        if raw is None:
-            continue
-
-        parsed = extract_json_from_response(raw)
-        if parsed is None:
-            schema_failures += 1
-            print("  → no valid JSON in response")
-            continue
-
-        validated_map = validate_batch_response(parsed, batch_benchmarks)
-        if validated_map is None:
-            schema_failures += 1
-            print("  → batch schema validation failed")
-            continue
-
-        # Apply each validated result to its matching candidate
-        for cand in batch_candidates:
-            entry = validated_map.get(cand.benchmark)
-            if entry is None:
-                # Model omitted this benchmark from its response. Treat as a
-                # soft null — do NOT cache it, because a vendor may publish
-                # the missing score between now and the next scrape run.
-                print(f"  · {cand.benchmark}: omitted from response")
+        self.ctx, self.api_key = opened if opened else (None, "")
+        if self.ctx is None:
+            return
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="gap-fill-early")
+        self._source_models: set = set()
+        self._source_orgs: set = set()
+        if self.ctx.sources is not None:
+            self._source_models = set(_cited_sources(self.ctx))
+            self._source_orgs = {
+                e.columns.get("Organization", "") for e in self._entries if e.name in self._source_models
+            } - {""}
+        print(f"[gap-fill] pipelined: lookups start as detail pages are parsed "
+              f"({len(self._prior)} models in the previous snapshot)")
+
+    def _predicted_entries(self, benchmark_headers: List[str]) -> List[Any]:
+        """The cohort as far as it's known: parsed models as they are, the
+        rest with their previous-snapshot cells filled into their gaps."""
+        canon = [(h, self._canonicalize(h)) for h in benchmark_headers]
+        predicted = []
+        for entry in self._entries:
+            prior = self._prior.get((entry.name, entry.country))
+            if (entry.name, entry.country) in self._ready or not prior:
+                predicted.append(entry)
                 continue
-
-            # Null / missing scores are deliberately NOT cached — see
-            # cache_is_fresh() for the rationale (freshness over cost).
-            if entry["score"] is None:
-                print(f"  · {cand.benchmark}: null ({(entry.get('notes') or '')[:60]})")
+            cells = dict(entry.columns.items())
+            for header, key in canon:
+                if key in prior and not _has_value(entry, header):
+                    cells[header] = prior[key]
+            predicted.append(replace(entry, columns=cells))
+        return predicted
+
+    def _wanted(self, cand: GapCandidate) -> bool:
+        """Whether an early lookup should ask about the cell; the final pass handles the rest."""
+        ctx = self.ctx
+        cache_entry = ctx.cache.lookup(cand.model_name, cand.benchmark)
+        if cache_entry and cache_is_fresh(cache_entry, ctx.now, ctx.ttl, cand.model_released):
+            return False
+        if ctx.nulls.backing_off(cand.model_name, cand.benchmark, ctx.now):
+            return False
+        return cand.model_name not in self._source_models and cand.organization not in self._source_orgs
+
+    def _start(self, candidates: List[GapCandidate]) -> None:
+        if self._started >= self.max_calls:
+            return
+        estimate, exceeded = _estimate_lookup(self.ctx, candidates)
+        if exceeded is not None:
+            return  # The final pass reports the budget stop
+        self.ctx.ledger.reserve(estimate)
+        future = self._pool.submit(_lookup_call, self.ctx, self.api_key, self.limiter, candidates[0], candidates)
+        self._lookups.append(_EarlyLookup(candidates, future, estimate))
+        self._started += 1
+        print(f"[gap-fill] early lookup {self._started}: {_lookup_label(candidates)} → {len(candidates)} benchmarks")
+
+    def _revalidate(self, open_cells: set) -> None:
+        """Cancel queued lookups whose cells no longer all apply; restart them with the rest."""
+        for lookup in list(self._lookups):
+            if lookup.cancelled or lookup.future.running() or lookup.future.done():
                 continue
-
-            # Positive result: cache it so the next scrape can skip the call.
-            cache.setdefault(cand.model_name, {})[cand.benchmark] = {
-                **entry,
-                "cached_at": now.isoformat(),
-                "llm_model": model,
-            }
-
-            if entry["confidence"] != "high" and min_confidence == "high":
-                fills_dropped_low_conf += 1
-                print(f"  · {cand.benchmark}: dropped (confidence={entry['confidence']})")
+            keep = [c for c in lookup.candidates if _cell_key(c) in open_cells]
+            if len(keep) == len(lookup.candidates) or not lookup.future.cancel():
                 continue
-
-            if _apply_fill(combined_entries, cand, entry, model):
-                append_audit_entry(
-                    {
-                        "ts": now.isoformat(),
-                        "model": cand.model_name,
-                        "benchmark": cand.benchmark,
-                        "score": _format_score(entry["score"]),
-                        "source_url": entry.get("source_url", ""),
-                        "source_type": entry.get("source_type", ""),
-                        "confidence": entry["confidence"],
-                        "llm_model": model,
-                        "scraper_run": scraper_run_ts,
-                    }
-                )
-                fills_accepted += 1
-                print(
-                    f"  · {cand.benchmark}: ACCEPTED {entry['score']} "
-                    f"({(entry.get('source_url') or '')[:50]})"
-                )
-
-    save_cache(cache)
-
-    print()
-    print(f"[gap-fill] cache hits              : {cache_hits}")
-    print(f"[gap-fill] live API calls          : {api_calls}")
-    print(f"[gap-fill] schema failures         : {schema_failures}")
-    print(f"[gap-fill] dropped low-confidence  : {fills_dropped_low_conf}")
-    print(f"[gap-fill] fills accepted          : {fills_accepted}")
-
-    return fills_accepted
+            lookup.cancelled = True
+            self.ctx.ledger.release(lookup.estimate)
+            self._started -= 1
+            self._cancelled += 1
+            print(f"[gap-fill] early lookup for {_lookup_label(lookup.candidates)} cancelled: "
+                  f"{len(lookup.candidates) - len(keep)} cells no longer candidates")
+            if keep:
+                self._start(keep)
+
+    def model_ready(self, entry: Any, benchmark_headers: List[str]) -> None:
+        """Called once ``entry``'s detail page is parsed (or failed to load).
+
+        ``benchmark_headers`` are the headers known so far: the leaderboard's
+        plus those detail pages have added.
+        """
+        if self.ctx is None:
+            return
+        try:
+            self._ready.add((entry.name, entry.country))
+            candidates = build_candidates(self._predicted_entries(benchmark_headers), benchmark_headers)
+            self._revalidate({_cell_key(c) for c in candidates})
+            mine = [
+                c for c in candidates
+                if c.model_name == entry.name and c.model_country == entry.country and self._wanted(c)
+            ]
+            if mine:
+                self._start(mine)
+        except Exception as e:
+            print(f"[gap-fill] early lookup for {entry.name} not started ({e})")
+
+    def collect(self, final_candidates: List[GapCandidate], max_calls: int) -> List[GapCandidate]:
+        """Apply the early results to the final candidates; return the candidates they don't cover."""
+        ctx = self.ctx
+        final = {_cell_key(c): c for c in final_candidates}
+        self._revalidate(set(final))
+        finished = sum(1 for lookup in self._lookups if not lookup.cancelled and lookup.future.done())
+        covered: set = set()
+        issued = stale = 0
+        for lookup in self._lookups:
+            if lookup.cancelled:
+                continue
+            issued += 1
+            ctx.stats.api_calls += 1
+            ctx.stats.model_lookups += 1
+            _announce_call(ctx, lookup.candidates, max_calls)
+            raw = lookup.future.result()
+            ctx.ledger.record(_lookup_label(lookup.candidates), len(lookup.candidates), parse_usage(raw), lookup.estimate)
+            open_candidates = [final[_cell_key(c)] for c in lookup.candidates if _cell_key(c) in final]
+            stale += len(lookup.candidates) - len(open_candidates)
+            for cand in open_candidates:
+                covered.add(_cell_key(cand))
+                ctx.ttl_stats.record(_ttl_bucket(ctx, cand), hit=False)
+            if raw is not None and open_candidates:
+                _apply_response(ctx, raw, open_candidates, ctx.model)
+        print(f"[gap-fill] pipelined: {issued} early lookups ({finished} done before enrichment "
+              f"ended), {self._cancelled} cancelled before they ran, {stale} answered cells no longer candidates")
+        return [c for c in final_candidates if _cell_key(c) not in covered]
+
+    def finish(self, combined_entries: List[Any], benchmark_headers: List[str]) -> int:
+        """Run the pass on the final cells (after the sparse drop), early results first.
+
+        Returns the number of cells filled, like run_gap_filling_pass.
+        """
+        if self.ctx is None:
+            return 0
+        self.ctx.combined_entries = combined_entries
+        try:
+            return _fill_pass(self.ctx, self.api_key, benchmark_headers, pipeline=self, **self._options)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Drop lookups that haven't started; let running ones finish in the background."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Append-only store for the gap-fill result cache.
+
+The cache used to be one JSON document, ``data/ai_gap_cache.json``, read at
+the start of a pass and rewritten in full at the end. A crash or a killed CI
+job in between threw away every result that pass had paid for.
+
+GapFillCache keeps the same data as a log instead, ``data/ai_gap_cache.ndjson``:
+
+- **put** appends one ``{"model", "benchmark", "entry"}`` line and fsyncs it,
+  so a result is durable as soon as it's accepted. A later line for the same
+  (model, benchmark) supersedes the earlier one.
+- **load** replays the log into an in-memory dict keyed by (model, benchmark),
+  skipping a torn final line from a crashed append. If there is no log yet it
+  is seeded from ai_gap_cache.json, so existing checkouts migrate on their
+  first run.
+- **compact** rewrites the log (write-then-rename) without superseded lines
+  and without entries the freshness check rejects. It runs at close once
+  that garbage makes up COMPACT_GARBAGE_RATIO of the log.
+- **export** produces the original ``{model: {benchmark: entry}}`` document,
+  which close() still writes to ai_gap_cache.json for anything that reads it.
+
+Not thread-safe; the gap-fill pass applies results from one thread.
+
+Usage:
+    python scripts/gap_fill_cache.py compact   # drop expired / superseded lines now
+    python scripts/gap_fill_cache.py export    # rewrite ai_gap_cache.json from the log
+
+``--ttl-policy FILE`` compacts against a custom TTL table (see gap_fill_ttl).
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Compact once superseded + expired lines are at least this share of the log.
+COMPACT_GARBAGE_RATIO = 0.5
+
+CacheKey = Tuple[str, str]
+
+
+def _encode_line(model: str, benchmark: str, entry: Dict[str, Any]) -> bytes:
+    record = {"model": model, "benchmark": benchmark, "entry": entry}
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class GapFillCache:
+    """In-memory (model, benchmark) → entry index over an append-only log."""
+
+    def __init__(
+        self,
+        log_path: Path,
+        json_path: Path,
+        is_fresh: Callable[[Dict[str, Any], datetime], bool],
+    ):
+        self.log_path = log_path
+        self.json_path = json_path
+        self.is_fresh = is_fresh
+        self._index: Dict[CacheKey, Dict[str, Any]] = {}
+        self._records = 0  # lines in the log: live, superseded or unreadable
+
+    # -- reading -----------------------------------------------------------
+
+    def _replay(self) -> Iterator[Optional[Tuple[str, str, Dict[str, Any]]]]:
+        """Every log line in order; None for one that can't be read."""
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    yield record["model"], record["benchmark"], record["entry"]
+                except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError) as e:
+                    # A torn final line from a crashed append is the only expected cause.
+                    print(f"[gap-fill] Warning: skipping unreadable line in {self.log_path.name} ({e})")
+                    yield None
+
+    def load(self) -> "GapFillCache":
+        self._index.clear()
+        self._records = 0
+        if self.log_path.exists():
+            for record in self._replay():
+                # Unreadable lines count as garbage, so compaction clears them.
+                self._records += 1
+                if record is not None:
+                    model, benchmark, entry = record
+                    self._index[(model, benchmark)] = entry
+        elif self.json_path.exists():
+            try:
+                with open(self.json_path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"[gap-fill] Warning: corrupted {self.json_path.name} ({e}); starting fresh")
+                legacy = {}
+            for model, benchmarks in sorted(legacy.items()):
+                for benchmark, entry in sorted(benchmarks.items()):
+                    self._index[(model, benchmark)] = entry
+            if self._index:
+                self._rewrite()
+                print(f"[gap-fill] migrated {len(self._index)} cache entries into {self.log_path.name}")
+        return self
+
+    def lookup(self, model: str, benchmark: str) -> Optional[Dict[str, Any]]:
+        return self._index.get((model, benchmark))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        """The cache as the original ``{model: {benchmark: entry}}`` document."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for (model, benchmark), entry in self._index.items():
+            out.setdefault(model, {})[benchmark] = entry
+        return out
+
+    # -- writing -----------------------------------------------------------
+
+    def put(self, model: str, benchmark: str, entry: Dict[str, Any]) -> None:
+        """Record one result durably: append it to the log, then index it."""
+        self.log_path.parent.mkdir(exist_ok=True)
+        with open(self.log_path, "ab") as f:
+            # If a previous append died mid-line, start on a fresh line so the
+            # torn record stays isolated (replay skips it) instead of
+            # corrupting this one.
+            if f.tell() > 0:
+                with open(self.log_path, "rb") as check:
+                    check.seek(-1, os.SEEK_END)
+                    if check.read(1) != b"\n":
+                        f.write(b"\n")
+            f.write(_encode_line(model, benchmark, entry))
+            f.flush()
+            os.fsync(f.fileno())
+        self._index[(model, benchmark)] = entry
+        self._records += 1
+
+    def _rewrite(self) -> None:
+        self.log_path.parent.mkdir(exist_ok=True)
+        tmp_path = self.log_path.with_name(self.log_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for (model, benchmark), entry in self._index.items():
+                f.write(_encode_line(model, benchmark, entry))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self.log_path)
+        self._records = len(self._index)
+
+    def garbage(self, now: datetime) -> int:
+        """Log lines a compaction would drop: superseded, unreadable and expired."""
+        expired = sum(1 for entry in self._index.values() if not self.is_fresh(entry, now))
+        return self._records - len(self._index) + expired
+
+    def compact(self, now: datetime, force: bool = False) -> int:
+        """Drop expired entries and superseded lines if they're worth a rewrite.
+
+        Returns the number of log lines removed (0 if nothing was rewritten).
+        """
+        garbage = self.garbage(now)
+        if not garbage or (not force and garbage < COMPACT_GARBAGE_RATIO * self._records):
+            return 0
+        self._index = {key: entry for key, entry in self._index.items() if self.is_fresh(entry, now)}
+        before = self._records
+        self._rewrite()
+        return before - self._records
+
+    def write_json(self) -> None:
+        """Write the export to ``json_path`` (write-then-rename, the original formatting)."""
+        self.json_path.parent.mkdir(exist_ok=True)
+        tmp_path = self.json_path.with_name(self.json_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.export(), f, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp_path.replace(self.json_path)
+
+    def close(self, now: datetime) -> None:
+        """End of a pass: compact if due, then refresh the JSON export."""
+        removed = self.compact(now)
+        if removed:
+            print(f"[gap-fill] compacted {self.log_path.name}: {removed} stale lines dropped, {len(self)} kept")
+        self.write_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the gap-fill cache log")
+    parser.add_argument("command", choices=("compact", "export"))
+    parser.add_argument("--ttl-policy", metavar="FILE", help="TTL rule table (default: gap_fill_ttl's built-in one)")
+    args = parser.parse_args()
+
+    # Paths live with the pass that owns the cache.
+    from gap_fill_benchmarks import load_cache
+    from gap_fill_ttl import TtlPolicy
+
+    cache = load_cache(TtlPolicy.from_file(Path(args.ttl_policy)) if args.ttl_policy else None)
+    if args.command == "compact":
+        removed = cache.compact(datetime.now(timezone.utc), force=True)
+        print(f"{cache.log_path.name}: {removed} lines dropped, {len(cache)} entries kept")
+    cache.write_json()
+    print(f"wrote {cache.json_path}")
+
+
+if __name__ == "__main__":
+    main()
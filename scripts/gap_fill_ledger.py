@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Token and dollar accounting for the gap-filling pass.
+
+``--gap-fill-max-calls`` caps how many lookups a run makes, but lookups vary
+a lot in price. One with a large batch and heavy web_search content can
+bill 10K+ input tokens, and its output cap grows with the number of
+benchmarks asked about. BudgetLedger is the alternative: it reads the
+``usage`` block of every Responses API result, keeps a running token and
+dollar total, and can say whether the *next* lookup is predicted to fit a
+token and/or dollar budget.
+
+Predictions come from what this run has measured so far:
+- mean input tokens per call;
+- mean output tokens per requested benchmark;
+- mean web_search calls per call.
+Before the first measurement, the caller's conservative defaults are used.
+Spend is counted in three states:
+- **settled**: the call finished and its real usage is recorded;
+- **reserved**: the call is admitted and in flight, counted at its
+  prediction;
+- **deferred**: a Batch API submission whose results arrive on a later run.
+
+One JSON line per run is appended to ``data/ai_gap_ledger.jsonl``.
+"""
+import json
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# USD per 1M tokens: (input, cached input, output). Check
+# https://openai.com/api/pricing whenever DEFAULT_MODEL_CHAIN changes. Models
+# not listed are priced like the most expensive row, so a budget errs on the
+# side of stopping early rather than overspending.
+MODEL_PRICING_PER_M: Dict[str, Tuple[float, float, float]] = {
+    "gpt-5.4": (2.50, 0.25, 15.00),
+    "gpt-5.4-pro": (30.00, 30.00, 180.00),
+    "gpt-5.3": (1.75, 0.175, 14.00),
+}
+# web_search is billed per tool call on top of the tokens it pulls in.
+WEB_SEARCH_COST_PER_CALL = 0.01
+# Batch API requests are billed at half the synchronous token price.
+BATCH_PRICE_MULTIPLIER = 0.5
+
+
+def _pricing(model: str) -> Tuple[float, float, float]:
+    if model in MODEL_PRICING_PER_M:
+        return MODEL_PRICING_PER_M[model]
+    return max(MODEL_PRICING_PER_M.values(), key=lambda p: p[2])
+
+
+@dataclass
+class CallUsage:
+    """Billed usage of one Responses API result."""
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    web_search_calls: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def cost(self, model: str, batch: bool = False) -> float:
+        price_in, price_cached, price_out = _pricing(model)
+        uncached = max(0, self.input_tokens - self.cached_input_tokens)
+        tokens = (
+            uncached * price_in
+            + self.cached_input_tokens * price_cached
+            + self.output_tokens * price_out
+        ) / 1_000_000
+        if batch:
+            tokens *= BATCH_PRICE_MULTIPLIER
+        return tokens + self.web_search_calls * WEB_SEARCH_COST_PER_CALL
+
+
+def parse_usage(raw: Optional[Dict[str, Any]]) -> Optional[CallUsage]:
+    """Usage of a Responses API result, or None if it carries no usage block."""
+    usage = raw.get("usage") if isinstance(raw, dict) else None
+    if not isinstance(usage, dict):
+        return None
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    if not isinstance(input_tokens, int) or not isinstance(output_tokens, int):
+        total = usage.get("total_tokens")
+        if not isinstance(total, int):
+            return None
+        # Only a total: attribute it to input, the larger and cheaper side.
+        input_tokens, output_tokens = total, 0
+    details = usage.get("input_tokens_details") or {}
+    cached = details.get("cached_tokens") if isinstance(details, dict) else 0
+    searches = sum(
+        1 for item in raw.get("output") or [] if isinstance(item, dict) and item.get("type") == "web_search_call"
+    )
+    return CallUsage(
+        input_tokens=input_tokens,
+        cached_input_tokens=cached if isinstance(cached, int) else 0,
+        output_tokens=output_tokens,
+        web_search_calls=searches,
+    )
+
+
+@dataclass
+class Estimate:
+    tokens: int
+    cost_usd: float
+
+
+class BudgetLedger:
+    """Running usage totals plus admission control against optional budgets."""
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        token_budget: Optional[int] = None,
+        cost_budget: Optional[float] = None,
+        default_input_tokens: int = 9_000,
+        batch: bool = False,
+    ):
+        self.model = model
+        self.token_budget = token_budget
+        self.cost_budget = cost_budget
+        self.default_input_tokens = default_input_tokens
+        self.batch = batch
+        self._lock = threading.Lock()
+        self.calls: List[Dict[str, Any]] = []
+        self.spent_tokens = 0
+        self.spent_usd = 0.0
+        self.reserved_tokens = 0
+        self.reserved_usd = 0.0
+        self.deferred_tokens = 0
+        self.deferred_usd = 0.0
+        self._measured_calls = 0
+        self._measured_input = 0
+        self._measured_output = 0
+        self._measured_benchmarks = 0
+        self._measured_searches = 0
+
+    @property
+    def limited(self) -> bool:
+        return self.token_budget is not None or self.cost_budget is not None
+
+    def describe_budget(self) -> str:
+        limits = []
+        if self.token_budget is not None:
+            limits.append(f"{self.token_budget:,} tokens")
+        if self.cost_budget is not None:
+            limits.append(f"${self.cost_budget:.2f}")
+        return " / ".join(limits) or "unlimited"
+
+    def estimate(self, n_benchmarks: int, output_cap: int) -> Estimate:
+        """Predicted tokens and cost of a lookup for ``n_benchmarks`` benchmarks.
+
+        ``output_cap`` is the call's max_output_tokens: the output estimate
+        before anything is measured, and an upper bound after.
+        """
+        with self._lock:
+            if self._measured_calls:
+                input_tokens = round(self._measured_input / self._measured_calls)
+                per_benchmark = self._measured_output / max(1, self._measured_benchmarks)
+                output_tokens = min(output_cap, round(per_benchmark * n_benchmarks))
+                searches = round(self._measured_searches / self._measured_calls)
+            else:
+                input_tokens, output_tokens, searches = self.default_input_tokens, output_cap, 1
+        usage = CallUsage(input_tokens=input_tokens, output_tokens=output_tokens, web_search_calls=searches)
+        return Estimate(usage.total_tokens, usage.cost(self.model, self.batch))
+
+    def would_exceed(self, estimate: Estimate) -> Optional[str]:
+        """Which budget admitting ``estimate`` would break, or None if it fits."""
+        with self._lock:
+            tokens = self.spent_tokens + self.reserved_tokens + self.deferred_tokens + estimate.tokens
+            usd = self.spent_usd + self.reserved_usd + self.deferred_usd + estimate.cost_usd
+        if self.token_budget is not None and tokens > self.token_budget:
+            return f"token budget {self.token_budget:,} (would reach {tokens:,})"
+        if self.cost_budget is not None and usd > self.cost_budget:
+            return f"cost budget ${self.cost_budget:.2f} (would reach ${usd:.2f})"
+        return None
+
+    def reserve(self, estimate: Estimate) -> None:
+        with self._lock:
+            self.reserved_tokens += estimate.tokens
+            self.reserved_usd += estimate.cost_usd
+
+    def release(self, estimate: Estimate) -> None:
+        """Undo ``reserve`` for a lookup that was cancelled before it ran."""
+        with self._lock:
+            self.reserved_tokens -= estimate.tokens
+            self.reserved_usd -= estimate.cost_usd
+
+    def defer(self, estimate: Estimate) -> None:
+        """Count a submitted-but-not-yet-billed batch lookup against this run's budget."""
+        with self._lock:
+            self.deferred_tokens += estimate.tokens
+            self.deferred_usd += estimate.cost_usd
+
+    def withdraw(self, estimate: Estimate) -> None:
+        """Undo ``defer`` for a batch lookup that was never submitted."""
+        with self._lock:
+            self.deferred_tokens -= estimate.tokens
+            self.deferred_usd -= estimate.cost_usd
+
+    def record(
+        self,
+        label: str,
+        n_benchmarks: int,
+        usage: Optional[CallUsage],
+        estimate: Optional[Estimate] = None,
+        batch: Optional[bool] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        """Settle one finished lookup: release its reservation and add its real usage.
+
+        ``batch`` and ``model`` default to the ledger's own; a collected batch
+        passes the model it was submitted with.
+        """
+        batch = self.batch if batch is None else batch
+        model = model or self.model
+        cost = usage.cost(model, batch) if usage else 0.0
+        with self._lock:
+            if estimate is not None:
+                self.reserved_tokens -= estimate.tokens
+                self.reserved_usd -= estimate.cost_usd
+            entry: Dict[str, Any] = {"lookup": label, "llm_model": model, "benchmarks": n_benchmarks, "batch": batch}
+            if usage is not None:
+                entry.update(asdict(usage))
+                self.spent_tokens += usage.total_tokens
+                self.spent_usd += cost
+                self._measured_calls += 1
+                self._measured_input += usage.input_tokens
+                self._measured_output += usage.output_tokens
+                self._measured_benchmarks += n_benchmarks
+                self._measured_searches += usage.web_search_calls
+            entry["cost_usd"] = round(cost, 6)
+            if estimate is not None:
+                entry["predicted_tokens"] = estimate.tokens
+                entry["predicted_cost_usd"] = round(estimate.cost_usd, 6)
+            self.calls.append(entry)
+
+    def summary(self) -> str:
+        parts = [f"{self.spent_tokens:,} tokens", f"${self.spent_usd:.4f}"]
+        if self.deferred_tokens:
+            parts.append(f"+ ~{self.deferred_tokens:,} tokens / ~${self.deferred_usd:.4f} submitted to batch")
+        return ", ".join(parts)
+
+    def write(self, path: Path, *, run: str, mode: str) -> None:
+        """Append this run's ledger as one JSON line."""
+        line = {
+            "run": run,
+            "mode": mode,
+            "llm_model": self.model,
+            "token_budget": self.token_budget,
+            "cost_budget_usd": self.cost_budget,
+            "spent_tokens": self.spent_tokens,
+            "spent_usd": round(self.spent_usd, 6),
+            "deferred_tokens": self.deferred_tokens,
+            "deferred_usd": round(self.deferred_usd, 6),
+            "calls": self.calls,
+        }
+        path.parent.mkdir(exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
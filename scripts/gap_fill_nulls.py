@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Re-query schedule for gap cells that keep coming back null.
+
+Null results are deliberately not cached (see cache_is_fresh), because a
+vendor may publish the missing score any day. Asking again on every daily
+run is wasteful, though. Most of those cells have been null for weeks, and
+each re-ask is a web_search call. NullHistory keeps a small record per
+(model, benchmark) cell with an exponential backoff. After the n-th null in
+a row, the cell isn't asked again until min(2^(n-1), NULL_BACKOFF_MAX_DAYS)
+calendar days later, so 1, 2, 4, 8, 16, 16, … days.
+
+A record is forgotten, and the cell asked again on the next run, when:
+- a lookup finds a score for the cell;
+- the model's **fingerprint** changes. The fingerprint is a digest of the
+  model's llm-stats URL, its Released month and the set of benchmarks it
+  reports there. A new model version, or the leaderboard picking up new
+  scores for the model, suggests the vendor has published something.
+
+The history is a single JSON document, ``data/ai_gap_nulls.json``, shaped
+``{model: {benchmark: record}}`` like the cache. It is rewritten
+(write-then-rename) at the end of a pass. Losing it only means the cells
+get asked again.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+NULL_BACKOFF_MAX_DAYS = 16
+# Records untouched for this long are dropped on save. The fingerprint no
+# longer matters by then, and the model has usually left the cohort.
+NULL_HISTORY_RETENTION_DAYS = 90
+
+
+def model_fingerprint(url: str, released: str, reported: Iterable[str]) -> str:
+    """Digest of what llm-stats says about a model; changes reset its null records."""
+    h = hashlib.sha256()
+    for part in (url, released, *sorted(reported)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def backoff_days(nulls: int) -> int:
+    """Days to wait after the ``nulls``-th consecutive null."""
+    return min(2 ** max(0, nulls - 1), NULL_BACKOFF_MAX_DAYS)
+
+
+class NullHistory:
+    """Consecutive-null records per (model, benchmark), with their re-ask dates."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._records: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def load(self) -> "NullHistory":
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._records = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"[gap-fill] Warning: corrupted {self.path.name} ({e}); starting fresh")
+                self._records = {}
+        return self
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._records.values())
+
+    def _record(self, model: str, benchmark: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(model, {}).get(benchmark)
+
+    def next_due(self, model: str, benchmark: str, fingerprint: str) -> Optional[datetime]:
+        """When the cell may be asked again, or None if it may be asked now."""
+        record = self._record(model, benchmark)
+        if record is None or record.get("fingerprint") != fingerprint:
+            return None
+        try:
+            last = datetime.fromisoformat(record["last_asked"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return last + timedelta(days=backoff_days(int(record.get("nulls", 1))))
+
+    def is_due(self, model: str, benchmark: str, fingerprint: str, now: datetime) -> bool:
+        # Compared by calendar date, so a daily run that starts a little
+        # earlier than yesterday's still counts as a day later.
+        due = self.next_due(model, benchmark, fingerprint)
+        return due is None or now.date() >= due.date()
+
+    def backing_off(self, model: str, benchmark: str, now: datetime) -> bool:
+        """Whether the cell's last null is still inside its backoff, under
+        whatever fingerprint it was recorded with."""
+        record = self._record(model, benchmark)
+        return record is not None and not self.is_due(model, benchmark, record.get("fingerprint"), now)
+
+    def record_null(self, model: str, benchmark: str, fingerprint: str, now: datetime) -> None:
+        record = self._record(model, benchmark)
+        if record is None or record.get("fingerprint") != fingerprint:
+            record = {"first_null": now.isoformat(), "nulls": 0, "fingerprint": fingerprint}
+        record["nulls"] = int(record.get("nulls", 0)) + 1
+        record["last_asked"] = now.isoformat()
+        self._records.setdefault(model, {})[benchmark] = record
+
+    def clear(self, model: str, benchmark: str) -> None:
+        benchmarks = self._records.get(model)
+        if benchmarks and benchmarks.pop(benchmark, None) is not None and not benchmarks:
+            del self._records[model]
+
+    def save(self, now: datetime) -> None:
+        """Drop records past NULL_HISTORY_RETENTION_DAYS, then write the file (write-then-rename)."""
+        cutoff = now - timedelta(days=NULL_HISTORY_RETENTION_DAYS)
+        kept: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for model, benchmarks in self._records.items():
+            for benchmark, record in benchmarks.items():
+                try:
+                    if datetime.fromisoformat(record["last_asked"]) < cutoff:
+                        continue
+                except (KeyError, TypeError, ValueError):
+                    continue
+                kept.setdefault(model, {})[benchmark] = record
+        self._records = kept
+        self.path.parent.mkdir(exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(kept, f, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp_path.replace(self.path)
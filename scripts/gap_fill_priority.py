@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Value-of-information ordering for gap-fill lookups.
+
+``_group_by_model`` orders lookups by fixed heuristics (has a Tier 1
+candidate, top-cohort model, lowest tier, group size). Those say how close a
+benchmark is to qualifying, not whether filling it would change anything
+anyone sees. WhatIfScorer asks that directly. It reproduces the Pass 2
+outcome the scraper is about to compute from the current cells: the Pass 1
+seed, then the qualified-set convergence on Pass2Solver. For one lookup it
+then estimates how much a successful fill would move two things:
+
+- **the qualified set**: a benchmark reported by PASS2_QUALIFIED_THRESHOLD−1
+  of the Pass 2 top 10 qualifies if one of those ten gains a score. Each
+  such flip counts QUALIFIED_CHANGE_IMPACT, since it changes what every
+  model is scored on;
+- **the top 10**: the model is re-ranked with the filled benchmarks set to
+  the 25th / 50th / 75th percentile of the values other models report.
+  Rankings are compared by total position displacement, where a model
+  outside the top 10 counts as position PASS2_TOP_N. The mean over the
+  three guesses is the expected impact.
+
+This is a one-step estimate. It does not re-run the convergence after a
+hypothetical fill, and it treats every lookup as if it will return a score.
+It only decides which lookups go first. What gets filled, and how it is
+scored, is unchanged.
+"""
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scoring_engine import (
+    PASS2_MAX_ITERATIONS,
+    PASS2_MIN_QUALIFIED,
+    PASS2_QUALIFIED_THRESHOLD,
+    PASS2_TOP_N,
+    Pass2Solver,
+    ScoringEngine,
+    score_bounds,
+)
+
+IMPUTE_QUANTILES: Tuple[float, ...] = (0.25, 0.5, 0.75)
+# A benchmark entering the qualified set counts like one model entering or
+# leaving the top 10 from first place.
+QUALIFIED_CHANGE_IMPACT = float(PASS2_TOP_N)
+
+
+def _displacement(before: Sequence[int], after: Sequence[int], top_n: int) -> int:
+    pos_before = {row: i for i, row in enumerate(before)}
+    pos_after = {row: i for i, row in enumerate(after)}
+    return sum(
+        abs(pos_before.get(row, top_n) - pos_after.get(row, top_n))
+        for row in pos_before.keys() | pos_after.keys()
+    )
+
+
+class WhatIfScorer:
+    """Pass 2 baseline for a cohort, plus what-if rescoring of hypothetical fills.
+
+    Like ScoringEngine, this is a snapshot of the cells at construction time.
+    """
+
+    def __init__(
+        self,
+        entries: Sequence[Any],
+        benchmark_headers: Sequence[str],
+        known_ranges: Dict[str, Tuple[float, float]],
+    ):
+        self.engine = ScoringEngine(entries, benchmark_headers)
+        self.solver = Pass2Solver(self.engine, known_ranges, top_n=PASS2_TOP_N)
+        self._row = {(e.name, e.country): i for i, e in enumerate(self.engine.entries)}
+        self._column = {}
+        for j, b in enumerate(self.engine.benchmark_headers):
+            self._column.setdefault(b, j)
+        self._imputed: Dict[str, Optional[Tuple[float, ...]]] = {}
+        self.qualified: Optional[FrozenSet[str]] = None
+        self.top: Tuple[int, ...] = ()
+        self._baseline()
+
+    def _qualified_for(self, top: Sequence[int]) -> FrozenSet[str]:
+        counts = self.engine.present[list(top)].sum(axis=0)
+        return frozenset(b for b, j in self._column.items() if counts[j] >= PASS2_QUALIFIED_THRESHOLD)
+
+    def _baseline(self) -> None:
+        """The qualified set and Pass 2 top 10 run_scraper would reach from these cells."""
+        engine = self.engine
+        if not engine.entries:
+            return
+        participation, max_participation = engine.participation()
+        ranges = engine.cohort_ranges(participation)
+        bounds = score_bounds(engine.score(participation, max_participation, benchmark_min_max=ranges))
+        pass1 = engine.score(participation, max_participation, *bounds, benchmark_min_max=ranges)
+        top = sorted(range(len(pass1)), key=lambda i: pass1[i]["unified"], reverse=True)[:PASS2_TOP_N]
+
+        qualified = self._qualified_for(top)
+        if len(qualified) < PASS2_MIN_QUALIFIED:
+            return  # run_scraper falls back to Pass 1; nothing to estimate against
+        # Same loop as run_scraper. When it stops on oscillation or the
+        # iteration cap, the top 10 it reports was ranked under the previous
+        # set, so that set is the baseline the what-ifs are compared against.
+        seen = {qualified}
+        for _ in range(PASS2_MAX_ITERATIONS):
+            ranked = qualified
+            top = self.solver.rank(ranked).top
+            qualified = self._qualified_for(top)
+            if qualified == ranked or qualified in seen:
+                break
+            seen.add(qualified)
+        self.qualified = ranked
+        self.top = top
+
+    def _imputations(self, benchmark: str) -> Optional[Tuple[float, ...]]:
+        if benchmark not in self._imputed:
+            j = self._column[benchmark]
+            values = self.engine.values[self.engine.present[:, j], j]
+            self._imputed[benchmark] = tuple(np.quantile(values, IMPUTE_QUANTILES).tolist()) if values.size else None
+        return self._imputed[benchmark]
+
+    def impact(self, model_name: str, model_country: str, benchmarks: Iterable[str]) -> float:
+        """Expected change to the qualified set and Pass 2 top 10 if the model reported ``benchmarks``."""
+        row = self._row.get((model_name, model_country))
+        if self.qualified is None or row is None:
+            return 0.0
+        benchmarks = [b for b in benchmarks if b in self._column]
+
+        flips = set()
+        if row in self.top:
+            top_counts = self.engine.present[list(self.top)].sum(axis=0)
+            flips = {
+                b for b in benchmarks
+                if b not in self.qualified
+                and not self.engine.present[row, self._column[b]]
+                and top_counts[self._column[b]] == PASS2_QUALIFIED_THRESHOLD - 1
+            }
+        qualified = self.qualified | flips
+
+        scenarios = {b: self._imputations(b) for b in benchmarks if b in qualified}
+        scenarios = {b: v for b, v in scenarios.items() if v is not None}
+        displacement = 0.0
+        if scenarios:
+            for k in range(len(IMPUTE_QUANTILES)):
+                fills = {b: values[k] for b, values in scenarios.items()}
+                after = self.solver.rank_with_fills(qualified, row, fills)
+                displacement += _displacement(self.top, after, PASS2_TOP_N)
+            displacement /= len(IMPUTE_QUANTILES)
+        return displacement + QUALIFIED_CHANGE_IMPACT * len(flips)
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""Cached source pages, and a deterministic score extractor over them.
+
+Gap-fill answers keep citing the same pages: a vendor's launch post, a
+system card, a Hugging Face model card. A sibling model is often on the same
+page, in the next column of the same table. Asking the LLM (and paying for
+its web_search) to read a page we already know about is the expensive way
+to do it. Before a lookup is sent, the pass now:
+
+1. collects the URLs already cited for the model, then those cited for
+   other models of the same organization (gap cache + audit log);
+2. fetches each page once per SOURCE_DOC_TTL_DAYS, parses it into tables
+   and text blocks, and keeps that under ``data/ai_gap_sources/`` as one
+   JSON file per URL;
+3. runs ``extract_score`` for the wanted (model, benchmark) over the parsed
+   pages. Only a lookup it can't answer goes to the LLM.
+
+The extractor is deliberately strict; on any ambiguity it answers nothing:
+
+- **table**: a table whose header row has exactly one column for the model
+  and exactly one row labelled with the benchmark, or the same transposed.
+  Works on any page.
+- **text**: on a page cited for this very model, every sentence naming the
+  benchmark carries the same single percentage. Percent-type benchmarks
+  only, so years and counts aren't mistaken for scores.
+
+Pages are parsed as HTML, Markdown or plain text (Markdown pipe tables count
+as tables). PDFs and other binary types are recorded as unsupported and not
+read.
+"""
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+SOURCE_DOC_TTL_DAYS = 30
+# New page fetches per pass; the rest wait for the next run.
+MAX_FETCHES_PER_PASS = 20
+MAX_SOURCE_URLS = 8
+MAX_DOCUMENT_BYTES = 5_000_000
+FETCH_TIMEOUT_SECONDS = 20
+# llm-stats is where the gaps come from; it has nothing to extract.
+SKIPPED_HOSTS: Tuple[str, ...] = ("llm-stats.com",)
+TEXT_CONTENT_TYPES: Tuple[str, ...] = ("text/html", "application/xhtml+xml", "text/markdown", "text/plain")
+USER_AGENT = "aiolympics-gap-fill/1.0 (+https://github.com/aiolympics)"
+
+# How pages name some llm-stats benchmarks, compared after _norm().
+BENCHMARK_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "gpqa": ("gpqa diamond",),
+    "hle": ("humanity's last exam",),
+    "aime2025": ("aime 25", "aime'25"),
+    "tau2retail": ("tau2-bench retail", "τ2-bench retail"),
+    "terminalbench": ("terminal-bench 2.0", "terminal bench 2.0"),
+    "arcagiv2": ("arc-agi-2",),
+}
+# Recorded as the fill's llm_model so extracted fills stay distinguishable.
+EXTRACTOR_NAME = "source-extract"
+
+_NON_ALNUM = re.compile(r"[^0-9a-zτ]+")
+_QUALIFIER = re.compile(r"\s*[\(\[].*?[\)\]]|[*†‡¹²³]+")
+_NUMBER = re.compile(r"^\s*[*_~]*\s*(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(%?)")
+_PERCENT = re.compile(r"(?<![\d.])(\d{1,3}(?:\.\d+)?)\s?%")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+_BLOCK_TAGS = frozenset({"p", "li", "h1", "h2", "h3", "h4", "h5", "h6", "div", "section", "article", "br", "dd", "dt", "blockquote", "pre"})
+# <sup> is nearly always a footnote marker ("SWE-bench Verified¹").
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "svg", "template", "sup"})
+
+
+def _norm(text: str) -> str:
+    return _NON_ALNUM.sub("", text.lower())
+
+
+def _label(text: str) -> str:
+    """A table label without footnote markers and parenthesized qualifiers."""
+    return _norm(_QUALIFIER.sub("", text))
+
+
+# -----------------------------------------------------------------------------
+# Parsing
+# -----------------------------------------------------------------------------
+
+
+class _DocumentParser(HTMLParser):
+    """HTML → (tables as rows of cell text, text blocks outside tables)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables: List[List[List[str]]] = []
+        self.blocks: List[str] = []
+        self._stack: List[List[List[str]]] = []  # open tables (nested ones are flattened out)
+        self._cell: Optional[List[str]] = None
+        self._text: List[str] = []
+        self._skip = 0
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._text).split())
+        if text:
+            self.blocks.append(text)
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag == "table":
+            self._flush()
+            self._stack.append([])
+        elif tag == "tr" and self._stack:
+            self._stack[-1].append([])
+        elif tag in ("td", "th") and self._stack:
+            if not self._stack[-1]:
+                self._stack[-1].append([])
+            self._cell = []
+        elif tag in _BLOCK_TAGS and not self._stack:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in ("td", "th") and self._stack and self._cell is not None:
+            self._stack[-1][-1].append(" ".join("".join(self._cell).split()))
+            self._cell = None
+        elif tag == "table" and self._stack:
+            rows = [r for r in self._stack.pop() if any(r)]
+            if rows:
+                self.tables.append(rows)
+        elif tag in _BLOCK_TAGS and not self._stack:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._cell is not None:
+            self._cell.append(data)
+        elif not self._stack:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _parse_text(text: str) -> Tuple[List[List[List[str]]], List[str]]:
+    """Markdown / plain text: runs of pipe-delimited lines are tables, other lines are blocks."""
+    tables: List[List[List[str]]] = []
+    blocks: List[str] = []
+    current: List[List[str]] = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("|") and stripped.count("|") >= 2:
+            cells = [c.strip() for c in stripped.strip("|").split("|")]
+            if not all(re.fullmatch(r":?-{2,}:?", c) for c in cells if c):  # the |---|---| rule
+                current.append(cells)
+            continue
+        if current:
+            tables.append(current)
+            current = []
+        if stripped:
+            blocks.append(stripped)
+    if current:
+        tables.append(current)
+    return tables, blocks
+
+
+def parse_document(text: str, content_type: str) -> Tuple[List[List[List[str]]], List[str]]:
+    if "html" in content_type:
+        parser = _DocumentParser()
+        parser.feed(text)
+        parser.close()
+        # Rendered Markdown (e.g. a README shown as HTML) keeps its tables as
+        # <table>; literal pipe tables left in text blocks are picked up too.
+        extra_tables, _ = _parse_text("\n".join(parser.blocks))
+        return parser.tables + extra_tables, parser.blocks
+    return _parse_text(text)
+
+
+# -----------------------------------------------------------------------------
+# Document cache
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class SourceDocument:
+    url: str
+    fetched_at: str
+    status: str  # "ok", "http <code>" or "unsupported <content type>"
+    content_type: str = ""
+    tables: List[List[List[str]]] = field(default_factory=list)
+    blocks: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def fetch_document(url: str, now: datetime) -> Optional[SourceDocument]:
+    """Fetch and parse one page. None on a transient failure (retry next pass)."""
+    try:
+        resp = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=FETCH_TIMEOUT_SECONDS, stream=True)
+    except requests.RequestException as e:
+        print(f"[gap-fill]   source fetch failed: {url} ({type(e).__name__})")
+        return None
+    with resp:
+        if resp.status_code == 429 or resp.status_code >= 500:
+            return None
+        if resp.status_code != 200:
+            return SourceDocument(url, now.isoformat(), f"http {resp.status_code}")
+        content_type = (resp.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type not in TEXT_CONTENT_TYPES:
+            return SourceDocument(url, now.isoformat(), f"unsupported {content_type or 'unknown'}", content_type)
+        body = b""
+        try:
+            for chunk in resp.iter_content(64 * 1024):
+                body += chunk
+                if len(body) > MAX_DOCUMENT_BYTES:
+                    break
+        except requests.RequestException:
+            return None
+    text = body[:MAX_DOCUMENT_BYTES].decode(resp.encoding or "utf-8", errors="replace")
+    tables, blocks = parse_document(text, content_type)
+    return SourceDocument(url, now.isoformat(), "ok", content_type, tables, blocks)
+
+
+class SourceDocCache:
+    """Parsed source pages on disk, one JSON file per URL, refetched after ``ttl_days``."""
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl_days: float = SOURCE_DOC_TTL_DAYS,
+        max_fetches: int = MAX_FETCHES_PER_PASS,
+        fetch: Callable[[str, datetime], Optional[SourceDocument]] = fetch_document,
+    ):
+        self.directory = directory
+        self.ttl_days = ttl_days
+        self.max_fetches = max_fetches
+        self.fetch = fetch
+        self._loaded: Dict[str, Optional[SourceDocument]] = {}
+        self.hits = 0
+        self.fetched = 0
+        self.failed = 0
+
+    def _path(self, url: str) -> Path:
+        return self.directory / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:24] + ".json")
+
+    def _read(self, url: str) -> Optional[SourceDocument]:
+        path = self._path(url)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                doc = SourceDocument(**json.load(f))
+        except (json.JSONDecodeError, OSError, TypeError):
+            return None
+        return doc if doc.url == url else None
+
+    def _write(self, doc: SourceDocument) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(doc.url)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(doc), f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    def get(self, url: str, now: datetime) -> Optional[SourceDocument]:
+        """The parsed page, fetching it if it's missing or stale and the fetch budget allows."""
+        if url in self._loaded:
+            return self._loaded[url]
+        doc = self._read(url)
+        if doc is not None:
+            try:
+                stale = now - datetime.fromisoformat(doc.fetched_at) >= timedelta(days=self.ttl_days)
+            except ValueError:
+                stale = True
+            if not stale:
+                self.hits += 1
+                self._loaded[url] = doc
+                return doc
+        if self.fetched + self.failed >= self.max_fetches:
+            return doc  # a stale copy beats none; try again next pass
+        fresh = self.fetch(url, now)
+        if fresh is None:
+            self.failed += 1
+            return doc
+        self.fetched += 1
+        self._write(fresh)
+        self._loaded[url] = fresh
+        return fresh
+
+
+def usable_url(url: Any) -> bool:
+    if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+        return False
+    host = urlparse(url).hostname or ""
+    return not any(host == h or host.endswith("." + h) for h in SKIPPED_HOSTS)
+
+
+# -----------------------------------------------------------------------------
+# Extraction
+# -----------------------------------------------------------------------------
+
+
+def _benchmark_labels(benchmark: str) -> Tuple[str, ...]:
+    key = _norm(benchmark)
+    return (key,) + tuple(_norm(a) for a in BENCHMARK_ALIASES.get(key, ()))
+
+
+def _is_model(cell: str, model_name: str) -> bool:
+    """``cell`` names the model, possibly without the vendor prefix ("Opus 4.5").
+
+    Qualifiers are kept: "(Thinking)" tells two variants apart.
+    """
+    cell_key, model_key = _norm(cell), _norm(model_name)
+    if not cell_key:
+        return False
+    if cell_key == model_key:
+        return True
+    return len(cell_key) >= 4 and any(c.isdigit() for c in cell_key) and model_key.endswith(cell_key)
+
+
+def _format(value: str, has_percent: bool, percent: bool) -> Optional[str]:
+    number = float(value.replace(",", ""))
+    if percent:
+        if not has_percent and number <= 1:
+            return None  # a fraction, or a rank; not worth guessing
+        if number > 100:
+            return None
+        return f"{number:.1f}%"
+    if has_percent:
+        return None
+    return f"{round(number):,}" if "," in value or number >= 1000 else str(round(number))
+
+
+def _cell_score(cell: str, percent: bool) -> Optional[str]:
+    match = _NUMBER.match(cell)
+    return _format(match.group(1), bool(match.group(2)), percent) if match else None
+
+
+def _from_tables(tables: Iterable[List[List[str]]], model_name: str, labels: Tuple[str, ...], percent: bool) -> List[str]:
+    found = []
+    for table in tables:
+        header, body = table[0], table[1:]
+        # Models across, benchmarks down.
+        cols = [j for j, c in enumerate(header) if j and _is_model(c, model_name)]
+        rows = [r for r in body if r and _label(r[0]) in labels]
+        if len(cols) == 1 and len(rows) == 1 and cols[0] < len(rows[0]):
+            score = _cell_score(rows[0][cols[0]], percent)
+            if score:
+                found.append(score)
+            continue
+        # Benchmarks across, models down.
+        cols = [j for j, c in enumerate(header) if j and _label(c) in labels]
+        rows = [r for r in body if r and _is_model(r[0], model_name)]
+        if len(cols) == 1 and len(rows) == 1 and cols[0] < len(rows[0]):
+            score = _cell_score(rows[0][cols[0]], percent)
+            if score:
+                found.append(score)
+    return found
+
+
+def _benchmark_pattern(benchmark: str) -> "re.Pattern[str]":
+    names = [benchmark] + list(BENCHMARK_ALIASES.get(_norm(benchmark), ()))
+    parts = []
+    for name in names:
+        tokens = [re.escape(t) for t in re.split(r"[^0-9A-Za-zτ']+", name) if t]
+        if tokens:
+            parts.append(r"[\s\-_]*".join(tokens))
+    return re.compile(r"(?<![0-9A-Za-z])(?:" + "|".join(parts) + r")(?![0-9A-Za-z])", re.IGNORECASE)
+
+
+def _from_text(blocks: Iterable[str], benchmark: str) -> List[str]:
+    pattern = _benchmark_pattern(benchmark)
+    found = []
+    for block in blocks:
+        for sentence in _SENTENCE_END.split(block):
+            if not pattern.search(sentence):
+                continue
+            values = {float(v) for v in _PERCENT.findall(pattern.sub(" ", sentence))}
+            if len(values) > 1:
+                return []  # one sentence with competing numbers makes the page ambiguous
+            found.extend(f"{v:.1f}%" for v in values)
+    return found
+
+
+def extract_score(
+    doc: SourceDocument,
+    model_name: str,
+    benchmark: str,
+    *,
+    own_page: bool,
+    percent: bool,
+) -> Optional[Tuple[str, str]]:
+    """(score, "table" | "text") if the page states exactly one value for the pair."""
+    if not doc.ok:
+        return None
+    labels = _benchmark_labels(benchmark)
+    found = set(_from_tables(doc.tables, model_name, labels, percent))
+    if len(found) == 1:
+        return found.pop(), "table"
+    if found or not own_page or not percent:
+        return None
+    found = set(_from_text(doc.blocks, benchmark))
+    if len(found) == 1:
+        return found.pop(), "text"
+    return None
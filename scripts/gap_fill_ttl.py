@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""How long a cached gap-fill result stays fresh.
+
+One flat ``POSITIVE_CACHE_TTL_DAYS = 30`` re-queried a score from a model
+card every month, just as often as a third-party leaderboard guess. Model
+cards and papers are effectively immutable once published. Vendor blogs get
+corrected now and then. Leaderboards keep re-running models, most of all in
+the first weeks after a release. So the TTL now comes from a policy table:
+an ordered list of TtlRules matched against the entry's ``source_type``, its
+``confidence`` and the age of the model (from its llm-stats ``Released``
+month). The first rule that matches sets the TTL.
+
+DEFAULT_TTL_POLICY is the built-in table. ``--gap-fill-ttl-policy FILE``
+replaces it with a JSON list of rules in the same shape, for example::
+
+    [
+      {"name": "primary", "source_types": ["model_card", "paper"], "ttl_days": 365},
+      {"name": "leaderboard-new", "source_types": ["third_party_leaderboard"],
+       "max_model_age_days": 90, "ttl_days": 7},
+      {"name": "default", "ttl_days": 30}
+    ]
+
+A key that's left out matches anything. An entry no rule matches is never
+fresh, so a table should end with a catch-all.
+
+TtlStats counts how each rule's entries fare during one pass: a *hit* was
+fresh and applied without a call, a *miss* was cached but past its TTL and
+looked up again. Lookups with nothing cached are counted under their own
+bucket.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+_RULE_KEYS = {"name", "source_types", "confidences", "min_model_age_days", "max_model_age_days", "ttl_days"}
+
+_MONTHS = {
+    m: i + 1
+    for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"))
+}
+_MONTH_YEAR = re.compile(r"^([a-z]{3})[a-z]*\.?\s+(\d{4})$")
+UNCACHED_BUCKET = "(not cached)"
+
+
+@dataclass(frozen=True)
+class TtlRule:
+    """One row of the policy table. ``None`` / empty means "any"."""
+    name: str
+    ttl_days: float
+    source_types: FrozenSet[str] = frozenset()
+    confidences: FrozenSet[str] = frozenset()
+    min_model_age_days: Optional[int] = None
+    max_model_age_days: Optional[int] = None
+
+    def matches(self, source_type: str, confidence: str, model_age_days: Optional[int]) -> bool:
+        """A rule with an age bound never matches a model whose release month
+        is unknown; such entries fall through to the age-independent rules."""
+        if self.source_types and source_type not in self.source_types:
+            return False
+        if self.confidences and confidence not in self.confidences:
+            return False
+        if self.min_model_age_days is not None or self.max_model_age_days is not None:
+            if model_age_days is None:
+                return False
+            if self.min_model_age_days is not None and model_age_days < self.min_model_age_days:
+                return False
+            if self.max_model_age_days is not None and model_age_days >= self.max_model_age_days:
+                return False
+        return True
+
+
+DEFAULT_TTL_POLICY: Sequence[TtlRule] = (
+    # Primary sources don't get revised; a year mostly guards against a
+    # mis-attributed URL living forever.
+    TtlRule("primary-high", 365, frozenset({"model_card", "paper"}), frozenset({"high"})),
+    TtlRule("primary", 180, frozenset({"model_card", "paper"})),
+    # Launch posts are occasionally corrected in the first weeks after a
+    # release, rarely afterwards.
+    TtlRule("vendor-blog-settled", 180, frozenset({"vendor_blog"}), min_model_age_days=90),
+    TtlRule("vendor-blog", 60, frozenset({"vendor_blog"})),
+    # Leaderboards re-run new models; check young ones often.
+    TtlRule("leaderboard-new", 14, frozenset({"third_party_leaderboard"}), max_model_age_days=90),
+    TtlRule("leaderboard", 30, frozenset({"third_party_leaderboard"})),
+    TtlRule("default", 30),
+)
+
+
+def parse_released(released: Any) -> Optional[datetime]:
+    """The first day of a llm-stats ``Released`` month ("Nov. 2025", "Sept. 2025",
+    "2025-11-20"), or None if it can't be read ("-", empty)."""
+    text = str(released or "").strip().lower()
+    match = _MONTH_YEAR.match(text)
+    if match and match.group(1) in _MONTHS:
+        return datetime(int(match.group(2)), _MONTHS[match.group(1)], 1, tzinfo=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _cached_at(entry: Dict[str, Any]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(entry.get("cached_at") or "")
+    except ValueError:
+        return None
+
+
+class TtlPolicy:
+    """An ordered rule table; the first matching rule sets an entry's TTL."""
+
+    def __init__(self, rules: Sequence[TtlRule] = DEFAULT_TTL_POLICY):
+        self.rules: List[TtlRule] = list(rules)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TtlPolicy":
+        """Load a JSON list of rules (see the module docstring). Raises ValueError on a bad table."""
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if not isinstance(raw, list) or not raw:
+            raise ValueError(f"{path}: expected a non-empty JSON list of TTL rules")
+        rules = []
+        for i, item in enumerate(raw):
+            if not isinstance(item, dict) or "ttl_days" not in item:
+                raise ValueError(f"{path}: rule {i} needs at least a ttl_days")
+            unknown = set(item) - _RULE_KEYS
+            if unknown:
+                raise ValueError(f"{path}: rule {i} has unknown keys {sorted(unknown)}")
+            rules.append(TtlRule(
+                name=str(item.get("name") or f"rule-{i}"),
+                ttl_days=float(item["ttl_days"]),
+                source_types=frozenset(item.get("source_types") or ()),
+                confidences=frozenset(item.get("confidences") or ()),
+                min_model_age_days=item.get("min_model_age_days"),
+                max_model_age_days=item.get("max_model_age_days"),
+            ))
+        return cls(rules)
+
+    def rule_for(self, entry: Dict[str, Any], now: datetime, released: Any = None) -> Optional[TtlRule]:
+        """The rule governing ``entry``. ``released`` is used when the entry
+        doesn't record its model's release month (entries cached before it did)."""
+        released_at = parse_released(entry.get("model_released") or released)
+        age = (now - released_at).days if released_at else None
+        source_type = entry.get("source_type") or "none"
+        confidence = entry.get("confidence") or "low"
+        return next((r for r in self.rules if r.matches(source_type, confidence, age)), None)
+
+    def is_fresh(self, entry: Dict[str, Any], now: datetime, released: Any = None) -> bool:
+        """Whether a cached entry is a positive result still within its rule's TTL."""
+        if entry.get("score") is None:
+            return False
+        cached_at = _cached_at(entry)
+        rule = self.rule_for(entry, now, released)
+        if cached_at is None or rule is None:
+            return False
+        return (now - cached_at) < timedelta(days=rule.ttl_days)
+
+    def describe(self) -> str:
+        return ", ".join(f"{r.name}={r.ttl_days:g}d" for r in self.rules)
+
+
+@dataclass
+class TtlStats:
+    """Per-rule cache outcomes for one pass: rule name → {"hits", "misses"}."""
+    buckets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record(self, bucket: str, hit: bool) -> None:
+        counts = self.buckets.setdefault(bucket, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    def report(self, policy: TtlPolicy) -> None:
+        if not self.buckets:
+            return
+        order = [r.name for r in policy.rules] + [UNCACHED_BUCKET]
+        print("[gap-fill] cache by TTL rule        :   hits  misses  hit rate")
+        for name in sorted(self.buckets, key=lambda n: order.index(n) if n in order else len(order)):
+            hits, misses = self.buckets[name]["hits"], self.buckets[name]["misses"]
+            rate = "-" if name == UNCACHED_BUCKET else f"{hits / (hits + misses):.0%}"
+            print(f"[gap-fill]   {name:<21}: {hits:>6}  {misses:>6}  {rate:>8}")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Generate og-image.png and ig-image.png from models.json data using Playwright.
+Generate og-image.png and ig-image.png from the latest snapshot (latest.json,
+or models.json if it hasn't been published yet) using Playwright.
 OG image: 1200x630 landscape for social sharing.
 IG image: 1080x1920 portrait for Instagram with top-10 leaderboard.
 Both images are compressed via Pillow to minimize file size.
@@ -15,24 +16,20 @@ from dateutil.parser import parse as parse_date
 from PIL import Image
 from playwright.sync_api import sync_playwright
 
+from snapshot_reader import read_latest, site_document
+
 
 def load_scores(models_path):
-    """Read models.json and compute team scores mirroring index.html JS logic.
+    """Read the latest snapshot and compute team scores mirroring index.html JS logic.
 
     The frontend calculateTotals() (index.html:765-806) does:
       1. Combine US + CN models, sort by unified desc, take top 10
       2. Sum unified for each country's models in top 10 → Total Score
       3. Average avgIq and value for each country → Avg IQ / Avg Value
     We replicate that here so the OG image shows the same numbers.
+    Only history[0] is parsed (see snapshot_reader).
     """
-    with open(models_path) as f:
-        data = json.load(f)
-
-    history = data.get("history", [])
-    if not history:
-        raise ValueError("No history entries in models.json")
-
-    entry = history[0]
+    entry = read_latest(models_path)
     timestamp = entry.get("timestamp", "")
 
     # Combine all models from both teams
@@ -93,10 +90,7 @@ def load_scores(models_path):
 
 def load_top10_models(models_path):
     """Return the top 10 models with name, origin, and unified score."""
-    with open(models_path) as f:
-        data = json.load(f)
-
-    entry = data["history"][0]
+    entry = read_latest(models_path)
     all_models = []
     for team_key in ["US", "CN"]:
         for m in entry["teams"][team_key]:
@@ -292,15 +286,15 @@ def update_og_image_version(workspace):
 
 def main():
     workspace = Path(__file__).resolve().parent.parent
-    models_path = workspace / "models.json"
+    models_path = site_document(workspace)
     news_path = workspace / "news.json"
     og_template_path = workspace / "scripts" / "og-template.html"
     ig_template_path = workspace / "scripts" / "ig-template.html"
     og_output_path = workspace / "og-image.png"
     ig_output_path = workspace / "ig-image.png"
 
-    if not models_path.exists():
-        print("ERROR: models.json not found")
+    if models_path is None:
+        print("ERROR: neither latest.json nor models.json found")
         sys.exit(1)
     if not og_template_path.exists():
         print("ERROR: og-template.html not found")
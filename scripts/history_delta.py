@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""Delta encoding for the snapshot log.
+
+Consecutive snapshots from build_history_entry are nearly identical: the same
+20 models, mostly the same benchmark cells, the same descriptions and links.
+The delta storage mode keeps a full **keyframe** every KEYFRAME_INTERVAL
+snapshots and, in between, a **delta** holding only what changed since the
+previous snapshot:
+
+    {"type": "keyframe", "snapshot": {...}}
+    {"type": "delta", "set": {...}, "unset": [...], "teams": {"US": {...}}}
+
+Team rows are matched across snapshots by their ``model`` name. A team delta
+carries ``rows`` ({model: {"set": {...}, "unset": [...]}}) for changed rows,
+``new`` ({model: row}) for models that entered the cohort, and ``models``
+(the full model order) whenever membership or order changed. Key order is
+recorded whenever it would otherwise drift, so a decoded snapshot re-serializes
+byte-for-byte identically to the original.
+
+This module is the pure codec — record lists in, snapshots out. File I/O lives
+in history_store.py, which picks the codec from the log's file name.
+
+Usage:
+    python scripts/history_delta.py verify [path/to/models.json]
+"""
+import argparse
+import bisect
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# One keyframe per ~month of daily runs: any snapshot is at most 29 deltas
+# away from a full copy, and the keyframes are the bulk of the encoded size.
+KEYFRAME_INTERVAL = 30
+
+KEYFRAME = "keyframe"
+DELTA = "delta"
+
+
+def _diff_dict(prev: Dict[str, Any], cur: Dict[str, Any], skip: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Shallow diff of two dicts as {"set", "unset", "moves"} (empty parts omitted)."""
+    out: Dict[str, Any] = {}
+    # Compare serialized forms, not values: 1 == 1.0 and dicts compare equal
+    # regardless of key order, but either difference changes the bytes.
+    changed = {
+        k: v for k, v in cur.items()
+        if k not in skip and (k not in prev or _dumps(prev[k]) != _dumps(v))
+    }
+    removed = [k for k in prev if k not in cur and k not in skip]
+    if changed:
+        out["set"] = changed
+    if removed:
+        out["unset"] = removed
+
+    # Applying set/unset keeps surviving keys in place and appends new ones.
+    # Record key moves only when that guess would be wrong.
+    predicted = [k for k in prev if k in cur] + [k for k in cur if k not in prev]
+    moves = _key_moves(predicted, list(cur))
+    if moves:
+        out["moves"] = moves
+    return out
+
+
+def _key_moves(predicted: List[str], actual: List[str]) -> List[List[Optional[str]]]:
+    """Minimal [key, predecessor] moves that turn ``predicted`` into ``actual``.
+
+    Keys on a longest increasing subsequence of predicted positions stay put;
+    every other key is re-inserted after its predecessor in ``actual`` (None =
+    at the front). A new benchmark column landing mid-row costs one move
+    instead of the whole key list.
+    """
+    if predicted == actual:
+        return []
+    pos = {k: i for i, k in enumerate(predicted)}
+    seq = [pos[k] for k in actual]
+
+    # Patience-sort LIS over ``seq`` with back-pointers.
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    back = [-1] * len(seq)
+    for i, v in enumerate(seq):
+        j = bisect.bisect_left(tails, v)
+        if j == len(tails):
+            tails.append(v)
+            tail_idx.append(i)
+        else:
+            tails[j] = v
+            tail_idx[j] = i
+        back[i] = tail_idx[j - 1] if j > 0 else -1
+    keep = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        keep.add(i)
+        i = back[i]
+
+    return [
+        [k, actual[i - 1] if i > 0 else None]
+        for i, k in enumerate(actual)
+        if i not in keep
+    ]
+
+
+def _apply_moves(keys: List[str], moves: List[List[Optional[str]]]) -> List[str]:
+    moved = {k for k, _ in moves}
+    out = [k for k in keys if k not in moved]
+    for key, after in moves:
+        out.insert(0 if after is None else out.index(after) + 1, key)
+    return out
+
+
+def _apply_dict(prev: Dict[str, Any], diff: Dict[str, Any], passthrough: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    out = dict(prev)
+    for k in diff.get("unset", ()):
+        out.pop(k, None)
+    out.update(diff.get("set", {}))
+    if passthrough:
+        out.update(passthrough)
+    if "moves" in diff:
+        out = {k: out[k] for k in _apply_moves(list(out), diff["moves"])}
+    return out
+
+
+def _model_names(rows: List[Dict[str, Any]]) -> Optional[List[str]]:
+    """Row identities for a team, or None if they can't be matched by name."""
+    names = [row.get("model") for row in rows]
+    if any(not isinstance(n, str) for n in names) or len(set(names)) != len(names):
+        return None
+    return names
+
+
+def _diff_team(prev_rows: List[Dict[str, Any]], cur_rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    prev_names = _model_names(prev_rows)
+    cur_names = _model_names(cur_rows)
+    if prev_names is None or cur_names is None:
+        # Duplicate or missing model names — can't match rows, store the team whole.
+        return {"replace": cur_rows}
+
+    prev_by_name = dict(zip(prev_names, prev_rows))
+    team: Dict[str, Any] = {}
+    rows: Dict[str, Any] = {}
+    new: Dict[str, Any] = {}
+    for name, row in zip(cur_names, cur_rows):
+        if name not in prev_by_name:
+            new[name] = row
+            continue
+        diff = _diff_dict(prev_by_name[name], row)
+        if diff:
+            rows[name] = diff
+    if rows:
+        team["rows"] = rows
+    if new:
+        team["new"] = new
+    if cur_names != prev_names:
+        team["models"] = cur_names
+    return team or None
+
+
+def _apply_team(prev_rows: List[Dict[str, Any]], diff: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if "replace" in diff:
+        return diff["replace"]
+    prev_by_name = {row["model"]: row for row in prev_rows}
+    names = diff["models"] if "models" in diff else [row["model"] for row in prev_rows]
+    rows = diff.get("rows", {})
+    new = diff.get("new", {})
+    out = []
+    for name in names:
+        if name in new:
+            out.append(new[name])
+        elif name in rows:
+            out.append(_apply_dict(prev_by_name[name], rows[name]))
+        else:
+            out.append(prev_by_name[name])
+    return out
+
+
+def encode_delta(prev: Dict[str, Any], cur: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode ``cur`` as a delta record against ``prev``."""
+    record: Dict[str, Any] = {"type": DELTA}
+    record.update(_diff_dict(prev, cur, skip=("teams",)))
+
+    prev_teams = prev.get("teams")
+    cur_teams = cur.get("teams")
+    if isinstance(prev_teams, dict) and isinstance(cur_teams, dict):
+        teams: Dict[str, Any] = {}
+        for code, cur_rows in cur_teams.items():
+            team = _diff_team(prev_teams.get(code, []), cur_rows)
+            if team:
+                teams[code] = team
+        if teams:
+            record["teams"] = teams
+        # Dropped teams and team order changes are both covered by an explicit order.
+        if list(cur_teams) != list(prev_teams):
+            record["team_order"] = list(cur_teams)
+    elif "teams" not in cur and "teams" in prev:
+        record.setdefault("unset", []).append("teams")
+    elif cur_teams != prev_teams:
+        record.setdefault("set", {})["teams"] = cur_teams
+    return record
+
+
+def apply_delta(prev: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """Reconstruct a snapshot from the previous one and a delta record."""
+    passthrough: Dict[str, Any] = {}
+    if "teams" in record or "team_order" in record:
+        prev_teams = prev.get("teams", {})
+        team_diffs = record.get("teams", {})
+        order = record["team_order"] if "team_order" in record else list(prev_teams)
+        passthrough["teams"] = {
+            code: (_apply_team(prev_teams.get(code, []), team_diffs[code])
+                   if code in team_diffs else prev_teams[code])
+            for code in order
+        }
+    return _apply_dict(prev, record, passthrough)
+
+
+def encode_records(
+    snapshots_oldest_first: Iterable[Dict[str, Any]],
+    interval: int = KEYFRAME_INTERVAL,
+) -> Iterator[Dict[str, Any]]:
+    """Encode a chronological run of snapshots as keyframe/delta records."""
+    prev: Optional[Dict[str, Any]] = None
+    since_keyframe = 0
+    for snap in snapshots_oldest_first:
+        record, since_keyframe = next_record(prev, since_keyframe, snap, interval)
+        yield record
+        prev = snap
+
+
+def next_record(
+    prev: Optional[Dict[str, Any]],
+    since_keyframe: int,
+    snapshot: Dict[str, Any],
+    interval: int = KEYFRAME_INTERVAL,
+) -> Tuple[Dict[str, Any], int]:
+    """Encode the record that appends ``snapshot`` after ``prev``.
+
+    ``since_keyframe`` is the number of records written since (and including)
+    the last keyframe. Returns (record, new since_keyframe).
+    """
+    if prev is None or since_keyframe >= interval:
+        return {"type": KEYFRAME, "snapshot": snapshot}, 1
+    return encode_delta(prev, snapshot), since_keyframe + 1
+
+
+def decode_records(records_oldest_first: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Decode records into snapshots, oldest first."""
+    current: Optional[Dict[str, Any]] = None
+    for record in records_oldest_first:
+        if record.get("type") == KEYFRAME:
+            current = record["snapshot"]
+        elif current is None:
+            raise ValueError("delta record before the first keyframe")
+        else:
+            current = apply_delta(current, record)
+        yield current
+
+
+def decode_records_reverse(records_newest_first: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Decode records read from the tail backwards into snapshots, newest first.
+
+    Buffers records back to the nearest keyframe, replays that segment forward
+    and yields it in reverse, so taking the first N snapshots costs
+    O(N + KEYFRAME_INTERVAL) records.
+    """
+    segment: List[Dict[str, Any]] = []
+    for record in records_newest_first:
+        segment.append(record)
+        if record.get("type") == KEYFRAME:
+            yield from reversed(list(decode_records(reversed(segment))))
+            segment = []
+    if segment:
+        raise ValueError("delta log does not start with a keyframe")
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def verify_round_trip(history_newest_first: List[Dict[str, Any]], interval: int = KEYFRAME_INTERVAL) -> bool:
+    """Encode a models.json history, decode it back and compare byte-for-byte.
+
+    Prints the full-snapshot vs delta-encoded sizes. Returns True if every
+    snapshot round-trips exactly (including key order).
+    """
+    oldest_first = list(reversed(history_newest_first))
+    records = [json.loads(_dumps(r)) for r in encode_records(oldest_first, interval)]
+
+    ok = True
+    for i, (orig, decoded) in enumerate(zip(oldest_first, decode_records(records))):
+        if _dumps(orig) != _dumps(decoded):
+            print(f"MISMATCH at snapshot {i} ({orig.get('timestamp', '?')})")
+            ok = False
+    # Newest-first decoding (what latest()/month reads use) must agree too.
+    for orig, decoded in zip(history_newest_first, decode_records_reverse(reversed(records))):
+        if _dumps(orig) != _dumps(decoded):
+            print(f"MISMATCH (reverse) at {orig.get('timestamp', '?')}")
+            ok = False
+            break
+
+    full_bytes = sum(len(_dumps(s).encode("utf-8")) + 1 for s in oldest_first)
+    delta_bytes = sum(len(_dumps(r).encode("utf-8")) + 1 for r in records)
+    keyframes = sum(1 for r in records if r["type"] == KEYFRAME)
+    ratio = full_bytes / delta_bytes if delta_bytes else 0.0
+    print(
+        f"{len(oldest_first)} snapshots, {keyframes} keyframes (interval {interval}): "
+        f"full {full_bytes:,} bytes → delta {delta_bytes:,} bytes ({ratio:.1f}× smaller)"
+    )
+    print("Round-trip OK" if ok else "Round-trip FAILED")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta-encoded snapshot storage tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify = sub.add_parser("verify", help="Round-trip a models.json history through the delta codec")
+    verify.add_argument("models_json", nargs="?", default=str(Path(__file__).resolve().parent.parent / "models.json"))
+    verify.add_argument("--interval", type=int, default=KEYFRAME_INTERVAL)
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        with open(args.models_json, "r") as f:
+            history = json.load(f).get("history", [])
+        if not verify_round_trip(history, args.interval):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""Snapshot history storage and the artifacts published from it.
+
+The source of truth is an append-only snapshot log, ``data/history.ndjson``:
+one compact JSON snapshot per line, oldest first. Adding the daily snapshot is
+a single O(1) append — no load-the-world / rewrite-the-world, and the git diff
+is one line. The models.json envelope (metadata / teams / columns) lives next
+to it in ``data/site_envelope.json``.
+
+Everything the site fetches is a derived view regenerated from the log:
+
+- ``latest.json`` — the envelope with a single-element ``history`` array
+  holding the current snapshot. Same schema as models.json, so every consumer
+  that reads ``history[0]`` works unchanged.
+- ``archive/YYYY-MM.json`` — one shard per calendar month, newest snapshot
+  first, for history.html. A daily run only rebuilds the current month, which
+  it reads back from the tail of the log.
+- ``archive/manifest.json`` — the shard list (newest month first) with per-shard
+  counts and timestamp bounds, so the history page knows what to fetch.
+- ``models.json`` — optional legacy export of the full newest-first document
+  for external consumers (it's linked from llms.txt and the JSON-LD dataset
+  block). This is the only O(history) view.
+
+The log can instead be stored delta-encoded (``data/history.delta.ndjson``:
+periodic keyframes plus per-day changed cells, see history_delta.py). Every
+function here takes whichever log exists, so the scraper doesn't care which
+mode a checkout uses.
+
+Usage:
+    python scripts/history_store.py migrate [--force] [--storage full|delta]
+    python scripts/history_store.py convert full|delta
+    python scripts/history_store.py rebuild [--no-legacy-models-json]
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from history_delta import (
+    decode_records,
+    decode_records_reverse,
+    encode_records,
+    next_record,
+)
+from snapshot_reader import SnapshotReader
+
+LATEST_FILENAME = "latest.json"
+LEGACY_FILENAME = "models.json"
+ARCHIVE_DIRNAME = "archive"
+MANIFEST_FILENAME = "manifest.json"
+DATA_DIRNAME = "data"
+HISTORY_LOG_FILENAME = "history.ndjson"
+DELTA_LOG_FILENAME = "history.delta.ndjson"
+STORAGE_MODES = ("full", "delta")
+ENVELOPE_FILENAME = "site_envelope.json"
+
+# Shard key for snapshots whose timestamp can't be read. Should never fire for
+# scraper-written entries, but hand-edited history has been seen in the wild.
+UNKNOWN_SHARD = "unknown"
+
+# Block size for reading the log backwards from its tail.
+_REVERSE_READ_BLOCK = 1 << 16
+
+
+def split_site_data(data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Split a models.json document into (envelope, history).
+
+    The envelope is everything except ``history`` — metadata, team blurbs and
+    column labels — and is repeated verbatim in latest.json.
+    """
+    envelope = {k: v for k, v in data.items() if k != "history"}
+    history = data.get("history") or []
+    return envelope, history
+
+
+def shard_key(entry: Dict[str, Any]) -> str:
+    """Return the ``YYYY-MM`` archive shard a snapshot belongs to."""
+    ts = str(entry.get("timestamp", ""))
+    if len(ts) >= 7 and ts[4] == "-" and ts[:4].isdigit() and ts[5:7].isdigit():
+        return ts[:7]
+    return UNKNOWN_SHARD
+
+
+def history_log_path(workspace_dir: Path) -> Path:
+    """Path of the snapshot log, preferring the delta-encoded one if present."""
+    delta_path = workspace_dir / DATA_DIRNAME / DELTA_LOG_FILENAME
+    if delta_path.exists():
+        return delta_path
+    return workspace_dir / DATA_DIRNAME / HISTORY_LOG_FILENAME
+
+
+def _is_delta_log(log_path: Path) -> bool:
+    return log_path.name == DELTA_LOG_FILENAME
+
+
+def envelope_path(workspace_dir: Path) -> Path:
+    return workspace_dir / DATA_DIRNAME / ENVELOPE_FILENAME
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    # Write-then-rename so a crash mid-write never leaves a truncated artifact
+    # for the site (or the next scraper run) to choke on.
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=2)
+    tmp_path.replace(path)
+
+
+def _encode_line(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _decode_line(line: bytes, log_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        # A torn final line from a crashed append is the only expected cause.
+        print(f"Warning: skipping unreadable line in {log_path.name} ({e})")
+        return None
+
+
+# -----------------------------------------------------------------------------
+# Snapshot log
+# -----------------------------------------------------------------------------
+
+
+def append_snapshot(log_path: Path, entry: Dict[str, Any]) -> None:
+    """Append one snapshot to the log.
+
+    O(1) in the size of the history for the full log. The delta log also has
+    to rebuild the previous snapshot to diff against, which costs at most one
+    keyframe interval of records, located through the snapshot index.
+    """
+    record = entry
+    if _is_delta_log(log_path):
+        prev, since_keyframe = (None, 0)
+        if log_path.exists():
+            with SnapshotReader(log_path) as reader:
+                try:
+                    prev, since_keyframe = reader.latest(), reader.since_keyframe
+                except IndexError:
+                    pass  # no readable snapshot yet: start with a keyframe
+        record, _ = next_record(prev, since_keyframe, entry)
+
+    log_path.parent.mkdir(exist_ok=True)
+    with open(log_path, "ab") as f:
+        # If a previous append died mid-line, start on a fresh line so the torn
+        # record stays isolated (readers skip it) instead of corrupting ours.
+        if f.tell() > 0:
+            with open(log_path, "rb") as check:
+                check.seek(-1, os.SEEK_END)
+                if check.read(1) != b"\n":
+                    f.write(b"\n")
+        f.write(_encode_line(record))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_log(log_path: Path, snapshots_oldest_first: Iterable[Dict[str, Any]]) -> int:
+    """Write a whole log from scratch (migration / conversion). Returns the count."""
+    records: Iterable[Dict[str, Any]] = snapshots_oldest_first
+    if _is_delta_log(log_path):
+        records = encode_records(snapshots_oldest_first)
+    log_path.parent.mkdir(exist_ok=True)
+    tmp_path = log_path.with_name(log_path.name + ".tmp")
+    count = 0
+    with open(tmp_path, "wb") as f:
+        for record in records:
+            f.write(_encode_line(record))
+            count += 1
+    tmp_path.replace(log_path)
+    return count
+
+
+def _iter_records(log_path: Path) -> Iterator[Dict[str, Any]]:
+    with open(log_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                record = _decode_line(line, log_path)
+                if record is not None:
+                    yield record
+
+
+def _iter_records_reverse(log_path: Path) -> Iterator[Dict[str, Any]]:
+    with open(log_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        carry = b""
+        while pos > 0:
+            step = min(_REVERSE_READ_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + carry).split(b"\n")
+            # The first piece may be the back half of a line that starts in an
+            # earlier block; hold it until that block has been read.
+            carry = lines[0]
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    record = _decode_line(line, log_path)
+                    if record is not None:
+                        yield record
+        if carry.strip():
+            record = _decode_line(carry, log_path)
+            if record is not None:
+                yield record
+
+
+def iter_snapshots(log_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield snapshots oldest first."""
+    if _is_delta_log(log_path):
+        return decode_records(_iter_records(log_path))
+    return _iter_records(log_path)
+
+
+def iter_snapshots_reverse(log_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield snapshots newest first, reading the log backwards from its tail.
+
+    Only the lines actually consumed are read and parsed, so asking for the
+    latest snapshot (or the current month) costs O(what you take), not
+    O(history). The delta log additionally replays back to the nearest
+    keyframe.
+    """
+    if _is_delta_log(log_path):
+        return decode_records_reverse(_iter_records_reverse(log_path))
+    return _iter_records_reverse(log_path)
+
+
+def read_month(log_path: Path, month: str) -> List[Dict[str, Any]]:
+    """Return the newest run of snapshots in ``month`` (newest first) from the log tail."""
+    out: List[Dict[str, Any]] = []
+    for entry in iter_snapshots_reverse(log_path):
+        if shard_key(entry) != month:
+            break
+        out.append(entry)
+    return out
+
+
+def load_envelope(workspace_dir: Path) -> Dict[str, Any]:
+    path = envelope_path(workspace_dir)
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_envelope(workspace_dir: Path, envelope: Dict[str, Any]) -> None:
+    path = envelope_path(workspace_dir)
+    path.parent.mkdir(exist_ok=True)
+    _write_json(path, envelope)
+
+
+# -----------------------------------------------------------------------------
+# Derived views
+# -----------------------------------------------------------------------------
+
+
+def write_latest(workspace_dir: Path, envelope: Dict[str, Any], entry: Dict[str, Any]) -> Path:
+    """Write latest.json: the envelope plus a one-snapshot history array."""
+    path = workspace_dir / LATEST_FILENAME
+    _write_json(path, {**envelope, "history": [entry]})
+    return path
+
+
+def _manifest_shard(month: str, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "month": month,
+        "file": f"{ARCHIVE_DIRNAME}/{month}.json",
+        "count": len(entries),
+        "newest": entries[0].get("timestamp", ""),
+        "oldest": entries[-1].get("timestamp", ""),
+    }
+
+
+def _write_manifest(workspace_dir: Path, shards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Newest month first, matching history order. The unknown bucket sorts
+    # last so it never masquerades as the current month.
+    shards = sorted(shards, key=lambda s: (s["month"] != UNKNOWN_SHARD, s["month"]), reverse=True)
+    manifest = {
+        "generated": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "total": sum(s["count"] for s in shards),
+        "latest": LATEST_FILENAME,
+        "shards": shards,
+    }
+    _write_json(workspace_dir / ARCHIVE_DIRNAME / MANIFEST_FILENAME, manifest)
+    return manifest
+
+
+def write_archive(workspace_dir: Path, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Write every month shard and the manifest for ``history`` (newest first).
+
+    Shard files for months that no longer have any snapshots are deleted.
+    """
+    archive_dir = workspace_dir / ARCHIVE_DIRNAME
+    archive_dir.mkdir(exist_ok=True)
+
+    shards: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in history:
+        shards.setdefault(shard_key(entry), []).append(entry)
+
+    for month, entries in shards.items():
+        _write_json(archive_dir / f"{month}.json", {"month": month, "history": entries})
+    for stale in archive_dir.glob("*.json"):
+        if stale.name != MANIFEST_FILENAME and stale.stem not in shards:
+            stale.unlink()
+
+    return _write_manifest(
+        workspace_dir, [_manifest_shard(month, entries) for month, entries in shards.items()]
+    )
+
+
+def update_archive_month(
+    workspace_dir: Path,
+    month: str,
+    entries: List[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Rewrite one month shard and patch its row in the existing manifest.
+
+    Returns None if there is no manifest to patch yet — the caller should do a
+    full ``write_archive`` instead.
+    """
+    manifest_path = workspace_dir / ARCHIVE_DIRNAME / MANIFEST_FILENAME
+    if not manifest_path.exists() or not entries:
+        return None
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    _write_json(workspace_dir / ARCHIVE_DIRNAME / f"{month}.json", {"month": month, "history": entries})
+    shards = [s for s in manifest.get("shards", []) if s.get("month") != month]
+    shards.append(_manifest_shard(month, entries))
+    return _write_manifest(workspace_dir, shards)
+
+
+def export_legacy(workspace_dir: Path, envelope: Dict[str, Any], history: List[Dict[str, Any]]) -> Path:
+    """Write the legacy full-history models.json (newest first)."""
+    path = workspace_dir / LEGACY_FILENAME
+    _write_json(path, {**envelope, "history": history})
+    return path
+
+
+def rebuild_views(workspace_dir: Path, write_legacy: bool = True) -> None:
+    """Regenerate every derived view from the log. O(history); used by the CLI."""
+    log_path = history_log_path(workspace_dir)
+    envelope = load_envelope(workspace_dir)
+    history = list(iter_snapshots_reverse(log_path))
+    if not history:
+        print(f"Warning: {log_path.name} is empty; nothing to publish.")
+        return
+    write_latest(workspace_dir, envelope, history[0])
+    manifest = write_archive(workspace_dir, history)
+    if write_legacy:
+        export_legacy(workspace_dir, envelope, history)
+    print(
+        f"Rebuilt {LATEST_FILENAME} + {len(manifest['shards'])} archive shards "
+        f"({manifest['total']} snapshots)" + (f" + {LEGACY_FILENAME}" if write_legacy else "")
+    )
+
+
+def publish_appended(
+    workspace_dir: Path,
+    envelope: Dict[str, Any],
+    entry: Dict[str, Any],
+    write_legacy: bool = True,
+) -> None:
+    """Refresh the derived views after ``entry`` has been appended to the log.
+
+    latest.json comes straight from ``entry``; the current month's shard is
+    re-read from the log tail and its manifest row patched in place. The whole
+    log is walked at most once: for the legacy export (if enabled), or to
+    rebuild every shard when there's no manifest to patch, sharing the result.
+    """
+    log_path = history_log_path(workspace_dir)
+    write_latest(workspace_dir, envelope, entry)
+
+    month = shard_key(entry)
+    history: Optional[List[Dict[str, Any]]] = None  # the whole log, read at most once
+    manifest = update_archive_month(workspace_dir, month, read_month(log_path, month))
+    if manifest is None:
+        history = list(iter_snapshots_reverse(log_path))
+        manifest = write_archive(workspace_dir, history)
+        rewritten = "all"
+    else:
+        rewritten = month
+    print(
+        f"Published {LATEST_FILENAME} + {len(manifest['shards'])} archive shards "
+        f"({manifest['total']} snapshots; rewrote: {rewritten})"
+    )
+
+    if write_legacy:
+        if history is None:
+            history = list(iter_snapshots_reverse(log_path))
+        export_legacy(workspace_dir, envelope, history)
+        print(f"Exported legacy {LEGACY_FILENAME}")
+
+
+# -----------------------------------------------------------------------------
+# Loading + migration
+# -----------------------------------------------------------------------------
+
+
+def _load_from_archive(workspace_dir: Path) -> Optional[Dict[str, Any]]:
+    latest_path = workspace_dir / LATEST_FILENAME
+    manifest_path = workspace_dir / ARCHIVE_DIRNAME / MANIFEST_FILENAME
+    if not latest_path.exists():
+        return None
+
+    with open(latest_path, "r") as f:
+        envelope, _ = split_site_data(json.load(f))
+
+    history: List[Dict[str, Any]] = []
+    if manifest_path.exists():
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        for shard in manifest.get("shards", []):
+            with open(workspace_dir / shard["file"], "r") as f:
+                history.extend(json.load(f).get("history", []))
+    return {**envelope, "history": history}
+
+
+def load_site_data(workspace_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the full site document (envelope + newest-first history).
+
+    Reads the snapshot log if it exists; otherwise the legacy models.json;
+    otherwise reassembles it from latest.json + the archive shards. Returns
+    None if none of those exist.
+    """
+    log_path = history_log_path(workspace_dir)
+    if log_path.exists():
+        return {**load_envelope(workspace_dir), "history": list(iter_snapshots_reverse(log_path))}
+
+    legacy_path = workspace_dir / LEGACY_FILENAME
+    if legacy_path.exists():
+        with open(legacy_path, "r") as f:
+            return json.load(f)
+
+    return _load_from_archive(workspace_dir)
+
+
+def migrate_to_log(workspace_dir: Path, force: bool = False, storage: str = "full") -> int:
+    """One-time migration of ``data.history`` into the append-only log.
+
+    Reads models.json (or, failing that, latest.json + archive/), reverses the
+    newest-first history into oldest-first log order, and writes the envelope
+    alongside. ``storage`` picks the full or delta-encoded log. Refuses to
+    clobber an existing log unless ``force`` is set. Returns the number of
+    snapshots migrated.
+    """
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"unknown storage mode {storage!r}; expected one of {STORAGE_MODES}")
+    existing = [
+        workspace_dir / DATA_DIRNAME / name
+        for name in (HISTORY_LOG_FILENAME, DELTA_LOG_FILENAME)
+        if (workspace_dir / DATA_DIRNAME / name).exists()
+    ]
+    if existing and not force:
+        raise FileExistsError(f"{existing[0]} already exists; pass force=True to overwrite")
+
+    legacy_path = workspace_dir / LEGACY_FILENAME
+    if legacy_path.exists():
+        with open(legacy_path, "r") as f:
+            data = json.load(f)
+    else:
+        data = _load_from_archive(workspace_dir)
+    if data is None:
+        raise FileNotFoundError(f"No models.json or latest.json in {workspace_dir} to migrate")
+
+    envelope, history = split_site_data(data)
+    save_envelope(workspace_dir, envelope)
+    log_path = workspace_dir / DATA_DIRNAME / (DELTA_LOG_FILENAME if storage == "delta" else HISTORY_LOG_FILENAME)
+    count = write_log(log_path, reversed(history))
+    for stale in existing:
+        if stale != log_path:
+            stale.unlink()
+    print(f"Migrated {count} snapshots into {log_path.relative_to(workspace_dir)}")
+    return count
+
+
+def convert_log(workspace_dir: Path, storage: str) -> int:
+    """Re-encode the current snapshot log as ``storage`` ("full" or "delta").
+
+    Exactly one log exists afterwards, so history_log_path() stays unambiguous.
+    """
+    if storage not in STORAGE_MODES:
+        raise ValueError(f"unknown storage mode {storage!r}; expected one of {STORAGE_MODES}")
+    source = history_log_path(workspace_dir)
+    if not source.exists():
+        raise FileNotFoundError(f"No snapshot log in {workspace_dir / DATA_DIRNAME}; run migrate first")
+    target = workspace_dir / DATA_DIRNAME / (DELTA_LOG_FILENAME if storage == "delta" else HISTORY_LOG_FILENAME)
+    if target == source:
+        print(f"{source.name} is already {storage}-encoded")
+        return 0
+    count = write_log(target, iter_snapshots(source))
+    source.unlink()
+    print(
+        f"Converted {count} snapshots: {source.name} → {target.name} "
+        f"({target.stat().st_size:,} bytes)"
+    )
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the snapshot log and its published views")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="One-time import of models.json history into the log")
+    migrate.add_argument("--force", action="store_true", help="Overwrite an existing log")
+    migrate.add_argument(
+        "--storage",
+        choices=STORAGE_MODES,
+        default="full",
+        help="full = one snapshot per line; delta = periodic keyframes + per-day deltas",
+    )
+
+    convert = sub.add_parser("convert", help="Re-encode the existing log as full or delta storage")
+    convert.add_argument("storage", choices=STORAGE_MODES)
+
+    rebuild = sub.add_parser("rebuild", help="Regenerate latest.json, archive/ and models.json from the log")
+    rebuild.add_argument(
+        "--no-legacy-models-json",
+        action="store_true",
+        help="Don't write the legacy full-history models.json",
+    )
+
+    args = parser.parse_args()
+    workspace = Path(__file__).resolve().parent.parent
+
+    if args.command == "migrate":
+        migrate_to_log(workspace, force=args.force, storage=args.storage)
+        rebuild_views(workspace, write_legacy=False)
+    elif args.command == "convert":
+        convert_log(workspace, args.storage)
+    elif args.command == "rebuild":
+        rebuild_views(workspace, write_legacy=not args.no_legacy_models_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Parse-once cell storage for leaderboard rows.
+
+A LeaderboardEntry's cells used to be a plain ``Dict[str, str]`` of raw table
+text, so every consumer re-derived the same facts from strings like "92.8%":
+``MISSING_VALUE_MARKERS`` membership in participation counting, range
+resolution, min/max discovery and gap-fill candidate selection, and
+``parse_to_number`` in every scoring path.
+
+CellStore is a drop-in ``MutableMapping`` over the same header → raw value
+pairs. Each cell is classified once, when it is written: its number goes into
+a float array and its presence / "reported" / percent flags into integer
+bitmasks, one bit per slot. The raw values are kept, in insertion order, only
+for display and export (CSV/JSON/history rows), so iteration order and the
+bytes the writers produce are unchanged.
+
+This module is a leaf (no playwright, no numpy) so scrape_models,
+scoring_engine and gap_fill_benchmarks can all share one definition of
+"missing" instead of mirroring it.
+"""
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Tuple, Union
+
+# Placeholders that mean "this cell is missing." llm-stats uses a typographic
+# em-dash (U+2014) and occasionally an en-dash (U+2013) for un-reported benchmarks,
+# not the ASCII hyphen-minus. Missing that distinction silently poisons averages
+# because parse_to_number coerces em-dash to 0.0.
+MISSING_VALUE_MARKERS: FrozenSet[str] = frozenset(
+    {"", "-", "\u2013", "\u2014", "n/a", "N/A", "null", "None"}
+)
+
+
+def parse_to_number(value: str) -> float:
+    """Convert raw string to number for calculations. Non-numeric → 0."""
+    if not value or not isinstance(value, str):
+        return 0.0
+
+    cleaned = value.replace("%", "").replace(",", "").replace("$", "").strip()
+
+    # Handle common placeholders
+    if cleaned in MISSING_VALUE_MARKERS:
+        return 0.0
+
+    try:
+        return float(cleaned)
+    except ValueError:
+        return 0.0
+
+
+def _is_marker(raw: Any) -> bool:
+    try:
+        return raw in MISSING_VALUE_MARKERS
+    except TypeError:
+        # Unhashable values (gap-fill's "_provenance" dict) are never markers.
+        return False
+
+
+class CellStore(MutableMapping):
+    """Header → raw cell value, with each cell parsed once on write.
+
+    Two notions of "has a value" exist in the pipeline and both are kept:
+
+    - ``is_present`` — the raw value is not exactly a missing-value marker.
+      This is what participation counting and scoring have always used.
+    - ``is_reported`` — the stripped string form is not a marker. Gap-fill
+      uses this so a stray " - " isn't mistaken for a score.
+    """
+
+    __slots__ = ("_index", "_raw", "_values", "_present", "_reported", "_percent")
+
+    def __init__(self, cells: Union[Mapping[str, Any], Iterable[Tuple[str, Any]], None] = None):
+        self._index: Dict[str, int] = {}
+        self._raw: List[Any] = []
+        self._values = array("d")
+        self._present = 0
+        self._reported = 0
+        self._percent = 0
+        if cells:
+            self.update(cells)
+
+    # -- mapping protocol --------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        return self._raw[self._index[key]]
+
+    def __setitem__(self, key: str, raw: Any) -> None:
+        slot = self._index.get(key)
+        if slot is None:
+            slot = len(self._raw)
+            self._index[key] = slot
+            self._raw.append(raw)
+            self._values.append(0.0)
+        else:
+            self._raw[slot] = raw
+        bit = 1 << slot
+        text = str(raw).strip()
+        present = not _is_marker(raw)
+        reported = text not in MISSING_VALUE_MARKERS
+        percent = text.endswith("%")
+        self._values[slot] = parse_to_number(raw)
+        self._present = self._present | bit if present else self._present & ~bit
+        self._reported = self._reported | bit if reported else self._reported & ~bit
+        self._percent = self._percent | bit if percent else self._percent & ~bit
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._index.pop(key)
+        # The slot is retired rather than reused so the other bits stay put;
+        # re-adding the key appends it at the end, as a dict would.
+        mask = ~(1 << slot)
+        self._raw[slot] = None
+        self._values[slot] = 0.0
+        self._present &= mask
+        self._reported &= mask
+        self._percent &= mask
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._index.get(key)
+        return default if slot is None else self._raw[slot]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    # -- parsed views --------------------------------------------------------
+
+    def _slot_bit(self, key: str) -> int:
+        slot = self._index.get(key)
+        return 0 if slot is None else 1 << slot
+
+    def is_present(self, key: str) -> bool:
+        """True unless the cell is absent or exactly a missing-value marker."""
+        return bool(self._present & self._slot_bit(key))
+
+    def is_reported(self, key: str) -> bool:
+        """True unless the cell is absent or a marker once stripped."""
+        return bool(self._reported & self._slot_bit(key))
+
+    def is_percent(self, key: str) -> bool:
+        """Whether the cell's text ends in "%"."""
+        return bool(self._percent & self._slot_bit(key))
+
+    def number(self, key: str) -> float:
+        """``parse_to_number`` of the cell, computed when it was written (0.0 if absent)."""
+        slot = self._index.get(key)
+        return 0.0 if slot is None else self._values[slot]
+
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Leaderboard rows from the page's data instead of its rendered table.
+
+The llm-stats leaderboard is a Next.js page: the table is rendered from model
+records that arrive either embedded in the HTML as the flight payload
+(``self.__next_f.push([1, "..."])`` chunks, the same mechanism the detail
+pages use) or from JSON / RSC responses the page fetches. Scraping the
+rendered cells means waiting out fixed sleeps for the render and then
+guessing at icons (the Multimodal signal lists). FeedCapture reads the data
+itself:
+
+- ``attach`` registers a ``page.on("response")`` listener before navigation
+  and keeps the same-host JSON and RSC (``text/x-component``) responses;
+- ``values`` decodes the flight payload of the main document plus every
+  captured body into plain JSON values;
+- read_feed_models walks those values for the longest list of model records:
+  dicts with a name, a detail-page slug or URL, and a country
+  (FEED_NAME_KEYS, FEED_SLUG_KEYS / FEED_URL_KEYS, FEED_COUNTRY_KEYS).
+
+A record's generic ``id`` is never used for the detail URL: it may be a
+numeric or UUID key rather than the page slug, and Stage 3 would then ask for
+pages that don't exist. A record with no slug or model URL doesn't count as a
+model record, so a feed of such records falls back to the DOM scrape.
+
+Metadata cells are written in the rendered table's formats ("1.0M",
+"131.1k", "$2.50", "Jan. 2025", "Open"), so a snapshot scraped from the feed
+compares cell for cell with one scraped from the DOM. Benchmark results are
+kept as the feed gives them (FeedScore), because only the caller knows which
+benchmarks the table shows on their own scale.
+
+The key lists are deliberately broad because the feed isn't a published API.
+A field this module doesn't recognise is simply not read, and if no list
+qualifies the caller falls back to the DOM scrape.
+"""
+import calendar
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+FEED_NAME_KEYS: Tuple[str, ...] = ("name", "model_name", "modelName")
+FEED_SLUG_KEYS: Tuple[str, ...] = ("model_id", "modelId", "slug")
+FEED_URL_KEYS: Tuple[str, ...] = ("url", "href", "link", "model_url", "modelUrl")
+MODEL_PAGE_URL = "https://llm-stats.com/models/{}"
+FEED_COUNTRY_KEYS: Tuple[str, ...] = ("country", "country_code", "countryCode", "organization_country", "origin")
+FEED_RANK_KEYS: Tuple[str, ...] = ("rank", "position")
+FEED_BENCHMARK_LIST_KEYS: Tuple[str, ...] = ("benchmarks", "scores", "benchmark_scores", "results")
+FEED_CONTENT_TYPES: Tuple[str, ...] = ("application/json", "text/x-component")
+
+# The table's columns the feed can fill, around the benchmark columns, in the
+# table's order. Speed, Latency and the category aggregates aren't in the
+# records, so a feed snapshot leaves them out.
+FEED_LEADING_COLUMNS: Tuple[str, ...] = ("License", "Context", "Input$/M", "Output$/M")
+FEED_TRAILING_COLUMNS: Tuple[str, ...] = ("Parameters(B)", "KnowledgeCutoff", "Multimodal")
+# The table's missing-value cell.
+FEED_MISSING = "-"
+# Keys whose value says whether the model takes images.
+FEED_MULTIMODAL_KEYS: Tuple[str, ...] = ("multimodal", "is_multimodal", "isMultimodal")
+FEED_MODALITY_KEYS: Tuple[str, ...] = ("input_modalities", "modalities")
+
+_FLIGHT_CHUNK = re.compile(r'self\.__next_f\.push\(\[1,\s*("(?:[^"\\]|\\.)*")\]\)', re.DOTALL)
+_RSC_ROW = re.compile(r"^[0-9a-zA-Z]+:(?=[\[{])")
+
+
+@dataclass
+class FeedScore:
+    """One benchmark result as the feed gives it."""
+    score: Optional[float]  # raw, on the benchmark's own scale
+    max_score: Optional[float]
+    normalized: Optional[float]  # normalized_score, 0–1
+
+    def percent(self) -> Optional[float]:
+        """The result as a percentage, or None if the feed doesn't pin it down.
+
+        The raw score is used when its scale is unambiguous: a 0–1 fraction
+        (max_score absent or 1) or a 0–100 value with max_score 100. A fraction
+        with max_score 100 is the ambiguous case the detail-page parser warns
+        about; it, like any other scale, goes through normalized_score.
+        """
+        score = self.score
+        if score is not None:
+            if self.max_score in (None, 1) and 0 <= score <= 1:
+                return score * 100
+            if self.max_score == 100 and 1 < score <= 100:
+                return score
+        if self.normalized is not None:
+            return self.normalized * 100
+        return None
+
+
+@dataclass
+class FeedModel:
+    """One model record, reduced to what the leaderboard shows."""
+    name: str
+    url: str  # the model's llm-stats detail page
+    country: str  # as the feed spells it; the caller maps it to an origin code
+    rank: Optional[int]
+    columns: Dict[str, str] = field(default_factory=dict)  # table column → cell, in the table's format
+    multimodal: Optional[bool] = None
+    scores: Dict[str, FeedScore] = field(default_factory=dict)  # benchmark name → result
+
+
+def _rsc_values(text: str) -> Iterator[Any]:
+    """JSON values in RSC text: one ``<id>:<json>`` row per line."""
+    for line in text.splitlines():
+        match = _RSC_ROW.match(line)
+        if not match:
+            continue
+        try:
+            yield json.loads(line[match.end():])
+        except json.JSONDecodeError:
+            continue
+
+
+def flight_values(html: str) -> List[Any]:
+    """JSON values of the flight payload embedded in a Next.js page."""
+    chunks = []
+    for match in _FLIGHT_CHUNK.finditer(html):
+        try:
+            chunks.append(json.loads(match.group(1)))
+        except json.JSONDecodeError:
+            continue
+    return list(_rsc_values("".join(chunks)))
+
+
+def _first(record: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+_SLUG = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+_MODEL_PATH = re.compile(r"^/models/([A-Za-z0-9][A-Za-z0-9._-]*)/?$")
+
+
+def page_url(record: Dict[str, Any]) -> Optional[str]:
+    """The record's detail-page URL, from a ``/models/<slug>`` link or a slug field."""
+    for key in FEED_URL_KEYS:
+        value = record.get(key)
+        if isinstance(value, str):
+            parsed = urlparse(value.strip())
+            match = _MODEL_PATH.match(parsed.path)
+            if match and parsed.hostname in (None, "llm-stats.com", "www.llm-stats.com"):
+                return MODEL_PAGE_URL.format(match.group(1))
+    for key in FEED_SLUG_KEYS:
+        value = record.get(key)
+        if isinstance(value, str) and _SLUG.fullmatch(value.strip()):
+            return MODEL_PAGE_URL.format(value.strip())
+    return None
+
+
+def _is_model_record(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and isinstance(_first(value, FEED_NAME_KEYS), str)
+        and page_url(value) is not None
+        and isinstance(_first(value, FEED_COUNTRY_KEYS), str)
+    )
+
+
+def _record_lists(value: Any) -> Iterator[List[Dict[str, Any]]]:
+    """Every list in ``value`` whose items are all model records."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            if item and all(_is_model_record(v) for v in item):
+                yield item
+            else:
+                stack.extend(item)
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", ""))
+        except ValueError:
+            return None
+    return None
+
+
+def _scores(record: Dict[str, Any]) -> Dict[str, FeedScore]:
+    """Benchmark name → result, from the record's benchmark list if it has one.
+
+    A result with neither a raw nor a normalized score isn't reported, and an
+    out-of-range normalized_score is ignored, as in the detail-page parser.
+    """
+    scores: Dict[str, FeedScore] = {}
+    for key in FEED_BENCHMARK_LIST_KEYS:
+        items = record.get(key)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            name = _first(item, ("name", "benchmark_name", "benchmark"))
+            norm = _number(item.get("normalized_score"))
+            if norm is not None and not 0 <= norm <= 1:
+                norm = None
+            result = FeedScore(_number(item.get("score")), _number(item.get("max_score")), norm)
+            if isinstance(name, str) and (result.score is not None or result.normalized is not None):
+                scores.setdefault(name, result)
+    return scores
+
+
+# -----------------------------------------------------------------------------
+# Table cell formats
+# -----------------------------------------------------------------------------
+
+
+def _compact(value: float) -> str:
+    """1 → "1", 1.0486 → "1.0": whole numbers bare, anything else to one decimal."""
+    return f"{value:.0f}" if value == int(value) else f"{value:.1f}"
+
+
+def format_tokens(value: Any) -> Optional[str]:
+    """A context window as the table shows it: "1M", "1.0M", "200k", "131.1k"."""
+    tokens = _number(value)
+    if tokens is None or tokens <= 0:
+        return None
+    if tokens >= 1_000_000:
+        return f"{_compact(tokens / 1_000_000)}M"
+    if tokens >= 1_000:
+        return f"{_compact(tokens / 1_000)}k"
+    return _compact(tokens)
+
+
+def format_price(value: Any) -> Optional[str]:
+    """A price per million tokens as the table shows it: "$2.50"."""
+    price = _number(value)
+    if price is None or price < 0:
+        return None
+    return f"${price:.2f}"
+
+
+def format_parameters(value: Any) -> Optional[str]:
+    """A parameter count as the table's Parameters(B) cell: "284", "1023.2".
+
+    Counts of a million or more are raw parameter counts; smaller ones are
+    already in billions.
+    """
+    count = _number(value)
+    if count is None or count <= 0:
+        return None
+    billions = count / 1e9 if count >= 1e6 else count
+    return _compact(round(billions, 1))
+
+
+def format_month(value: Any) -> Optional[str]:
+    """An ISO date ("2025-01", "2025-01-31") as the table's month cell: "Jan. 2025"."""
+    if not isinstance(value, str):
+        return None
+    match = re.match(r"(\d{4})-(\d{2})", value.strip())
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        return None
+    return f"{calendar.month_abbr[int(match.group(2))]}. {match.group(1)}"
+
+
+def format_license(value: Any) -> Optional[str]:
+    """The table's License cell: "Closed" for a proprietary license, else "Open"."""
+    if isinstance(value, bool):
+        return "Open" if value else "Closed"
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return "Closed" if value.strip().lower() in ("proprietary", "closed", "commercial") else "Open"
+
+
+# Record key → (table column, cell formatter). The first key that formats wins.
+FEED_COLUMNS: Dict[str, Tuple[str, Callable[[Any], Optional[str]]]] = {
+    "license": ("License", format_license),
+    "is_open_source": ("License", format_license),
+    "context_window": ("Context", format_tokens),
+    "context_length": ("Context", format_tokens),
+    "input_price": ("Input$/M", format_price),
+    "output_price": ("Output$/M", format_price),
+    "param_count": ("Parameters(B)", format_parameters),
+    "parameters": ("Parameters(B)", format_parameters),
+    "knowledge_cutoff": ("KnowledgeCutoff", format_month),
+}
+
+
+def _multimodal(record: Dict[str, Any]) -> Optional[bool]:
+    flag = _first(record, FEED_MULTIMODAL_KEYS)
+    if isinstance(flag, bool):
+        return flag
+    modalities = _first(record, FEED_MODALITY_KEYS)
+    if isinstance(modalities, list):
+        return any(str(m).lower() in ("image", "images", "vision", "video") for m in modalities)
+    return None
+
+
+def _feed_model(record: Dict[str, Any]) -> FeedModel:
+    rank = _first(record, FEED_RANK_KEYS)
+    columns: Dict[str, str] = {}
+    for key, (header, formatter) in FEED_COLUMNS.items():
+        if header not in columns:
+            cell = formatter(record.get(key))
+            if cell is not None:
+                columns[header] = cell
+    return FeedModel(
+        name=_first(record, FEED_NAME_KEYS).strip(),
+        url=page_url(record),
+        country=_first(record, FEED_COUNTRY_KEYS).strip(),
+        rank=rank if isinstance(rank, int) and not isinstance(rank, bool) else None,
+        columns=columns,
+        multimodal=_multimodal(record),
+        scores=_scores(record),
+    )
+
+
+def read_feed_models(values: List[Any]) -> List[FeedModel]:
+    """The models of the longest record list in ``values``, in leaderboard order.
+
+    The order is the records' rank field if every record has one, else the
+    order the feed lists them in. Empty if no list of model records is found.
+    """
+    best: List[Dict[str, Any]] = []
+    for value in values:
+        for records in _record_lists(value):
+            if len(records) > len(best):
+                best = records
+    models = [_feed_model(r) for r in best]
+    if models and all(m.rank is not None for m in models):
+        models.sort(key=lambda m: m.rank)
+    return models
+
+
+class FeedCapture:
+    """Data responses from ``url``'s host seen by ``page`` while attached."""
+
+    def __init__(self, page, url: str):
+        self.page = page
+        self.host = urlparse(url).hostname
+        self.responses: List[Any] = []
+
+    def _on_response(self, response) -> None:
+        try:
+            if urlparse(response.url).hostname != self.host:
+                return
+            content_type = (response.headers.get("content-type") or "").lower()
+        except Exception:
+            return
+        if any(t in content_type for t in FEED_CONTENT_TYPES):
+            self.responses.append(response)
+
+    def attach(self) -> "FeedCapture":
+        self.page.on("response", self._on_response)
+        return self
+
+    def detach(self) -> None:
+        self.page.remove_listener("response", self._on_response)
+
+    def values(self, document_html: str = "") -> List[Any]:
+        """Decoded JSON values: the document's flight payload, then each captured body."""
+        values = flight_values(document_html) if document_html else []
+        for response in self.responses:
+            try:
+                text = response.text()
+            except Exception:
+                continue  # redirected, or the body is gone
+            content_type = (response.headers.get("content-type") or "").lower()
+            if "x-component" in content_type:
+                values.extend(_rsc_values(text))
+                continue
+            try:
+                values.append(json.loads(text))
+            except json.JSONDecodeError:
+                continue
+        return values
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI endpoints the gap-fill pass uses.
+
+Lets the whole gap-filling pass — sync calls, rate limiting, Batch API mode
+and the source-page extractor — run offline and deterministically. Point
+the pass at it with OPENAI_BASE_URL:
+
+    python scripts/openai_stub_server.py --port 8787 --fake-scores &
+    OPENAI_BASE_URL=http://127.0.0.1:8787/v1 OPENAI_API_KEY=stub \\
+        python scripts/scrape_models.py --gap-fill-mode batch
+
+Implemented endpoints (only the fields gap_fill_benchmarks reads):
+
+- ``GET  /v1/models``
+- ``POST /v1/responses`` — answers the batched benchmark lookup, per-model or
+  multi-model (``benchmark_lookup_models``)
+- ``POST /v1/files`` (multipart, purpose=batch), ``GET /v1/files/{id}/content``
+- ``POST /v1/batches``, ``GET /v1/batches/{id}``
+- ``GET  /docs/{path}`` — with ``--docs DIR``, files from DIR, standing in
+  for the vendor pages gap_fill_sources fetches. Cite them from fixtures as
+  ``{"score": "87.5%", "source_url": "http://127.0.0.1:8787/docs/card.html"}``.
+
+Answers come from ``--fixtures`` (``{"Model name": {"Benchmark": "87.5%"}}``;
+a value may also be a full result object), else — with ``--fake-scores`` — a
+score derived from a hash of (model, benchmark), else null. Batches report
+``in_progress`` until ``--batch-delay`` seconds after creation, then
+``completed``. ``--rate-limit-every N`` answers every Nth /responses call
+with a 429 to exercise the retry path. Everything is kept in memory.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_MODELS = ["gpt-5.4", "gpt-5.4-pro", "gpt-5.3"]
+DOC_CONTENT_TYPES = {".html": "text/html", ".htm": "text/html", ".md": "text/markdown", ".pdf": "application/pdf"}
+
+_MODEL_LINE = re.compile(r"^Model: (.+)$", re.MULTILINE)
+_BENCHMARK_LINE = re.compile(r"^  - (.+)$", re.MULTILINE)
+_MODEL_BLOCK = re.compile(r"^(?=Model: )", re.MULTILINE)
+
+
+class StubState:
+    """In-memory files, batches and call counters shared by all handler threads."""
+
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Dict[str, Any]]] = None,
+        fake_scores: bool = False,
+        batch_delay: float = 0.0,
+        rate_limit_every: int = 0,
+        models: Optional[List[str]] = None,
+        docs_dir: Optional[Path] = None,
+    ):
+        self.fixtures = fixtures or {}
+        self.fake_scores = fake_scores
+        self.batch_delay = batch_delay
+        self.rate_limit_every = rate_limit_every
+        self.models = models or DEFAULT_MODELS
+        self.docs_dir = docs_dir
+        self.lock = threading.Lock()
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.response_calls = 0
+        self._ids = itertools.count(1)
+
+    def new_id(self, prefix: str) -> str:
+        with self.lock:
+            return f"{prefix}_{next(self._ids):06d}"
+
+    # -- answers -------------------------------------------------------------
+
+    def _result_for(self, model_name: str, benchmark: str) -> Dict[str, Any]:
+        fixture = self.fixtures.get(model_name, {}).get(benchmark)
+        if isinstance(fixture, dict):
+            return {"benchmark": benchmark, "score": None, "source_url": None, "source_type": "none",
+                    "confidence": "high", "notes": None, **fixture}
+        score = fixture
+        if score is None and self.fake_scores:
+            digest = hashlib.sha256(f"{model_name}\0{benchmark}".encode("utf-8")).digest()
+            score = f"{40 + digest[0] % 55}.{digest[1] % 10}%"
+        if score is None:
+            return {"benchmark": benchmark, "score": None, "source_url": None, "source_type": "none",
+                    "confidence": "high", "notes": "stub: no fixture"}
+        slug = re.sub(r"[^a-z0-9]+", "-", f"{model_name} {benchmark}".lower()).strip("-")
+        return {"benchmark": benchmark, "score": score, "source_url": f"https://stub.invalid/{slug}",
+                "source_type": "model_card", "confidence": "high", "notes": None}
+
+    def answer(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """A Responses API result object for one lookup request body."""
+        user = next((m.get("content", "") for m in body.get("input", []) if m.get("role") == "user"), "")
+        answers = []
+        for block in _MODEL_BLOCK.split(user):
+            model_match = _MODEL_LINE.search(block)
+            if model_match:
+                model_name = model_match.group(1).strip()
+                results = [self._result_for(model_name, b.strip()) for b in _BENCHMARK_LINE.findall(block)]
+                answers.append({"model": model_name, "results": results})
+        if body.get("text", {}).get("format", {}).get("name") == "benchmark_lookup_models":
+            text = json.dumps({"models": answers})
+        else:
+            text = json.dumps(answers[0] if answers else {"model": "", "results": []})
+        input_tokens = len(json.dumps(body)) // 4
+        output_tokens = len(text) // 4
+        return {
+            "id": self.new_id("resp"),
+            "object": "response",
+            "status": "completed",
+            "model": body.get("model"),
+            "output": [{"type": "message", "role": "assistant",
+                        "content": [{"type": "output_text", "text": text}]}],
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                      "total_tokens": input_tokens + output_tokens},
+        }
+
+    # -- batches -------------------------------------------------------------
+
+    def create_batch(self, request: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        input_file_id = request.get("input_file_id")
+        data = self.files.get(input_file_id)
+        if data is None:
+            return 404, {"error": {"message": f"No such file: {input_file_id}"}}
+        lines = [json.loads(line) for line in data.decode("utf-8").splitlines() if line.strip()]
+        output = []
+        for line in lines:
+            output.append({
+                "id": self.new_id("batch_req"),
+                "custom_id": line.get("custom_id"),
+                "response": {"status_code": 200, "request_id": self.new_id("req"),
+                             "body": self.answer(line.get("body") or {})},
+                "error": None,
+            })
+        output_file_id = self.new_id("file")
+        self.files[output_file_id] = "".join(json.dumps(o) + "\n" for o in output).encode("utf-8")
+        batch = {
+            "id": self.new_id("batch"),
+            "object": "batch",
+            "endpoint": request.get("endpoint"),
+            "input_file_id": input_file_id,
+            "completion_window": request.get("completion_window"),
+            "metadata": request.get("metadata"),
+            "created_at": int(time.time()),
+            "_ready_at": time.monotonic() + self.batch_delay,
+            "_output_file_id": output_file_id,
+            "_total": len(lines),
+        }
+        self.batches[batch["id"]] = batch
+        return 200, self.batch_view(batch)
+
+    def batch_view(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        done = time.monotonic() >= batch["_ready_at"]
+        view = {k: v for k, v in batch.items() if not k.startswith("_")}
+        view["status"] = "completed" if done else "in_progress"
+        view["output_file_id"] = batch["_output_file_id"] if done else None
+        view["error_file_id"] = None
+        total = batch["_total"]
+        view["request_counts"] = {"total": total, "completed": total if done else 0, "failed": 0}
+        return view
+
+
+def _parse_multipart(content_type: str, body: bytes) -> Dict[str, Tuple[Optional[str], bytes]]:
+    """Form fields of a multipart/form-data body: name → (filename, payload)."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+    return fields
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state: StubState  # set on the per-server subclass by make_server
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(
+        self,
+        status: int,
+        payload: Any,
+        raw: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None,
+    ) -> None:
+        data = raw if raw is not None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type or ("application/octet-stream" if raw is not None else "application/json"))
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        state = self.state
+        if path == "/v1/models":
+            self._send(200, {"object": "list", "data": [{"id": m, "object": "model"} for m in state.models]})
+            return
+        m = re.fullmatch(r"/v1/files/([^/]+)/content", path)
+        if m and m.group(1) in state.files:
+            self._send(200, None, raw=state.files[m.group(1)])
+            return
+        m = re.fullmatch(r"/v1/batches/([^/]+)", path)
+        if m and m.group(1) in state.batches:
+            self._send(200, state.batch_view(state.batches[m.group(1)]))
+            return
+        if path.startswith("/docs/") and state.docs_dir is not None:
+            root = state.docs_dir.resolve()
+            doc = (root / path[len("/docs/"):]).resolve()
+            if doc.is_file() and root in doc.parents:
+                content_type = DOC_CONTENT_TYPES.get(doc.suffix.lower(), "text/plain")
+                if content_type.startswith("text/"):
+                    content_type += "; charset=utf-8"
+                self._send(200, None, raw=doc.read_bytes(), content_type=content_type)
+                return
+        self._send(404, {"error": {"message": f"Unknown path {path}"}})
+
+    def do_POST(self) -> None:
+        path = self.path.split("?", 1)[0]
+        state = self.state
+        body = self._body()
+        if path == "/v1/responses":
+            with state.lock:
+                state.response_calls += 1
+                throttle = state.rate_limit_every and state.response_calls % state.rate_limit_every == 0
+            if throttle:
+                self._send(429, {"error": {"message": "stub rate limit"}}, headers={"Retry-After": "1"})
+                return
+            self._send(200, state.answer(json.loads(body or b"{}")))
+            return
+        if path == "/v1/files":
+            fields = _parse_multipart(self.headers.get("Content-Type", ""), body)
+            filename, payload = fields.get("file", (None, b""))
+            file_id = state.new_id("file")
+            state.files[file_id] = payload
+            purpose = fields.get("purpose", (None, b""))[1].decode("utf-8")
+            self._send(200, {"id": file_id, "object": "file", "bytes": len(payload),
+                             "filename": filename, "purpose": purpose})
+            return
+        if path == "/v1/batches":
+            status, payload = state.create_batch(json.loads(body or b"{}"))
+            self._send(status, payload)
+            return
+        self._send(404, {"error": {"message": f"Unknown path {path}"}})
+
+
+def make_server(state: StubState, host: str = "127.0.0.1", port: int = 8787, verbose: bool = False) -> ThreadingHTTPServer:
+    """Build (but don't start) a server; port 0 picks a free one."""
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the OpenAI endpoints used by gap-fill")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--fixtures", help="JSON file of {model name: {benchmark: score or result object}}")
+    parser.add_argument("--fake-scores", action="store_true", help="Invent a deterministic score for every lookup without a fixture")
+    parser.add_argument("--batch-delay", type=float, default=0.0, help="Seconds a batch stays in_progress")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth /responses call with a 429")
+    parser.add_argument("--docs", help="Serve the files in this directory under /docs/ (stand-in source pages)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, "r", encoding="utf-8") as f:
+            fixtures = json.load(f)
+    state = StubState(fixtures, args.fake_scores, args.batch_delay, args.rate_limit_every,
+                      docs_dir=Path(args.docs) if args.docs else None)
+    server = make_server(state, args.host, args.port, args.verbose)
+    print(f"OpenAI stub listening on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Bitset index of which models report which benchmarks.
+
+Coverage questions — how many models report X, how many of *this* top 10
+report X, do all of X's reporters share a country or an organization — used
+to be answered by scanning every entry's cells, often inside another loop over
+benchmarks or candidates. ParticipationIndex answers them with integer bit
+operations instead.
+
+Each entry gets a bit position (its index in the list the index was built
+from). Every benchmark maps to a Python int whose set bits are the entries
+that report it, and every country / organization maps to the mask of its
+entries. With those:
+
+- participation of X within any subset is ``(reporters[X] & subset).bit_count()``;
+- X is origin-locked to country C iff ``reporters[X]`` is non-empty and a
+  subset of ``country_mask[C]``;
+- X is vendor-internal to organization O iff its reporters that have an
+  organization are all in ``org_mask[O]``.
+
+Python ints are arbitrary precision, so the same code covers a 20-model cohort
+or several thousand models, one machine word per 64 of them.
+
+Like ScoringEngine, the index is a snapshot: build a new one after cells change
+(gap fills, sparse drops).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from leaderboard_cells import CellStore
+
+
+def _lowest_bit(bits: int) -> int:
+    return (bits & -bits).bit_length() - 1
+
+
+class ParticipationIndex:
+    """Per-benchmark reporter bitsets over a fixed, ordered list of entries.
+
+    ``reported=False`` counts a cell the way scoring does (CellStore.is_present);
+    ``reported=True`` uses gap-fill's stricter stripped check (is_reported).
+    """
+
+    def __init__(self, entries: Sequence[Any], benchmark_headers: Iterable[str], reported: bool = False):
+        self.entries = list(entries)
+        self.benchmark_headers = list(benchmark_headers)
+        self.all_mask = (1 << len(self.entries)) - 1
+        # Entries are unhashable dataclasses; position lookups go by identity.
+        self._pos: Dict[int, int] = {id(e): i for i, e in enumerate(self.entries)}
+
+        self.country_mask: Dict[str, int] = {}
+        self.org_mask: Dict[str, int] = {}
+        self._country_of: List[str] = []
+        self._org_of: List[str] = []
+        for i, entry in enumerate(self.entries):
+            bit = 1 << i
+            self.country_mask[entry.country] = self.country_mask.get(entry.country, 0) | bit
+            org = entry.columns.get("Organization", "") or ""
+            if org:
+                self.org_mask[org] = self.org_mask.get(org, 0) | bit
+            self._country_of.append(entry.country)
+            self._org_of.append(org)
+        # Entries with a (non-empty) Organization; vendor locks ignore the rest.
+        self.has_org_mask = 0
+        for mask in self.org_mask.values():
+            self.has_org_mask |= mask
+
+        self._bits: Dict[str, int] = {b: 0 for b in self.benchmark_headers}
+        for i, entry in enumerate(self.entries):
+            cells = entry.columns
+            if not isinstance(cells, CellStore):
+                cells = CellStore(cells)
+            test = cells.is_reported if reported else cells.is_present
+            bit = 1 << i
+            for b in self.benchmark_headers:
+                if test(b):
+                    self._bits[b] |= bit
+
+    # -- masks -------------------------------------------------------------
+
+    def mask_of(self, subset: Iterable[Any]) -> int:
+        """Bitmask of ``subset``, whose members must be entries of this index."""
+        mask = 0
+        for entry in subset:
+            mask |= 1 << self._pos[id(entry)]
+        return mask
+
+    def members(self, mask: int) -> List[Any]:
+        """Entries whose bits are set in ``mask``, in index order."""
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(self.entries[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+    def reporters(self, benchmark: str) -> int:
+        """Bitmask of the entries reporting ``benchmark`` (0 if unknown)."""
+        return self._bits.get(benchmark, 0)
+
+    # -- counts ------------------------------------------------------------
+
+    def count(self, benchmark: str, mask: Optional[int] = None) -> int:
+        """How many entries (within ``mask``, if given) report ``benchmark``."""
+        bits = self._bits.get(benchmark, 0)
+        if mask is not None:
+            bits &= mask
+        return bits.bit_count()
+
+    def counts(self, mask: Optional[int] = None) -> Dict[str, int]:
+        """``count`` for every benchmark, in header order."""
+        return {b: self.count(b, mask) for b in self.benchmark_headers}
+
+    def reported_by(self, mask: int, threshold: int) -> List[str]:
+        """Benchmarks reported by at least ``threshold`` entries of ``mask``, in header order."""
+        return [b for b in self.benchmark_headers if (self._bits[b] & mask).bit_count() >= threshold]
+
+    # -- locks -------------------------------------------------------------
+
+    def origin_lock(self, benchmark: str) -> Optional[str]:
+        """If every reporter belongs to a single country, return that country."""
+        bits = self._bits.get(benchmark, 0)
+        if not bits:
+            return None
+        country = self._country_of[_lowest_bit(bits)]
+        return country if not bits & ~self.country_mask[country] else None
+
+    def vendor_internal_org(self, benchmark: str) -> Optional[str]:
+        """If every reporter with an Organization shares one, return it."""
+        bits = self._bits.get(benchmark, 0) & self.has_org_mask
+        if not bits:
+            return None
+        org = self._org_of[_lowest_bit(bits)]
+        return org if not bits & ~self.org_mask[org] else None
+
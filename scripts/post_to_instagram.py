@@ -10,7 +10,6 @@ Instagram Graph API two-step process:
   1. Create media container: POST /{ig-user-id}/media?image_url=...&caption=...
   2. Publish: POST /{ig-user-id}/media_publish?creation_id=...
 """
-import json
 import os
 import sys
 import time
@@ -19,12 +18,12 @@ from pathlib import Path
 import requests
 from dateutil.parser import parse as parse_date
 
+from snapshot_reader import read_latest, site_document
+
 
 def load_caption_data(models_path):
-    """Extract data for the Instagram caption from models.json."""
-    with open(models_path) as f:
-        data = json.load(f)
-    entry = data["history"][0]
+    """Extract data for the Instagram caption from the latest snapshot."""
+    entry = read_latest(models_path)
     timestamp = entry.get("timestamp", "")
 
     all_models = []
@@ -137,10 +136,10 @@ def main():
         sys.exit(1)
 
     workspace = Path(__file__).resolve().parent.parent
-    models_path = workspace / "models.json"
+    models_path = site_document(workspace)
 
-    if not models_path.exists():
-        print("ERROR: models.json not found")
+    if models_path is None:
+        print("ERROR: neither latest.json nor models.json found")
         sys.exit(1)
 
     image_url = "https://usvschina.ai/ig-image.png"
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Shared request / token rate limiting for concurrent OpenAI calls.
+
+The gap-fill pass used to pace itself with a fixed ``time.sleep`` between
+strictly serial calls. With several calls in flight at once, pacing has to be
+a property of the account, not of one loop, so every worker draws from the
+same RateLimiter:
+
+- a request bucket (RPM) that refills one request every
+  ``60 / requests_per_minute`` seconds;
+- a token bucket (TPM). A call reserves the *expected* token count before it
+  is sent — the running mean of what earlier calls in this run actually used,
+  read from the response's ``usage`` block — and settles the difference once
+  the real count is known. Overspends push the bucket negative, which makes
+  the next callers wait;
+- a shared pause: a 429's ``Retry-After`` blocks every worker, not just the
+  one that got rate limited, since they all share the account's limits.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Continuous-refill bucket. Not thread-safe on its own; RateLimiter locks it."""
+
+    def __init__(self, capacity: float, refill_per_second: float, now: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.level = float(capacity)
+        self._updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.level = min(self.capacity, self.level + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if it can be taken now).
+
+        Requests larger than the whole bucket only wait for it to be full, so
+        an oversized call is slowed down rather than blocked forever.
+        """
+        self._refill(now)
+        needed = min(amount, self.capacity) - self.level
+        if needed <= 0:
+            return 0.0
+        return needed / self.refill_per_second
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def give(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Blocking RPM + TPM limiter shared by every worker of one pass."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        initial_tokens_per_call: int,
+        request_burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        now = clock()
+        self._cond = threading.Condition()
+        self._requests = TokenBucket(request_burst, requests_per_minute / 60.0, now)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, now)
+        self._initial_tokens_per_call = initial_tokens_per_call
+        self._blocked_until = 0.0
+        self._measured_calls = 0
+        self._measured_tokens = 0
+
+    def expected_tokens(self) -> int:
+        """Mean measured tokens per call so far, or the initial guess."""
+        with self._cond:
+            return self._expected_tokens()
+
+    def _expected_tokens(self) -> int:
+        if not self._measured_calls:
+            return self._initial_tokens_per_call
+        return round(self._measured_tokens / self._measured_calls)
+
+    def acquire(self) -> int:
+        """Block until one request may be sent; returns the tokens reserved for it."""
+        with self._cond:
+            while True:
+                now = self._clock()
+                reserve = self._expected_tokens()
+                wait = max(
+                    self._blocked_until - now,
+                    self._requests.wait_time(1, now),
+                    self._tokens.wait_time(reserve, now),
+                )
+                if wait <= 0:
+                    self._requests.take(1, now)
+                    self._tokens.take(reserve, now)
+                    return reserve
+                self._cond.wait(wait)
+
+    def settle(self, reserved: int, used: Optional[int]) -> None:
+        """Reconcile a reservation with what the call really used.
+
+        ``used=None`` means the call was rejected before doing any work (429,
+        5xx, network error): the tokens go back, the request slot does not.
+        """
+        with self._cond:
+            now = self._clock()
+            if used is None:
+                self._tokens.give(reserved, now)
+            else:
+                self._measured_calls += 1
+                self._measured_tokens += used
+                if used < reserved:
+                    self._tokens.give(reserved - used, now)
+                else:
+                    self._tokens.take(used - reserved, now)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every worker for ``seconds`` (e.g. a 429's Retry-After)."""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+            self._cond.notify_all()
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""Vectorized derived-score computation for a whole cohort at once.
+
+``calculate_derived_scores`` in scrape_models.py scores one entry per call and
+walks every benchmark cell each time. A single run_scraper pass calls it
+hundreds of times for the same 20 models: min/max discovery, every sort key,
+every Pass 2 iteration and every output sink.
+
+ScoringEngine lays the cohort's already-parsed cells (leaderboard_cells.CellStore)
+out once as a models × benchmarks float matrix plus a "cell is present" mask,
+then computes avgIq / value / unified for every model in a handful of array
+operations.
+
+Results are **bit-identical** to ``calculate_derived_scores``, not merely
+close:
+
+- Per-model sums are accumulated left to right in benchmark-header order with
+  ``np.cumsum`` (a sequential accumulate), never ``np.sum``, whose pairwise
+  summation would round differently. Masked-out cells contribute an exact
+  ``0.0``, and a leading zero column reproduces the reference's ``0.0 + x``
+  start so even a signed zero comes out the same.
+- Every elementwise expression uses the same operations in the same order as
+  the scalar code; NumPy float64 arithmetic is the same IEEE double arithmetic.
+- Final rounding goes through Python's ``round(x, 2)``; ``np.round`` rounds
+  differently on ties.
+
+``python scripts/scoring_engine.py verify`` checks that claim against the
+reference implementation for every snapshot in the history.
+
+Usage:
+    python scripts/scoring_engine.py verify [path/to/models.json]
+"""
+import argparse
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from leaderboard_cells import CellStore, parse_to_number
+
+# Cost columns, in the reference's lookup order (new header spelling first).
+_COST_COLUMNS = (("Input$/M", "Input $/M"), ("Output$/M", "Output $/M"))
+
+# Pass 2 (two-pass scoring) parameters, shared by run_scraper's convergence
+# loop and the gap-fill what-if scorer: a benchmark qualifies when at least
+# PASS2_QUALIFIED_THRESHOLD of the PASS2_TOP_N top models report it; fewer
+# than PASS2_MIN_QUALIFIED qualified benchmarks falls back to Pass 1.
+PASS2_TOP_N = 10
+PASS2_QUALIFIED_THRESHOLD = 8
+PASS2_MIN_QUALIFIED = 3
+PASS2_MAX_ITERATIONS = 5
+
+
+def _round2(values: np.ndarray) -> List[float]:
+    return [round(float(v), 2) for v in values]
+
+
+def finish_scores(
+    avg_iq: np.ndarray,
+    value: np.ndarray,
+    min_avg_iq: Optional[float] = None,
+    max_avg_iq: Optional[float] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+) -> List[Dict[str, float]]:
+    """Cohort-normalize raw (avgIq, value) arrays into rounded per-entry score dicts."""
+    with np.errstate(invalid="ignore", over="ignore"):
+        if min_avg_iq is not None and max_avg_iq is not None and max_avg_iq > min_avg_iq:
+            norm_avg_iq = ((avg_iq - min_avg_iq) / (max_avg_iq - min_avg_iq)) * 100
+        else:
+            norm_avg_iq = avg_iq
+        if min_value is not None and max_value is not None and max_value > min_value:
+            norm_value = ((value - min_value) / (max_value - min_value)) * 100
+        else:
+            norm_value = value
+        unified = (norm_avg_iq * 0.9 + norm_value * 0.1) * 10
+
+    return [
+        {"avgIq": a, "value": v, "unified": u}
+        for a, v, u in zip(_round2(avg_iq), _round2(value), _round2(unified))
+    ]
+
+
+class ScoringEngine:
+    """Parsed score matrix for one cohort and one benchmark header list.
+
+    The engine snapshots the cells at construction time; build a new one if
+    entries' columns change (e.g. after gap-filling or dropping benchmarks).
+    """
+
+    def __init__(self, entries: Sequence[Any], benchmark_headers: Sequence[str]):
+        self.entries = list(entries)
+        self.benchmark_headers = list(benchmark_headers)
+        n_models, n_bench = len(self.entries), len(self.benchmark_headers)
+
+        self.values = np.zeros((n_models, n_bench), dtype=np.float64)
+        self.present = np.zeros((n_models, n_bench), dtype=bool)
+        # Per-cell "ends with %" for resolve_range's percentage auto-detection.
+        self.percent = np.zeros((n_models, n_bench), dtype=bool)
+        self.cost = np.zeros(n_models, dtype=np.float64)
+
+        for i, entry in enumerate(self.entries):
+            cols = entry.columns
+            if not isinstance(cols, CellStore):
+                cols = CellStore(cols)
+            for j, b in enumerate(self.benchmark_headers):
+                if not cols.is_present(b):
+                    continue
+                self.present[i, j] = True
+                self.values[i, j] = cols.number(b)
+                self.percent[i, j] = cols.is_percent(b)
+            cost_in = parse_to_number(cols.get(_COST_COLUMNS[0][0]) or cols.get(_COST_COLUMNS[0][1], "0"))
+            cost_out = parse_to_number(cols.get(_COST_COLUMNS[1][0]) or cols.get(_COST_COLUMNS[1][1], "0"))
+            self.cost[i] = cost_in + cost_out
+
+    # -- cohort statistics -------------------------------------------------
+
+    def participation(self) -> Tuple[Dict[str, int], int]:
+        """Same result as scrape_models.build_benchmark_participation."""
+        counts = {b: 0 for b in self.benchmark_headers}
+        for b, n in zip(self.benchmark_headers, self.present.sum(axis=0).tolist()):
+            counts[b] += n
+        max_participation = max(counts.values(), default=1)
+        if max_participation <= 0:
+            max_participation = 1
+        return counts, max_participation
+
+    def cohort_ranges(self, participation: Dict[str, int]) -> Dict[str, Tuple[float, float]]:
+        """Pass 1 per-benchmark (min, max) over present cells, skipping single-participant benchmarks."""
+        out: Dict[str, Tuple[float, float]] = {}
+        for j, b in enumerate(self.benchmark_headers):
+            if participation.get(b, 0) <= 1:
+                continue
+            column = self.values[self.present[:, j], j]
+            if column.size:
+                vals = column.tolist()
+                out[b] = (min(vals), max(vals))
+        return out
+
+    def resolve_range(
+        self,
+        benchmark_name: str,
+        known_ranges: Dict[str, Tuple[float, float]],
+    ) -> Optional[Tuple[float, float]]:
+        """Same result as scrape_models.resolve_benchmark_range over this cohort."""
+        if benchmark_name in known_ranges:
+            return known_ranges[benchmark_name]
+        if benchmark_name not in self.benchmark_headers:
+            return None
+        j = self.benchmark_headers.index(benchmark_name)
+        mask = self.present[:, j]
+        if not mask.any():
+            return None
+        if self.percent[mask, j].all():
+            return (0.0, 100.0)
+        vals = self.values[mask, j].tolist()
+        return (min(vals), max(vals))
+
+    def count_present(self, rows: Sequence[int], benchmark_name: str) -> int:
+        """How many of the models at ``rows`` report ``benchmark_name``."""
+        j = self.benchmark_headers.index(benchmark_name)
+        return int(self.present[list(rows), j].sum())
+
+    # -- scoring -----------------------------------------------------------
+
+    def raw_scores(
+        self,
+        participation: Optional[Dict[str, int]] = None,
+        max_participation: Optional[int] = None,
+        benchmark_min_max: Optional[Dict[str, tuple]] = None,
+        qualified_benchmarks: Optional[set] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Unrounded (avgIq, value) for every model, before cohort normalization."""
+        if participation is None:
+            participation = {}
+        if not max_participation or max_participation <= 0:
+            max_participation = max(participation.values(), default=1)
+        if max_participation <= 0:
+            max_participation = 1
+        if benchmark_min_max is None:
+            benchmark_min_max = {}
+
+        headers = self.benchmark_headers
+        if qualified_benchmarks is not None:
+            included = np.array([b in qualified_benchmarks for b in headers], dtype=bool)
+            weights = np.ones(len(headers), dtype=np.float64)
+        else:
+            parts = [participation.get(b, 0) if participation else 0 for b in headers]
+            included = np.array([p > 1 for p in parts], dtype=bool)
+            weights = np.array([p / max_participation for p in parts], dtype=np.float64)
+
+        lo = np.zeros(len(headers), dtype=np.float64)
+        span = np.ones(len(headers), dtype=np.float64)
+        scaled = np.zeros(len(headers), dtype=bool)
+        for j, b in enumerate(headers):
+            if b in benchmark_min_max:
+                min_b, max_b = benchmark_min_max[b]
+                if max_b > min_b:
+                    lo[j], span[j], scaled[j] = min_b, max_b - min_b, True
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            scores = np.where(scaled, ((self.values - lo) / span) * 100, self.values)
+            mask = self.present & included
+            contrib = np.where(mask, scores * weights, 0.0)
+            used = np.where(mask, weights, 0.0)
+
+        zero = np.zeros((len(self.entries), 1), dtype=np.float64)
+        total = np.cumsum(np.hstack([zero, contrib]), axis=1)[:, -1]
+        weight_sum = np.cumsum(np.hstack([zero, used]), axis=1)[:, -1]
+        return self.avg_and_value(total, weight_sum)
+
+    def avg_and_value(self, total: np.ndarray, weight_sum: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-model (avgIq, value) from weighted score totals and weight sums."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_iq = np.where(weight_sum > 0, total / np.where(weight_sum > 0, weight_sum, 1.0), 0.0)
+            value = np.where(self.cost > 0, avg_iq / np.where(self.cost > 0, self.cost, 1.0), 0.0)
+        return avg_iq, value
+
+    def score(
+        self,
+        participation: Optional[Dict[str, int]] = None,
+        max_participation: Optional[int] = None,
+        min_avg_iq: Optional[float] = None,
+        max_avg_iq: Optional[float] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        benchmark_min_max: Optional[Dict[str, tuple]] = None,
+        qualified_benchmarks: Optional[set] = None,
+    ) -> List[Dict[str, float]]:
+        """Derived scores for every entry, in entry order.
+
+        Takes the same parameters as calculate_derived_scores and returns, per
+        entry, the same ``{"avgIq", "value", "unified"}`` dict it would.
+        """
+        avg_iq, value = self.raw_scores(
+            participation, max_participation, benchmark_min_max, qualified_benchmarks
+        )
+        return finish_scores(avg_iq, value, min_avg_iq, max_avg_iq, min_value, max_value)
+
+    def cohort(
+        self,
+        participation: Optional[Dict[str, int]] = None,
+        max_participation: Optional[int] = None,
+        min_avg_iq: Optional[float] = None,
+        max_avg_iq: Optional[float] = None,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        benchmark_min_max: Optional[Dict[str, tuple]] = None,
+        qualified_benchmarks: Optional[set] = None,
+    ) -> "ScoredCohort":
+        """Score the cohort and freeze the result together with its configuration."""
+        scores = self.score(
+            participation, max_participation, min_avg_iq, max_avg_iq,
+            min_value, max_value, benchmark_min_max, qualified_benchmarks,
+        )
+        return ScoredCohort(
+            benchmark_headers=tuple(self.benchmark_headers),
+            participation=MappingProxyType(dict(participation or {})),
+            max_participation=max_participation,
+            min_avg_iq=min_avg_iq,
+            max_avg_iq=max_avg_iq,
+            min_value=min_value,
+            max_value=max_value,
+            benchmark_min_max=MappingProxyType(dict(benchmark_min_max or {})),
+            qualified_benchmarks=frozenset(qualified_benchmarks) if qualified_benchmarks is not None else None,
+            scores=tuple(MappingProxyType(sc) for sc in scores),
+            entries=tuple(self.entries),
+            _row_of=MappingProxyType({id(e): i for i, e in enumerate(self.entries)}),
+        )
+
+
+@dataclass(frozen=True)
+class ScoredCohort:
+    """Immutable result of scoring one cohort under one scoring configuration.
+
+    Computed once per pass by ScoringEngine.cohort() and handed to every
+    output sink (tables, CSV/JSON, the history entry), so the scores each of
+    them prints or persists are the same numbers, computed once. The fields
+    mirror calculate_derived_scores' parameters; ``scores`` is in cohort order.
+    """
+    benchmark_headers: Tuple[str, ...]
+    participation: Mapping[str, int]
+    max_participation: Optional[int]
+    min_avg_iq: Optional[float]
+    max_avg_iq: Optional[float]
+    min_value: Optional[float]
+    max_value: Optional[float]
+    benchmark_min_max: Mapping[str, tuple]
+    qualified_benchmarks: Optional[FrozenSet[str]]
+    scores: Tuple[Mapping[str, float], ...]
+    # Entries are held so the id()-keyed row lookup can't outlive them.
+    entries: Tuple[Any, ...] = field(repr=False, compare=False)
+    _row_of: Mapping[int, int] = field(repr=False, compare=False)
+
+    @property
+    def include_derived(self) -> bool:
+        """Whether sinks should emit AvgIQ / Value / Unified columns at all."""
+        return bool(self.benchmark_headers)
+
+    def scores_for(self, entry: Any) -> Mapping[str, float]:
+        """``{"avgIq", "value", "unified"}`` for an entry of the scored cohort."""
+        try:
+            return self.scores[self._row_of[id(entry)]]
+        except KeyError:
+            raise KeyError(f"{getattr(entry, 'name', entry)!r} is not part of this scored cohort") from None
+
+    def unified(self, entry: Any) -> float:
+        return self.scores_for(entry)["unified"]
+
+
+@dataclass(frozen=True)
+class Pass2Ranking:
+    """One Pass 2 ranking under a qualified set (see Pass2Solver.rank)."""
+    qualified: FrozenSet[str]
+    top: Tuple[int, ...]  # cohort row indices, best first
+    benchmark_min_max: Mapping[str, tuple]
+    bounds: Tuple[float, float, float, float]  # min/max avgIq, min/max value
+
+
+class Pass2Solver:
+    """Incremental Pass 2 ranking for the qualified-set convergence loop.
+
+    Re-ranking from scratch for each candidate qualified set re-resolves every
+    benchmark range and re-sums every model over every qualified benchmark. But
+    a benchmark's range doesn't depend on the qualified set, and consecutive
+    sets differ by a handful of benchmarks. The solver therefore
+
+    - resolves each benchmark's range and normalizes its column once;
+    - keeps each model's running score total and benchmark count for the
+      current set, and moving to a new set only adds / subtracts the columns
+      that entered / left it — O(Δbenchmarks × models);
+    - memoizes the ranking of every set it has seen, so a set the loop comes
+      back to (oscillation) costs a dict lookup.
+
+    Incremental sums are accumulated in a different order than the reference's
+    header-order sum, so a model's average can differ from it by an ulp. That
+    only matters for ranking if two models are tied to within an ulp at a
+    2-decimal rounding boundary. Scores that get persisted never come from
+    here: use exact_bounds() and ScoringEngine.cohort() for those.
+    """
+
+    def __init__(
+        self,
+        engine: ScoringEngine,
+        known_ranges: Dict[str, Tuple[float, float]],
+        top_n: int = 10,
+    ):
+        self.engine = engine
+        self.known_ranges = known_ranges
+        self.top_n = top_n
+        self._positions: Dict[str, List[int]] = {}
+        for j, b in enumerate(engine.benchmark_headers):
+            self._positions.setdefault(b, []).append(j)
+        self._ranges: Dict[str, Optional[Tuple[float, float]]] = {}
+        self._columns: Dict[int, np.ndarray] = {}
+        n_models = len(engine.entries)
+        self._current: FrozenSet[str] = frozenset()
+        self._total = np.zeros(n_models, dtype=np.float64)
+        self._count = np.zeros(n_models, dtype=np.float64)
+        self._memo: Dict[FrozenSet[str], Pass2Ranking] = {}
+        # Columns added or subtracted so far; lets callers see the saving.
+        self.column_updates = 0
+
+    def range_for(self, benchmark: str) -> Optional[Tuple[float, float]]:
+        if benchmark not in self._ranges:
+            self._ranges[benchmark] = self.engine.resolve_range(benchmark, self.known_ranges)
+        return self._ranges[benchmark]
+
+    def ranges_for(self, qualified: FrozenSet[str]) -> Dict[str, tuple]:
+        out: Dict[str, tuple] = {}
+        for b in qualified:
+            rng = self.range_for(b)
+            if rng is not None:
+                out[b] = rng
+        return out
+
+    def _column(self, j: int) -> np.ndarray:
+        col = self._columns.get(j)
+        if col is None:
+            engine = self.engine
+            values = engine.values[:, j]
+            rng = self.range_for(engine.benchmark_headers[j])
+            if rng is not None and rng[1] > rng[0]:
+                with np.errstate(invalid="ignore", over="ignore"):
+                    values = ((values - rng[0]) / (rng[1] - rng[0])) * 100
+            col = np.where(engine.present[:, j], values, 0.0)
+            self._columns[j] = col
+        return col
+
+    def _move_to(self, qualified: FrozenSet[str]) -> None:
+        for sign, names in ((1.0, qualified - self._current), (-1.0, self._current - qualified)):
+            for b in names:
+                for j in self._positions.get(b, ()):
+                    if sign > 0:
+                        self._total += self._column(j)
+                        self._count += self.engine.present[:, j]
+                    else:
+                        self._total -= self._column(j)
+                        self._count -= self.engine.present[:, j]
+                    self.column_updates += 1
+        if not qualified:
+            # Nothing left to sum; drop any accumulated rounding residue.
+            self._total[:] = 0.0
+        self._current = qualified
+
+    def rank(self, qualified_benchmarks: set) -> Pass2Ranking:
+        """Rank the cohort by Pass 2 unified score under ``qualified_benchmarks``."""
+        key = frozenset(qualified_benchmarks)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        self._move_to(key)
+        avg_iq, value = self.engine.avg_and_value(self._total, self._count)
+        raw = finish_scores(avg_iq, value)
+        if raw:
+            bounds = score_bounds(raw)
+        else:
+            bounds = (0.0, 1.0, 0.0, 1.0)
+        scores = finish_scores(avg_iq, value, *bounds)
+        order = sorted(range(len(scores)), key=lambda i: scores[i]["unified"], reverse=True)
+        ranking = Pass2Ranking(
+            qualified=key,
+            top=tuple(order[:self.top_n]),
+            benchmark_min_max=MappingProxyType(self.ranges_for(key)),
+            bounds=bounds,
+        )
+        self._memo[key] = ranking
+        return ranking
+
+    def rank_with_fills(
+        self,
+        qualified_benchmarks: set,
+        row: int,
+        fills: Mapping[str, float],
+    ) -> Tuple[int, ...]:
+        """Top-N row indices under ``qualified_benchmarks`` if model ``row`` also reported ``fills``.
+
+        ``fills`` maps benchmark → raw (unnormalized) value. Only qualified
+        benchmarks the model doesn't already report count. The hypothetical
+        values are normalized with the benchmark's existing range and don't
+        widen it, and nothing is memoized: the solver is left exactly as a
+        plain rank() of the same set would leave it.
+        """
+        key = frozenset(qualified_benchmarks)
+        self._move_to(key)
+        total = self._total.copy()
+        count = self._count.copy()
+        for b, raw in fills.items():
+            if b not in key:
+                continue
+            rng = self.range_for(b)
+            if rng is not None and rng[1] > rng[0]:
+                raw = ((raw - rng[0]) / (rng[1] - rng[0])) * 100
+            for j in self._positions.get(b, ()):
+                if not self.engine.present[row, j]:
+                    total[row] += raw
+                    count[row] += 1
+        avg_iq, value = self.engine.avg_and_value(total, count)
+        raw_scores = finish_scores(avg_iq, value)
+        bounds = score_bounds(raw_scores) if raw_scores else (0.0, 1.0, 0.0, 1.0)
+        scores = finish_scores(avg_iq, value, *bounds)
+        order = sorted(range(len(scores)), key=lambda i: scores[i]["unified"], reverse=True)
+        return tuple(order[:self.top_n])
+
+    def exact_bounds(self, qualified_benchmarks: set) -> Tuple[float, float, float, float]:
+        """Normalization bounds for ``qualified_benchmarks`` via the exact engine."""
+        key = frozenset(qualified_benchmarks)
+        if not self.engine.entries:
+            return (0.0, 1.0, 0.0, 1.0)
+        return score_bounds(self.engine.score(
+            benchmark_min_max=self.ranges_for(key), qualified_benchmarks=key,
+        ))
+
+
+def score_bounds(scores: List[Dict[str, float]]) -> Tuple[float, float, float, float]:
+    """(min avgIq, max avgIq, min value, max value) over rounded scores.
+
+    The cohort normalization bounds come from the *rounded* scores, exactly as
+    run_scraper has always computed them. Python min/max keep the reference's
+    NaN ordering semantics. Callers handle the empty cohort themselves.
+    """
+    iqs = [s["avgIq"] for s in scores]
+    vals = [s["value"] for s in scores]
+    return min(iqs), max(iqs), min(vals), max(vals)
+
+
+# -----------------------------------------------------------------------------
+# Verification against the reference implementation
+# -----------------------------------------------------------------------------
+
+# History row keys that aren't raw leaderboard cells, plus leaderboard columns
+# that aren't benchmarks. Everything else in a stored row is treated as a
+# benchmark column when replaying a snapshot.
+_NON_BENCHMARK_KEYS = frozenset({
+    "model", "organization", "link", "origin", "description", "created",
+    "avgIq", "value", "unified", "_provenance",
+    "Rank", "Model", "Country", "License", "Context", "Input$/M", "Output$/M",
+    "Speed", "Latency", "Parameters(B)", "KnowledgeCutoff", "Multimodal", "LLMStats",
+})
+
+
+def _same(a: float, b: float) -> bool:
+    # repr catches what == can't: -0.0 vs 0.0 and NaN vs NaN.
+    return repr(a) == repr(b)
+
+
+def verify_against_reference(history: List[Dict[str, Any]], top_n: int = 10, threshold: int = 8) -> bool:
+    """Replay each snapshot through Pass 1 and Pass 2 with both implementations."""
+    # Imported lazily: scrape_models pulls in playwright at module import.
+    from scrape_models import (
+        BENCHMARK_KNOWN_RANGES,
+        MISSING_VALUE_MARKERS,
+        LeaderboardEntry,
+        build_benchmark_participation,
+        calculate_derived_scores,
+        resolve_benchmark_range,
+    )
+
+    checked = 0
+    solver_checks = 0
+    mismatches = 0
+    for snap in history:
+        entries = []
+        headers: List[str] = []
+        for code, rows in snap.get("teams", {}).items():
+            for rank, row in enumerate(rows, 1):
+                cols = {k: v for k, v in row.items() if isinstance(v, str)}
+                entries.append(LeaderboardEntry(rank, row.get("model", ""), code, row.get("link", ""), cols))
+                for k in cols:
+                    if k not in _NON_BENCHMARK_KEYS and k not in headers:
+                        headers.append(k)
+        if not entries:
+            continue
+
+        engine = ScoringEngine(entries, headers)
+        participation, max_part = build_benchmark_participation(entries, headers)
+        if engine.participation() != (participation, max_part):
+            print(f"{snap.get('timestamp')}: participation mismatch")
+            mismatches += 1
+
+        ref_bmm = {}
+        for b in headers:
+            if participation.get(b, 0) <= 1:
+                continue
+            vals = [parse_to_number(e.columns.get(b, "")) for e in entries
+                    if e.columns.get(b, "") and e.columns.get(b, "") not in MISSING_VALUE_MARKERS]
+            if vals:
+                ref_bmm[b] = (min(vals), max(vals))
+        bmm = engine.cohort_ranges(participation)
+        if bmm != ref_bmm:
+            print(f"{snap.get('timestamp')}: Pass 1 range mismatch")
+            mismatches += 1
+
+        def compare(label: str, **kwargs) -> List[Dict[str, float]]:
+            nonlocal checked, mismatches
+            got = engine.score(**kwargs)
+            for e, g in zip(entries, got):
+                want = calculate_derived_scores(e, headers, **kwargs)
+                checked += 1
+                if not all(_same(g[k], want[k]) for k in ("avgIq", "value", "unified")):
+                    mismatches += 1
+                    print(f"{snap.get('timestamp')} {label} {e.name}: engine {g} != reference {want}")
+            return got
+
+        p1_kwargs = dict(participation=participation, max_participation=max_part, benchmark_min_max=bmm)
+        raw1 = compare("pass1/raw", **p1_kwargs)
+        miq, maq, mv, mxv = score_bounds(raw1)
+        p1 = compare("pass1", min_avg_iq=miq, max_avg_iq=maq, min_value=mv, max_value=mxv, **p1_kwargs)
+
+        order = sorted(range(len(entries)), key=lambda i: p1[i]["unified"], reverse=True)[:top_n]
+        qset = {b for b in headers if engine.count_present(order, b) >= threshold}
+        p2_bmm = {}
+        for b in qset:
+            ref = resolve_benchmark_range(b, entries)
+            if engine.resolve_range(b, BENCHMARK_KNOWN_RANGES) != ref:
+                print(f"{snap.get('timestamp')}: resolve_range mismatch for {b}")
+                mismatches += 1
+            if ref is not None:
+                p2_bmm[b] = ref
+        p2_kwargs = dict(benchmark_min_max=p2_bmm, qualified_benchmarks=qset)
+        raw2 = compare("pass2/raw", **p2_kwargs)
+        miq, maq, mv, mxv = score_bounds(raw2)
+        compare("pass2", min_avg_iq=miq, max_avg_iq=maq, min_value=mv, max_value=mxv, **p2_kwargs)
+
+        # Incremental solver: walk the same qualified-set trajectory the
+        # convergence loop would and check each ranking against exact scoring.
+        solver = Pass2Solver(engine, BENCHMARK_KNOWN_RANGES, top_n)
+        q = frozenset(qset)
+        for _ in range(5):
+            q_kwargs = dict(benchmark_min_max=solver.ranges_for(q), qualified_benchmarks=q)
+            bounds = score_bounds(engine.score(**q_kwargs))
+            miq, maq, mv, mxv = bounds
+            exact = engine.score(min_avg_iq=miq, max_avg_iq=maq, min_value=mv, max_value=mxv, **q_kwargs)
+            exact_top = tuple(sorted(range(len(entries)), key=lambda i: exact[i]["unified"], reverse=True)[:top_n])
+            ranking = solver.rank(q)
+            solver_checks += 1
+            if ranking.top != exact_top or solver.exact_bounds(q) != bounds:
+                mismatches += 1
+                print(f"{snap.get('timestamp')}: incremental Pass 2 ranking differs from exact")
+            next_q = frozenset(b for b in headers if engine.count_present(exact_top, b) >= threshold)
+            if next_q == q:
+                break
+            q = next_q
+
+    print(
+        f"{len(history)} snapshots, {checked:,} entry scores and {solver_checks} incremental "
+        f"Pass 2 rankings compared: {mismatches} mismatch(es)"
+    )
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized scoring engine tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify = sub.add_parser("verify", help="Check bit-identity against calculate_derived_scores on the history")
+    verify.add_argument("models_json", nargs="?", default=str(Path(__file__).resolve().parent.parent / "models.json"))
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        with open(args.models_json, "r") as f:
+            history = json.load(f).get("history", [])
+        raise SystemExit(0 if verify_against_reference(history) else 1)
+
+
+if __name__ == "__main__":
+    main()
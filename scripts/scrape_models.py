@@ -15,7 +15,7 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 from playwright.sync_api import sync_playwright
 
@@ -32,24 +32,65 @@ except ImportError:
 
 # Local module — gap-filling pass between sparse-drop and Pass 1
 sys.path.insert(0, str(Path(__file__).parent))
-from gap_fill_benchmarks import run_gap_filling_pass  # noqa: E402
+from detail_pages import DEFAULT_DETAIL_WORKERS, DETAIL_FETCH_MODES, DetailPageFetcher  # noqa: E402
+from gap_fill_benchmarks import (  # noqa: E402
+    CONFIDENCE_LEVELS,
+    DEFAULT_GAP_FILL_WORKERS,
+    EXTRACTED_CONFIDENCE,
+    GAP_FILL_GROUPINGS,
+    GAP_FILL_MODES,
+    GAP_FILL_PRIORITIES,
+    GapFillPipeline,
+    run_gap_filling_pass,
+)
+from gap_fill_ttl import TtlPolicy  # noqa: E402
+from history_store import (  # noqa: E402
+    append_snapshot,
+    history_log_path,
+    load_envelope,
+    migrate_to_log,
+    publish_appended,
+    save_envelope,
+)
+from leaderboard_cells import CellStore, parse_to_number  # noqa: E402
+from leaderboard_feed import (  # noqa: E402
+    FEED_LEADING_COLUMNS,
+    FEED_MISSING,
+    FEED_TRAILING_COLUMNS,
+    FeedCapture,
+    FeedScore,
+    read_feed_models,
+)
+from participation_index import ParticipationIndex  # noqa: E402
+from scoring_engine import (  # noqa: E402
+    PASS2_MAX_ITERATIONS,
+    PASS2_MIN_QUALIFIED,
+    PASS2_QUALIFIED_THRESHOLD,
+    PASS2_TOP_N,
+    Pass2Solver,
+    ScoredCohort,
+    ScoringEngine,
+    score_bounds,
+)
+from snapshot_reader import read_latest  # noqa: E402
 
 
-@dataclass
+@dataclass(slots=True)
 class LeaderboardEntry:
-    """Represents a single model row from the leaderboard table."""
+    """Represents a single model row from the leaderboard table.
+
+    ``columns`` accepts a plain dict and is converted to a CellStore, which
+    parses each benchmark cell once; it still reads and writes like a dict.
+    """
     rank: int
     name: str
     country: str
     url: str
-    columns: Dict[str, str] = field(default_factory=dict)  # Header -> raw value
-
+    columns: CellStore = field(default_factory=CellStore)  # Header -> raw value
 
-# Placeholders that mean "this cell is missing." llm-stats uses a typographic
-# em-dash (U+2014) and occasionally an en-dash (U+2013) for un-reported benchmarks,
-# not the ASCII hyphen-minus. Missing that distinction silently poisons averages
-# because parse_to_number coerces em-dash to 0.0.
-MISSING_VALUE_MARKERS = {"", "-", "\u2013", "\u2014", "n/a", "N/A", "null", "None"}
+    def __post_init__(self):
+        if not isinstance(self.columns, CellStore):
+            self.columns = CellStore(self.columns)
 
 
 # Explicit (min, max) ranges for benchmarks whose scale isn't already 0–100. Used
@@ -101,6 +142,16 @@ _DETAIL_NORM_PATTERN = re.compile(r'\\"normalized_score\\":(null|[0-9.]+)')
 
 
 def extract_detail_benchmarks(page) -> Dict[str, str]:
+    """Benchmark scores from the detail page currently loaded in ``page``
+    (see parse_detail_benchmarks)."""
+    try:
+        html = page.content()
+    except Exception:
+        return {}
+    return parse_detail_benchmarks(html)
+
+
+def parse_detail_benchmarks(html: str) -> Dict[str, str]:
     """Parse benchmark scores from a model detail page's embedded Next.js flight payload.
 
     Uses the ``normalized_score`` field because it is consistently in the 0–1 range,
@@ -112,11 +163,6 @@ def extract_detail_benchmarks(page) -> Dict[str, str]:
     Vending-Bench 2 — benchmarks where llm-stats has the raw score but hasn't decided
     how to project it onto a 0–1 scale) are skipped, not crash the parser.
     """
-    try:
-        html = page.content()
-    except Exception:
-        return {}
-
     results: Dict[str, str] = {}
     for record_match in _DETAIL_RECORD_PATTERN.finditer(html):
         record = record_match.group(0)
@@ -145,23 +191,6 @@ def extract_detail_benchmarks(page) -> Dict[str, str]:
     return results
 
 
-def parse_to_number(value: str) -> float:
-    """Convert raw string to number for calculations. Non-numeric → 0."""
-    if not value or not isinstance(value, str):
-        return 0.0
-    
-    cleaned = value.replace("%", "").replace(",", "").replace("$", "").strip()
-
-    # Handle common placeholders
-    if cleaned in MISSING_VALUE_MARKERS:
-        return 0.0
-    
-    try:
-        return float(cleaned)
-    except ValueError:
-        return 0.0
-
-
 def resolve_benchmark_range(
     benchmark_name: str,
     entries: List["LeaderboardEntry"],
@@ -179,18 +208,14 @@ def resolve_benchmark_range(
     if benchmark_name in BENCHMARK_KNOWN_RANGES:
         return BENCHMARK_KNOWN_RANGES[benchmark_name]
 
-    present = [
-        str(e.columns.get(benchmark_name, "")).strip()
-        for e in entries
-        if e.columns.get(benchmark_name, "") not in MISSING_VALUE_MARKERS
-    ]
+    present = [e.columns for e in entries if e.columns.is_present(benchmark_name)]
     if not present:
         return None
 
-    if all(v.endswith("%") for v in present):
+    if all(cells.is_percent(benchmark_name) for cells in present):
         return (0.0, 100.0)
 
-    numeric = [parse_to_number(v) for v in present]
+    numeric = [cells.number(benchmark_name) for cells in present]
     return (min(numeric), max(numeric))
 
 
@@ -214,6 +239,9 @@ def calculate_derived_scores(
     - Pass 2 (qualified_benchmarks is set): flat (unweighted) average, restricted to
       benchmarks in that set. Pass 2 is used after Pass 1 picks the Initial Top 10
       and we know which benchmarks have enough coverage to compare apples-to-apples.
+
+    This is the reference definition. run_scraper scores whole cohorts through
+    scoring_engine.ScoringEngine, which is bit-identical to it.
     """
     if participation is None:
         participation = {}
@@ -226,12 +254,12 @@ def calculate_derived_scores(
 
     pass_two = qualified_benchmarks is not None
 
+    cells = entry.columns
     total_weighted = 0.0
     weight_sum = 0.0
     for b in benchmark_headers:
-        raw_val = entry.columns.get(b, "")
         # Skip missing/placeholder cells
-        if raw_val in MISSING_VALUE_MARKERS:
+        if not cells.is_present(b):
             continue
 
         if pass_two:
@@ -246,7 +274,7 @@ def calculate_derived_scores(
                 continue
             weight = (part / max_participation) if max_participation else 1.0
 
-        score = parse_to_number(raw_val)
+        score = cells.number(b)
 
         # Normalize benchmark score to 0-100 if min/max available
         if b in benchmark_min_max:
@@ -293,19 +321,10 @@ def write_csv(
     entries: List[LeaderboardEntry],
     filepath: Path,
     headers: List[str],
-    include_derived: bool = True,
-    benchmark_headers: Optional[List[str]] = None,
+    scored: Optional[ScoredCohort] = None,
     rank_column_name: str = "Rank",
-    participation: Optional[Dict[str, int]] = None,
-    max_participation: Optional[int] = None,
-    min_avg_iq: Optional[float] = None,
-    max_avg_iq: Optional[float] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    benchmark_min_max: Optional[Dict[str, tuple]] = None,
-    qualified_benchmarks: Optional[set] = None,
 ):
-    """Write entries to CSV file."""
+    """Write entries to CSV file. Derived score columns come from ``scored``, if given."""
     # Remove empty headers to avoid blank columns (llm-stats sometimes emits an empty col)
     cleaned_headers = [h for h in headers if h.strip()]
     # Don't duplicate Model/Country if they're already in headers
@@ -315,7 +334,8 @@ def write_csv(
     if "Country" not in cleaned_headers:
         base_headers.append("Country")
     csv_headers = base_headers + cleaned_headers
-    if include_derived and benchmark_headers:
+    include_derived = scored is not None and scored.include_derived
+    if include_derived:
         csv_headers.extend(["AvgIQ", "Value", "Unified"])
     
     with open(filepath, 'w', newline='', encoding='utf-8') as f:
@@ -343,19 +363,8 @@ def write_csv(
                     row.append(entry.columns.get(header, ""))
 
             # Add derived scores with normalization
-            if include_derived and benchmark_headers:
-                scores = calculate_derived_scores(
-                    entry,
-                    benchmark_headers,
-                    participation,
-                    max_participation,
-                    min_avg_iq,
-                    max_avg_iq,
-                    min_value,
-                    max_value,
-                    benchmark_min_max=benchmark_min_max,
-                    qualified_benchmarks=qualified_benchmarks,
-                )
+            if include_derived:
+                scores = scored.scores_for(entry)
                 row.extend([
                     scores["avgIq"],
                     scores["value"],
@@ -371,16 +380,7 @@ def write_json(
     entries: List[LeaderboardEntry],
     filepath: Path,
     headers: List[str],
-    include_derived: bool = True,
-    benchmark_headers: Optional[List[str]] = None,
-    participation: Optional[Dict[str, int]] = None,
-    max_participation: Optional[int] = None,
-    min_avg_iq: Optional[float] = None,
-    max_avg_iq: Optional[float] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    benchmark_min_max: Optional[Dict[str, tuple]] = None,
-    qualified_benchmarks: Optional[set] = None,
+    scored: Optional[ScoredCohort] = None,
 ):
     """Write entries to JSON file in the current order."""
     cleaned_headers = [h for h in headers if h.strip()]
@@ -396,19 +396,8 @@ def write_json(
                 row[h] = entry.url
             else:
                 row[h] = entry.columns.get(h, "")
-        if include_derived and benchmark_headers:
-            scores = calculate_derived_scores(
-                entry,
-                benchmark_headers,
-                participation,
-                max_participation,
-                min_avg_iq,
-                max_avg_iq,
-                min_value,
-                max_value,
-                benchmark_min_max=benchmark_min_max,
-                qualified_benchmarks=qualified_benchmarks,
-            )
+        if scored is not None and scored.include_derived:
+            scores = scored.scores_for(entry)
             row.update({
                 "AvgIQ": scores["avgIq"],
                 "Value": scores["value"],
@@ -427,17 +416,8 @@ def format_table(
     headers: List[str],
     max_col_width: int = 36,
     model_col_extra: int = 0,
-    include_derived: bool = True,
-    benchmark_headers: Optional[List[str]] = None,
+    scored: Optional[ScoredCohort] = None,
     rank_column_name: str = "Rank",
-    participation: Optional[Dict[str, int]] = None,
-    max_participation: Optional[int] = None,
-    min_avg_iq: Optional[float] = None,
-    max_avg_iq: Optional[float] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    benchmark_min_max: Optional[Dict[str, tuple]] = None,
-    qualified_benchmarks: Optional[set] = None,
 ) -> str:
     """Format entries as a readable table with column width limits."""
     lines = []
@@ -447,7 +427,8 @@ def format_table(
     
     # Build display headers
     display_headers = [rank_column_name, "Model"] + headers
-    if include_derived and benchmark_headers:
+    include_derived = scored is not None and scored.include_derived
+    if include_derived:
         display_headers.extend(["AvgIQ", "Value", "Unified"])
     
     # Compute per-column widths, adding extra width for Model column if requested
@@ -474,19 +455,8 @@ def format_table(
                 row_values.append(str(val))
         
         # Add derived scores with normalization
-        if include_derived and benchmark_headers:
-            scores = calculate_derived_scores(
-                entry,
-                benchmark_headers,
-                participation,
-                max_participation,
-                min_avg_iq,
-                max_avg_iq,
-                min_value,
-                max_value,
-                benchmark_min_max=benchmark_min_max,
-                qualified_benchmarks=qualified_benchmarks,
-            )
+        if include_derived:
+            scores = scored.scores_for(entry)
             row_values.extend([
                 str(scores["avgIq"]),
                 str(scores["value"]),
@@ -502,6 +472,179 @@ def format_table(
     return "\n".join(lines)
 
 
+LEADERBOARD_URL = "https://llm-stats.com/leaderboards/llm-leaderboard"
+# dom: read the rendered table. feed: build rows from the page's data (leaderboard_feed).
+LEADERBOARD_SOURCES = ("dom", "feed")
+# How long the feed scrape waits for the page's own data requests when the
+# records aren't embedded in the HTML.
+FEED_WAIT_MS = 15000
+
+# Leaderboard columns that aren't benchmarks.
+#
+# The llm-stats leaderboard also emits per-category aggregate columns that roll
+# up individual benchmarks (Reasoning, Math, Coding, Search, Writing, Vision,
+# Tools, Long Ctx, Finance, Legal, Health). Keeping them as benchmarks would
+# double-count — each individual GPQA/AIME/etc. already feeds the "Reasoning"
+# aggregate, so scoring across both drags outliers twice. We retain the raw
+# columns for display but exclude them from the scoring set.
+LEADERBOARD_METADATA_COLUMNS = {
+    "Rank", "Model", "Country", "License", "Context", "Input", "Output",
+    "Speed", "Organization", "Created", "Description",
+    "Input $/M", "Output $/M", "Input$/M", "Output$/M",
+    "Parameters (B)", "Parameters(B)", "Knowledge Cutoff", "KnowledgeCutoff",
+    "Multimodal", "Released",
+    # Category-level aggregates (rollups of individual benchmarks)
+    "Reasoning", "Math", "Coding", "Search", "Writing", "Vision", "Tools",
+    "Long Ctx", "LongCtx", "Finance", "Legal", "Health",
+}
+
+# Country column cell → origin code, for the single-load scrape. llm-stats
+# renders the column as a flag; the names are there in case it switches to text.
+COUNTRY_CELL_CODES: Dict[str, str] = {
+    "🇺🇸": "US", "United States": "US", "USA": "US", "US": "US",
+    "🇨🇳": "CN", "China": "CN", "CN": "CN",
+}
+
+
+@dataclass
+class LeaderboardRow:
+    """One ``tbody tr`` of the leaderboard, as read from the page."""
+    name: Optional[str]  # model link text; None if the row has no link
+    href: Optional[str]
+    cells: List[str]  # innerText of every td, in column order
+    multimodal_html: Optional[str] = None  # innerHTML of the Multimodal cell
+
+
+# Serializes the whole table in one round trip. innerText / innerHTML are what
+# ElementHandle.inner_text() / inner_html() return, so both readers agree.
+_LEADERBOARD_TABLE_JS = """
+() => {
+    const headers = Array.from(document.querySelectorAll("thead th"), th => th.innerText.trim());
+    const mm = headers.indexOf("Multimodal");
+    const rows = Array.from(document.querySelectorAll("tbody tr"), tr => {
+        const link = tr.querySelector("a");
+        const tds = Array.from(tr.querySelectorAll("td"));
+        return {
+            name: link ? link.innerText.trim() : null,
+            href: link ? link.getAttribute("href") : null,
+            cells: tds.map(td => td.innerText.trim()),
+            multimodal_html: mm >= 0 && mm < tds.length ? tds[mm].innerHTML : null,
+        };
+    });
+    return {headers, rows};
+}
+"""
+
+
+def read_leaderboard_table(page) -> Tuple[List[str], List[LeaderboardRow]]:
+    """(headers, rows) of the leaderboard table on ``page``, in one ``page.evaluate``.
+
+    Falls back to read_leaderboard_table_elements (a round trip per header and
+    per cell) if the script can't run.
+    """
+    try:
+        table = page.evaluate(_LEADERBOARD_TABLE_JS)
+        headers = [str(h) for h in table["headers"]]
+        rows = [
+            LeaderboardRow(r.get("name"), r.get("href"), [str(c) for c in r["cells"]], r.get("multimodal_html"))
+            for r in table["rows"]
+        ]
+        return headers, rows
+    except Exception as e:
+        print(f"  Warning: bulk table read failed ({e}); reading cell by cell")
+        return read_leaderboard_table_elements(page)
+
+
+def read_leaderboard_table_elements(page) -> Tuple[List[str], List[LeaderboardRow]]:
+    """Same as read_leaderboard_table, through one ElementHandle call per header and cell."""
+    headers = [h.inner_text().strip() for h in page.query_selector_all("thead th")]
+    mm = headers.index("Multimodal") if "Multimodal" in headers else -1
+    rows = []
+    for tr in page.query_selector_all("tbody tr"):
+        link_elem = tr.query_selector("a")
+        tds = tr.query_selector_all("td")
+        rows.append(LeaderboardRow(
+            name=link_elem.inner_text().strip() if link_elem else None,
+            href=link_elem.get_attribute("href") if link_elem else None,
+            cells=[td.inner_text().strip() for td in tds],
+            multimodal_html=tds[mm].inner_html() if 0 <= mm < len(tds) else None,
+        ))
+    return headers, rows
+
+
+def benchmark_headers_of(all_headers: List[str]) -> List[str]:
+    return [h for h in all_headers if h not in LEADERBOARD_METADATA_COLUMNS and h]
+
+
+def classify_multimodal(raw_value: str, html: str) -> str:
+    """"Yes" / "No" for a Multimodal cell, from its text and inner HTML."""
+    # Special handling for Multimodal column: llm-stats renders this
+    # as an icon (no readable text), so we have to look at the cell's
+    # inner HTML to decide Yes/No. The class names below are llm-stats'
+    # current Lucide icon set; if they ever swap icon libraries we
+    # need to fall back to checking aria-label / title / role attrs.
+    html = html.lower()
+
+    # Positive signals: a check icon, a generic "yes/true/supported"
+    # label, or a green colour utility class.
+    positive_signals = (
+        "lucide-check", "icon-check", "checkmark",
+        "text-green", "text-emerald", "fill-green",
+        'aria-label="yes"', 'aria-label="true"', 'aria-label="supported"',
+        'title="yes"', 'title="true"', 'title="supported"',
+    )
+
+    # Negative signals: an X / close icon, an explicit no/false
+    # label, or a grey/neutral colour utility class.
+    negative_signals = (
+        "lucide-x", "lucide-close", "icon-x", "icon-close",
+        "text-gray", "text-neutral", "text-slate", "text-zinc",
+        'aria-label="no"', 'aria-label="false"',
+        'title="no"', 'title="false"',
+    )
+
+    is_checkmark = any(sig in html for sig in positive_signals)
+    is_x = any(sig in html for sig in negative_signals)
+
+    if is_checkmark and not is_x:
+        raw_value = "Yes"
+    elif is_x or (raw_value in ["", "-"]):
+        raw_value = "No"
+    return raw_value
+
+
+def _leaderboard_entry(
+    row: LeaderboardRow,
+    all_headers: List[str],
+    rank: int,
+    origin_code: str,
+) -> Optional[LeaderboardEntry]:
+    """One table row as an entry, or None if it has no model link."""
+    if row.name is None:
+        return None
+
+    url = row.href
+    if not url.startswith("http"):
+        url = f"https://llm-stats.com{url}"
+
+    # Extract all cell values
+    columns = {}
+    for col_idx, header in enumerate(all_headers):
+        if col_idx < len(row.cells):
+            raw_value = row.cells[col_idx]
+            if header == "Multimodal":
+                raw_value = classify_multimodal(raw_value, row.multimodal_html or "")
+            columns[header] = raw_value
+
+    return LeaderboardEntry(
+        rank=rank,
+        name=row.name,
+        country=origin_code,
+        url=url,
+        columns=columns
+    )
+
+
 def scrape_country_leaderboard(
     page,
     country_name: str,
@@ -515,7 +658,7 @@ def scrape_country_leaderboard(
     print(f"\nScraping {country_name} ({origin_code})...")
     
     # Navigate to leaderboard
-    page.goto("https://llm-stats.com/leaderboards/llm-leaderboard", timeout=60000)
+    page.goto(LEADERBOARD_URL, timeout=60000)
     page.wait_for_load_state("domcontentloaded")
     time.sleep(3)
     
@@ -576,101 +719,19 @@ def scrape_country_leaderboard(
     country_option.click()
     time.sleep(2)
     
-    # Extract all table headers
-    header_elements = page.query_selector_all("thead th")
-    all_headers = [h.inner_text().strip() for h in header_elements]
+    # Extract headers and rows in one round trip
+    all_headers, rows = read_leaderboard_table(page)
+    benchmark_headers = benchmark_headers_of(all_headers)
     print(f"  Found {len(all_headers)} columns")
-    
-    # Identify benchmark columns (exclude metadata/non-benchmark columns).
-    #
-    # The llm-stats leaderboard also emits per-category aggregate columns that roll
-    # up individual benchmarks (Reasoning, Math, Coding, Search, Writing, Vision,
-    # Tools, Long Ctx, Finance, Legal, Health). Keeping them as benchmarks would
-    # double-count — each individual GPQA/AIME/etc. already feeds the "Reasoning"
-    # aggregate, so scoring across both drags outliers twice. We retain the raw
-    # columns for display but exclude them from the scoring set.
-    metadata_columns = {
-        "Rank", "Model", "Country", "License", "Context", "Input", "Output",
-        "Speed", "Organization", "Created", "Description",
-        "Input $/M", "Output $/M", "Input$/M", "Output$/M",
-        "Parameters (B)", "Parameters(B)", "Knowledge Cutoff", "KnowledgeCutoff",
-        "Multimodal", "Released",
-        # Category-level aggregates (rollups of individual benchmarks)
-        "Reasoning", "Math", "Coding", "Search", "Writing", "Vision", "Tools",
-        "Long Ctx", "LongCtx", "Finance", "Legal", "Health",
-    }
-
-    benchmark_headers = [h for h in all_headers if h not in metadata_columns and h]
-    
-    # Extract rows
-    rows = page.query_selector_all("tbody tr")
     print(f"  Found {len(rows)} rows")
     
     entries = []
     for i, row in enumerate(rows[:max_models]):
-        # Get model link
-        link_elem = row.query_selector("a")
-        if not link_elem:
+        entry = _leaderboard_entry(row, all_headers, i + 1, origin_code)
+        if entry is None:
             continue
-        
-        name = link_elem.inner_text().strip()
-        url = link_elem.get_attribute("href")
-        if not url.startswith("http"):
-            url = f"https://llm-stats.com{url}"
-        
-        # Extract all cell values
-        cells = row.query_selector_all("td")
-        columns = {}
-        
-        for col_idx, header in enumerate(all_headers):
-            if col_idx < len(cells):
-                raw_value = cells[col_idx].inner_text().strip()
-                # Special handling for Multimodal column: llm-stats renders this
-                # as an icon (no readable text), so we have to look at the cell's
-                # inner HTML to decide Yes/No. The class names below are llm-stats'
-                # current Lucide icon set; if they ever swap icon libraries we
-                # need to fall back to checking aria-label / title / role attrs.
-                if header == "Multimodal":
-                    html = cells[col_idx].inner_html().lower()
-
-                    # Positive signals: a check icon, a generic "yes/true/supported"
-                    # label, or a green colour utility class.
-                    positive_signals = (
-                        "lucide-check", "icon-check", "checkmark",
-                        "text-green", "text-emerald", "fill-green",
-                        'aria-label="yes"', 'aria-label="true"', 'aria-label="supported"',
-                        'title="yes"', 'title="true"', 'title="supported"',
-                    )
-
-                    # Negative signals: an X / close icon, an explicit no/false
-                    # label, or a grey/neutral colour utility class.
-                    negative_signals = (
-                        "lucide-x", "lucide-close", "icon-x", "icon-close",
-                        "text-gray", "text-neutral", "text-slate", "text-zinc",
-                        'aria-label="no"', 'aria-label="false"',
-                        'title="no"', 'title="false"',
-                    )
-
-                    is_checkmark = any(sig in html for sig in positive_signals)
-                    is_x = any(sig in html for sig in negative_signals)
-
-                    if is_checkmark and not is_x:
-                        raw_value = "Yes"
-                    elif is_x or (raw_value in ["", "-"]):
-                        raw_value = "No"
-                    
-                columns[header] = raw_value
-        
-        entry = LeaderboardEntry(
-            rank=i + 1,
-            name=name,
-            country=origin_code,
-            url=url,
-            columns=columns
-        )
-        
         entries.append(entry)
-        print(f"    {i+1}. {name}")
+        print(f"    {i+1}. {entry.name}")
     
     return entries, all_headers, benchmark_headers
 
@@ -683,33 +744,248 @@ def scrape_global_leaderboard(page) -> Dict[str, int]:
     print(f"\nScraping global leaderboard (no country filter)...")
     
     # Navigate to leaderboard
-    page.goto("https://llm-stats.com/leaderboards/llm-leaderboard", timeout=60000)
+    page.goto(LEADERBOARD_URL, timeout=60000)
     page.wait_for_load_state("domcontentloaded")
     time.sleep(3)
     
     # No country filter - just extract all models and their positions
-    rows = page.query_selector_all("tbody tr")
+    _, rows = read_leaderboard_table(page)
     print(f"  Found {len(rows)} rows in global leaderboard")
     
     global_rankings = {}
     for i, row in enumerate(rows):
-        # Get model link
-        link_elem = row.query_selector("a")
-        if not link_elem:
+        if row.name is None:
             continue
-        
-        name = link_elem.inner_text().strip()
         # Rank is based on row position (1-indexed)
-        global_rankings[name] = i + 1
+        global_rankings[row.name] = i + 1
     
     return global_rankings
 
 
-def enrich_with_metadata(
+def scrape_leaderboard_once(
+    page,
+    countries: List[Tuple[str, str]],
+    max_models: int = 10,
+) -> Tuple[Dict[str, Tuple[List[LeaderboardEntry], List[str], List[str]]], Optional[Dict[str, int]]]:
+    """Load the unfiltered leaderboard once and derive every country's top models
+    and the global ranks from it, instead of one filtered load per country plus
+    one for the global ranks.
+
+    A row's country is read from its Country cell (COUNTRY_CELL_CODES). A
+    country's top ``max_models`` are its first rows in table order, which is
+    the order the Country filter shows them in. Global ranks are row
+    positions, as in scrape_global_leaderboard.
+
+    Returns ({origin_code: (entries, all_headers, benchmark_headers)},
+    global_rankings). A country is left out if the table didn't yield
+    ``max_models`` rows for it (no Country column, an unrecognized cell
+    format, a truncated table), and global_rankings is None if the table had
+    no rows, so the caller can fall back to the filter clicks.
+    """
+    codes = ", ".join(code for _, code in countries)
+    print(f"\nScraping leaderboard once ({codes} + global ranks)...")
+
+    page.goto(LEADERBOARD_URL, timeout=60000)
+    page.wait_for_load_state("domcontentloaded")
+    time.sleep(3)
+
+    all_headers, rows = read_leaderboard_table(page)
+    benchmark_headers = benchmark_headers_of(all_headers)
+    print(f"  Found {len(all_headers)} columns")
+    print(f"  Found {len(rows)} rows")
+    if not rows:
+        return {}, None
+
+    country_idx = all_headers.index("Country") if "Country" in all_headers else None
+    if country_idx is None:
+        print("  No Country column in the table; per-country lists need the country filter")
+    entries: Dict[str, List[LeaderboardEntry]] = {code: [] for _, code in countries}
+    global_rankings: Dict[str, int] = {}
+    for i, row in enumerate(rows):
+        if row.name is None:
+            continue
+        global_rankings[row.name] = i + 1
+        if country_idx is None or country_idx >= len(row.cells):
+            continue
+        code = COUNTRY_CELL_CODES.get(row.cells[country_idx])
+        if code not in entries or len(entries[code]) >= max_models:
+            continue
+        entries[code].append(_leaderboard_entry(row, all_headers, len(entries[code]) + 1, code))
+
+    boards: Dict[str, Tuple[List[LeaderboardEntry], List[str], List[str]]] = {}
+    for country_name, code in countries:
+        if country_idx is None:
+            continue
+        if len(entries[code]) < max_models:
+            print(f"  Only {len(entries[code])} {country_name} rows found; using the country filter")
+            continue
+        print(f"  {country_name} ({code}):")
+        for entry in entries[code]:
+            print(f"    {entry.rank}. {entry.name}")
+        boards[code] = (entries[code], all_headers, benchmark_headers)
+    return boards, global_rankings
+
+
+def feed_score_cell(benchmark: str, result: FeedScore) -> Optional[str]:
+    """A feed result as the table shows it, or None if the feed doesn't pin that down.
+
+    Benchmarks with a BENCHMARK_KNOWN_RANGES entry are shown on their own
+    scale, e.g. CodeArena Elo "1,234", so only a raw score inside that range
+    will do; as a percentage it would normalize below zero. Every other
+    benchmark is a percentage, "xx.x%".
+    """
+    if benchmark in BENCHMARK_KNOWN_RANGES:
+        low, high = BENCHMARK_KNOWN_RANGES[benchmark]
+        if result.score is not None and low <= result.score <= high:
+            return f"{result.score:,.0f}"
+        return None
+    percent = result.percent()
+    return None if percent is None else f"{percent:.1f}%"
+
+
+def scrape_leaderboard_feed(
+    page,
+    countries: List[Tuple[str, str]],
+    max_models: int = 10,
+) -> Tuple[Dict[str, Tuple[List[LeaderboardEntry], List[str], List[str]]], Optional[Dict[str, int]]]:
+    """Build every country's top models and the global ranks from the leaderboard's
+    structured data (see leaderboard_feed) rather than its rendered cells.
+
+    The model records come from the document's embedded flight payload, or
+    from the JSON / RSC responses the page fetches, captured with
+    ``page.on("response")``. Nothing waits for the table to render: the page
+    is read at domcontentloaded, and only if the HTML carries no records does
+    it wait (up to FEED_WAIT_MS) for the network to go idle. Headers and
+    cells come out as the table renders them: Rank (the global position),
+    Model, the Country flag, the metadata columns leaderboard_feed can
+    format, the benchmarks (feed_score_cell), Multimodal "Yes"/"No", and "-"
+    for a missing value. If a reported score can't be put on the table's
+    scale, the feed is dropped and the caller scrapes the table instead.
+
+    Same return shape and fallback contract as scrape_leaderboard_once.
+    """
+    codes = ", ".join(code for _, code in countries)
+    print(f"\nReading the leaderboard data feed ({codes} + global ranks)...")
+
+    capture = FeedCapture(page, LEADERBOARD_URL).attach()
+    try:
+        response = page.goto(LEADERBOARD_URL, timeout=60000, wait_until="domcontentloaded")
+        try:
+            document = response.text() if response else ""
+        except Exception:
+            document = ""
+        models = read_feed_models(capture.values(document))
+        if not models:
+            try:
+                page.wait_for_load_state("networkidle", timeout=FEED_WAIT_MS)
+            except Exception:
+                pass
+            models = read_feed_models(capture.values(document))
+    finally:
+        capture.detach()
+    print(f"  Found {len(models)} model records")
+    if not models:
+        return {}, None
+
+    country_codes = {k.lower(): v for k, v in COUNTRY_CELL_CODES.items()}
+    flags = {code: cell for cell, code in COUNTRY_CELL_CODES.items() if not cell.isascii()}
+    wanted: Dict[str, List[Any]] = {code: [] for _, code in countries}
+    global_rankings: Dict[str, int] = {}
+    positions: Dict[str, int] = {}  # detail URL → global rank, for the Rank cell
+    for i, model in enumerate(models):
+        positions[model.url] = model.rank if model.rank is not None else i + 1
+        global_rankings[model.name] = positions[model.url]
+        code = country_codes.get(model.country.lower())
+        if code in wanted and len(wanted[code]) < max_models:
+            wanted[code].append(model)
+
+    # One header list for every country, as with a single table, laid out
+    # like it: benchmarks in first-seen order (US then CN) between the
+    # metadata columns.
+    benchmark_headers: List[str] = []
+    for models_of_country in wanted.values():
+        for model in models_of_country:
+            benchmark_headers += [b for b in model.scores if b not in benchmark_headers]
+    benchmark_headers = benchmark_headers_of(benchmark_headers)
+    all_headers = (
+        ["Rank", "Model", "Country", *FEED_LEADING_COLUMNS]
+        + benchmark_headers
+        + list(FEED_TRAILING_COLUMNS)
+    )
+
+    boards: Dict[str, Tuple[List[LeaderboardEntry], List[str], List[str]]] = {}
+    for country_name, code in countries:
+        if len(wanted[code]) < max_models:
+            print(f"  Only {len(wanted[code])} {country_name} records found")
+            continue
+        print(f"  {country_name} ({code}):")
+        entries = []
+        for rank, model in enumerate(wanted[code], 1):
+            columns = {h: model.columns.get(h, FEED_MISSING) for h in all_headers}
+            columns["Rank"] = str(positions[model.url])
+            columns["Model"] = model.name
+            columns["Country"] = flags.get(code, code)
+            columns["Multimodal"] = "Yes" if model.multimodal else "No"
+            for b in benchmark_headers:
+                if b not in model.scores:
+                    continue
+                cell = feed_score_cell(b, model.scores[b])
+                if cell is None:
+                    print(f"  {model.name}: the feed's {b} score isn't on the table's scale; reading the table instead")
+                    return {}, None
+                columns[b] = cell
+            entries.append(LeaderboardEntry(
+                rank=rank,
+                name=model.name,
+                country=code,
+                url=model.url,
+                columns=columns,
+            ))
+            print(f"    {rank}. {model.name}")
+        boards[code] = (entries, all_headers, benchmark_headers)
+    return boards, global_rankings
+
+
+def scrape_leaderboards(
     page,
+    countries: List[Tuple[str, str]],
+    max_models: int = 10,
+    stage: str = "basic",
+    single_load: bool = True,
+    source: str = "dom",
+) -> Tuple[Dict[str, Tuple[List[LeaderboardEntry], List[str], List[str]]], Optional[Dict[str, int]]]:
+    """Every country's (entries, all_headers, benchmark_headers), plus the global ranks
+    if they came for free.
+
+    With ``source="feed"`` the rows are built from the page's data
+    (scrape_leaderboard_feed); that's all or nothing, so the countries don't end
+    up with headers from different sources. Otherwise, or if the feed didn't
+    cover every country, ``single_load`` reads the table once
+    (scrape_leaderboard_once), and only the countries it couldn't resolve go
+    through the Country filter. global_rankings is None when neither produced
+    it; callers that need it then use scrape_global_leaderboard.
+    """
+    boards: Dict[str, Tuple[List[LeaderboardEntry], List[str], List[str]]] = {}
+    global_rankings: Optional[Dict[str, int]] = None
+    if source == "feed":
+        boards, global_rankings = scrape_leaderboard_feed(page, countries, max_models)
+        if len(boards) < len(countries):
+            print("  The data feed didn't cover every country; reading the rendered table instead")
+            boards, global_rankings = {}, None
+    if not boards and single_load:
+        boards, global_rankings = scrape_leaderboard_once(page, countries, max_models)
+    for country_name, code in countries:
+        if code not in boards:
+            boards[code] = scrape_country_leaderboard(page, country_name, code, max_models=max_models, stage=stage)
+    return boards, global_rankings
+
+
+def enrich_with_metadata(
+    pages: Union[DetailPageFetcher, Any],
     entries: List[LeaderboardEntry],
     known_benchmark_headers: Optional[List[str]] = None,
     canonical_header_map: Optional[Dict[str, str]] = None,
+    on_entry: Optional[Callable[[LeaderboardEntry, List[str]], None]] = None,
 ) -> Tuple[List[LeaderboardEntry], List[str]]:
     """Extract metadata and detail-page benchmark scores from model detail pages.
 
@@ -720,6 +996,14 @@ def enrich_with_metadata(
 
     Returns (entries, new_headers) where new_headers is the ordered list of benchmark
     names discovered on detail pages that were not already in known_benchmark_headers.
+
+    ``pages`` is a DetailPageFetcher, or a Playwright page to load each detail page
+    on in turn. Entries are merged strictly in list order whichever page finished
+    loading first, so a prefetched pool gives the same result as the sequential scan.
+
+    ``on_entry(entry, headers)``, if given, is called after each model's detail page
+    is done (or failed), with every benchmark header known at that point. The
+    pipelined gap-fill pass uses it to start lookups before enrichment finishes.
     """
     print(f"\nEnriching {len(entries)} models with descriptions and detail benchmarks...")
 
@@ -730,28 +1014,24 @@ def enrich_with_metadata(
     for header in (known_benchmark_headers or []):
         canonical_header_map.setdefault(canonicalize_benchmark_name(header), header)
 
+    if not isinstance(pages, DetailPageFetcher):
+        pages = DetailPageFetcher(pages, workers=1)
+
     new_headers: List[str] = []
 
     for i, entry in enumerate(entries):
         print(f"  [{i+1}/{len(entries)}] {entry.name}")
 
         try:
-            page.goto(entry.url, timeout=60000)
-            page.wait_for_load_state("domcontentloaded")
-            time.sleep(1)
+            detail = pages.get(entry.url)
+            if detail.error is not None:
+                raise RuntimeError(detail.error)
 
-            # Extract meta description
-            try:
-                desc_elem = page.query_selector("meta[name='description']")
-                if desc_elem:
-                    desc = desc_elem.get_attribute("content")
-                    if desc:
-                        entry.columns["description"] = desc[:200]
-            except Exception:
-                pass
+            if detail.description:
+                entry.columns["description"] = detail.description[:200]
 
             # Extract benchmark scores from the embedded flight payload
-            detail_scores = extract_detail_benchmarks(page)
+            detail_scores = parse_detail_benchmarks(detail.html)
             for detail_name, detail_value in detail_scores.items():
                 canon = canonicalize_benchmark_name(detail_name)
                 if not canon:
@@ -760,8 +1040,7 @@ def enrich_with_metadata(
                 if canon in canonical_header_map:
                     # Known benchmark — fill in only if the existing cell is blank.
                     canonical_key = canonical_header_map[canon]
-                    existing = entry.columns.get(canonical_key, "")
-                    if existing in MISSING_VALUE_MARKERS:
+                    if not entry.columns.is_present(canonical_key):
                         entry.columns[canonical_key] = detail_value
                 else:
                     # Brand-new benchmark — add it as a new column, using the
@@ -772,7 +1051,9 @@ def enrich_with_metadata(
 
         except Exception as e:
             print(f"    Warning: Failed to fetch metadata - {e}")
-            continue
+
+        if on_entry is not None:
+            on_entry(entry, list(known_benchmark_headers or []) + new_headers)
 
     return entries, new_headers
 
@@ -789,21 +1070,35 @@ def backup_models_json(models_path: Path) -> Path:
     return backup_path
 
 
+def previous_snapshot_rows(workspace_dir: Path) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """(model, origin) → row of the latest recorded snapshot, or {} if there isn't one.
+
+    Only the pipelined gap-fill pass needs it, to predict cells of models whose
+    detail page hasn't been parsed yet; it runs fine without.
+    """
+    for path in (history_log_path(workspace_dir), workspace_dir / "models.json"):
+        if not path.exists():
+            continue
+        try:
+            snapshot = read_latest(path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not read the previous snapshot from {path.name}: {e}")
+            continue
+        return {
+            (row.get("model", ""), row.get("origin", code)): row
+            for code, rows in snapshot.get("teams", {}).items()
+            for row in rows
+        }
+    return {}
+
+
 def build_history_entry(
     us_entries: List[LeaderboardEntry],
     cn_entries: List[LeaderboardEntry],
     all_headers: List[str],
-    benchmark_headers: List[str],
-    participation: Optional[Dict[str, int]] = None,
-    max_participation: Optional[int] = None,
-    min_avg_iq: Optional[float] = None,
-    max_avg_iq: Optional[float] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    benchmark_min_max: Optional[Dict[str, tuple]] = None,
-    qualified_benchmarks: Optional[set] = None,
+    scored: ScoredCohort,
 ) -> Dict[str, Any]:
-    """Build models.json history entry from scraped data."""
+    """Build models.json history entry from scraped data and its final scores."""
     # Get timezone-aware timestamp
     now_local = datetime.now()
     now_utc = datetime.now(timezone.utc)
@@ -816,18 +1111,7 @@ def build_history_entry(
 
     def entry_to_row(entry: LeaderboardEntry) -> Dict[str, Any]:
         """Convert LeaderboardEntry to models.json row format."""
-        scores = calculate_derived_scores(
-            entry,
-            benchmark_headers,
-            participation,
-            max_participation,
-            min_avg_iq,
-            max_avg_iq,
-            min_value,
-            max_value,
-            benchmark_min_max=benchmark_min_max,
-            qualified_benchmarks=qualified_benchmarks,
-        )
+        scores = scored.scores_for(entry)
 
         # Get organization from table column, description from metadata enrichment
         organization = entry.columns.get("Organization", "")
@@ -880,35 +1164,49 @@ def build_history_entry(
     }
 
 
-def prepend_history(models_path: Path, new_entry: Dict[str, Any]):
-    """Prepend new history entry to models.json."""
-    with open(models_path, 'r') as f:
-        data = json.load(f)
+def prepend_history(
+    models_path: Path,
+    new_entry: Dict[str, Any],
+    write_legacy: bool = True,
+):
+    """Record a new history entry and refresh the published views.
+
+    The entry is appended to the snapshot log (data/history.ndjson) — an O(1)
+    write regardless of how much history exists — and latest.json plus the
+    current month's archive shard are regenerated from it. The legacy
+    full-history models.json is only re-exported when ``write_legacy`` is set.
 
-    if 'history' not in data:
-        data['history'] = []
+    The first run after upgrading migrates models.json's ``data.history`` into
+    the log automatically (see history_store.migrate_to_log).
+    """
+    workspace_dir = models_path.parent
+    log_path = history_log_path(workspace_dir)
+    if not log_path.exists():
+        print(f"No {log_path.name} yet; migrating existing history into it...")
+        migrate_to_log(workspace_dir)
 
-    data['history'].insert(0, new_entry)
+    envelope = load_envelope(workspace_dir)
 
     # Update footerText with the latest timestamp
     ts = new_entry.get("timestamp", "")
-    if ts and "metadata" in data:
+    if ts and "metadata" in envelope:
         try:
             from dateutil.parser import parse as parse_date
             dt = parse_date(ts)
             date_label = dt.strftime("%b %d, %Y").replace(" 0", " ")
         except Exception:
             date_label = ts[:10]
-        data["metadata"]["footerText"] = (
+        envelope["metadata"]["footerText"] = (
             f"Data Audited {date_label} | Source: llm-stats.com | "
             "IQ = flat average over the qualified benchmark set "
             "(two-pass scoring, category aggregates excluded)"
         )
+        save_envelope(workspace_dir, envelope)
 
-    with open(models_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    append_snapshot(log_path, new_entry)
+    print(f"\n✅ Successfully appended entry to {log_path.name}")
 
-    print(f"\n✅ Successfully prepended entry to models.json")
+    publish_appended(workspace_dir, envelope, new_entry, write_legacy=write_legacy)
 
 
 # URLs whose <lastmod> should get bumped every time the daily scraper runs.
@@ -1011,14 +1309,18 @@ def update_sitemap_lastmod(sitemap_path: Path, run_date: Optional[str] = None) -
     return changed
 
 
-def build_benchmark_participation(entries: List[LeaderboardEntry], benchmark_headers: List[str]) -> Tuple[Dict[str, int], int]:
-    """Count participation per benchmark and return counts with max participation."""
-    counts: Dict[str, int] = {b: 0 for b in benchmark_headers}
-    for entry in entries:
-        for b in benchmark_headers:
-            raw_val = entry.columns.get(b, "")
-            if raw_val not in MISSING_VALUE_MARKERS:
-                counts[b] += 1
+def build_benchmark_participation(
+    entries: List[LeaderboardEntry],
+    benchmark_headers: List[str],
+    index: Optional[ParticipationIndex] = None,
+) -> Tuple[Dict[str, int], int]:
+    """Count participation per benchmark and return counts with max participation.
+
+    Pass ``index`` to reuse a ParticipationIndex already built over ``entries``.
+    """
+    if index is None:
+        index = ParticipationIndex(entries, benchmark_headers)
+    counts = index.counts()
     max_participation = max(counts.values(), default=1)
     if max_participation <= 0:
         max_participation = 1
@@ -1048,19 +1350,23 @@ def run_scraper(args):
     print(f"{stage_name}")
     print(f"{'='*80}")
     
+    # The pipelined gap-fill pass, when enabled, starts during enrichment.
+    pipeline: Optional[GapFillPipeline] = None
+    detail_pages: Optional[DetailPageFetcher] = None
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=not args.debug)
         page = browser.new_page()
         
         try:
-            # Scrape both countries
-            us_entries, us_headers, us_benchmarks = scrape_country_leaderboard(
-                page, "United States", "US", max_models=10, stage=stage
-            )
-            
-            cn_entries, cn_headers, cn_benchmarks = scrape_country_leaderboard(
-                page, "China", "CN", max_models=10, stage=stage
+            # Scrape both countries (and the global ranks, when one load gives all three)
+            boards, global_rankings = scrape_leaderboards(
+                page, [("United States", "US"), ("China", "CN")], max_models=10, stage=stage,
+                single_load=not getattr(args, "country_filters", False),
+                source=getattr(args, "leaderboard_source", "dom"),
             )
+            us_entries, us_headers, us_benchmarks = boards["US"]
+            cn_entries, cn_headers, cn_benchmarks = boards["CN"]
             
             # Use US headers as canonical
             all_headers = us_headers
@@ -1073,7 +1379,8 @@ def run_scraper(args):
             # Stage-specific behavior
             if stage == "basic":
                 # Get global leaderboard rankings
-                global_rankings = scrape_global_leaderboard(page)
+                if global_rankings is None:
+                    global_rankings = scrape_global_leaderboard(page)
                 
                 # Add llm-stats ranking to entries
                 for entry in us_entries:
@@ -1108,18 +1415,18 @@ def run_scraper(args):
                     "🏆 Top 20 Models (US + China) Sorted by Leaderboard Rank",
                     ["Country", "URL"],
                     max_col_width=15,
-                    include_derived=False,
                     rank_column_name="Rank"
                 ))
                 
                 print("\nWriting CSV files...")
-                write_csv(all_entries, workspace_dir / f"stage{stage_num}_combined.csv", ["llm-stats ranking", "Country", "URL"], include_derived=False, rank_column_name="Leaderboard Rank")
-                write_csv(us_entries, workspace_dir / f"stage{stage_num}_us.csv", ["llm-stats ranking", "Country", "URL"], include_derived=False, rank_column_name="Leaderboard Rank")
-                write_csv(cn_entries, workspace_dir / f"stage{stage_num}_cn.csv", ["llm-stats ranking", "Country", "URL"], include_derived=False, rank_column_name="Leaderboard Rank")
+                write_csv(all_entries, workspace_dir / f"stage{stage_num}_combined.csv", ["llm-stats ranking", "Country", "URL"], rank_column_name="Leaderboard Rank")
+                write_csv(us_entries, workspace_dir / f"stage{stage_num}_us.csv", ["llm-stats ranking", "Country", "URL"], rank_column_name="Leaderboard Rank")
+                write_csv(cn_entries, workspace_dir / f"stage{stage_num}_cn.csv", ["llm-stats ranking", "Country", "URL"], rank_column_name="Leaderboard Rank")
                 
             elif stage == "full":
                 # Get global leaderboard rankings
-                global_rankings = scrape_global_leaderboard(page)
+                if global_rankings is None:
+                    global_rankings = scrape_global_leaderboard(page)
                 
                 # Combine entries and compute global rank for reference
                 all_entries = us_entries + cn_entries
@@ -1127,47 +1434,34 @@ def run_scraper(args):
                     rank_value = global_rankings.get(entry.name, float('inf'))
                     entry.rank = rank_value if isinstance(rank_value, int) else float('inf')
                 
-                # Calculate min/max for each benchmark (normalize scores across all models)
-                benchmark_min_max = {}
-                for b in benchmark_headers:
-                    # Exclude benchmarks with a single participant from normalization as well
-                    if participation_counts.get(b, 0) <= 1:
-                        continue
-                    values = []
-                    for e in all_entries:
-                        raw_val = e.columns.get(b, "")
-                        if raw_val and raw_val not in MISSING_VALUE_MARKERS:
-                            values.append(parse_to_number(raw_val))
-                    if values:
-                        benchmark_min_max[b] = (min(values), max(values))
+                # Parse the cohort's cells once; every score below comes from it.
+                engine = ScoringEngine(all_entries, benchmark_headers)
+
+                # Calculate min/max for each benchmark (normalize scores across all models).
+                # Benchmarks with a single participant are excluded from normalization as well.
+                benchmark_min_max = engine.cohort_ranges(participation_counts)
                 
                 # Calculate min/max for normalization (first pass with benchmark normalization)
-                avg_iq_values = []
-                value_values = []
-                for e in all_entries:
-                    scores = calculate_derived_scores(e, benchmark_headers, participation_counts, max_participation, benchmark_min_max=benchmark_min_max)
-                    avg_iq_values.append(scores["avgIq"])
-                    value_values.append(scores["value"])
-                
-                min_avg_iq = min(avg_iq_values) if avg_iq_values else 0
-                max_avg_iq = max(avg_iq_values) if avg_iq_values else 1
-                min_value = min(value_values) if value_values else 0
-                max_value = max(value_values) if value_values else 1
+                if all_entries:
+                    min_avg_iq, max_avg_iq, min_value, max_value = score_bounds(engine.score(
+                        participation_counts, max_participation, benchmark_min_max=benchmark_min_max
+                    ))
+                else:
+                    min_avg_iq, max_avg_iq, min_value, max_value = 0, 1, 0, 1
                 
-                # Sort by Unified (desc) using normalized AvgIQ and Value
-                all_entries.sort(
-                    key=lambda e: -calculate_derived_scores(
-                        e,
-                        benchmark_headers,
-                        participation_counts,
-                        max_participation,
-                        min_avg_iq,
-                        max_avg_iq,
-                        min_value,
-                        max_value,
-                        benchmark_min_max=benchmark_min_max,
-                    )["unified"]
+                # Score once with normalized AvgIQ and Value; every sink below reuses it.
+                scored = engine.cohort(
+                    participation_counts,
+                    max_participation,
+                    min_avg_iq,
+                    max_avg_iq,
+                    min_value,
+                    max_value,
+                    benchmark_min_max=benchmark_min_max,
                 )
+
+                # Sort by Unified (desc)
+                all_entries.sort(key=lambda e: -scored.unified(e))
                 
                 # Only display: Rank, Model, Country, Organization + derived scores
                 display_headers = ["Country", "Organization"]
@@ -1178,15 +1472,7 @@ def run_scraper(args):
                     display_headers,
                     max_col_width=15,
                     model_col_extra=5,
-                    include_derived=True,
-                    benchmark_headers=benchmark_headers,
-                    participation=participation_counts,
-                    max_participation=max_participation,
-                    min_avg_iq=min_avg_iq,
-                    max_avg_iq=max_avg_iq,
-                    min_value=min_value,
-                    max_value=max_value,
-                    benchmark_min_max=benchmark_min_max
+                    scored=scored,
                 ))
                 
                 print("\nWriting CSV/JSON files...")
@@ -1194,76 +1480,33 @@ def run_scraper(args):
                     all_entries,
                     workspace_dir / f"stage{stage_num}_combined.csv",
                     all_headers,
-                    include_derived=True,
-                    benchmark_headers=benchmark_headers,
-                    participation=participation_counts,
-                    max_participation=max_participation,
-                    min_avg_iq=min_avg_iq,
-                    max_avg_iq=max_avg_iq,
-                    min_value=min_value,
-                    max_value=max_value,
-                    benchmark_min_max=benchmark_min_max,
+                    scored=scored,
                 )
                 write_csv(
                     us_entries,
                     workspace_dir / f"stage{stage_num}_us.csv",
                     all_headers,
-                    include_derived=True,
-                    benchmark_headers=benchmark_headers,
-                    participation=participation_counts,
-                    max_participation=max_participation,
-                    min_avg_iq=min_avg_iq,
-                    max_avg_iq=max_avg_iq,
-                    min_value=min_value,
-                    max_value=max_value,
-                    benchmark_min_max=benchmark_min_max,
+                    scored=scored,
                 )
                 write_csv(
                     cn_entries,
                     workspace_dir / f"stage{stage_num}_cn.csv",
                     all_headers,
-                    include_derived=True,
-                    benchmark_headers=benchmark_headers,
-                    participation=participation_counts,
-                    max_participation=max_participation,
-                    min_avg_iq=min_avg_iq,
-                    max_avg_iq=max_avg_iq,
-                    min_value=min_value,
-                    max_value=max_value,
-                    benchmark_min_max=benchmark_min_max,
+                    scored=scored,
                 )
                 # Combined JSON export in the same (Unified-desc) order
                 write_json(
                     all_entries,
                     workspace_dir / f"stage{stage_num}_combined.json",
                     all_headers,
-                    include_derived=True,
-                    benchmark_headers=benchmark_headers,
-                    participation=participation_counts,
-                    max_participation=max_participation,
-                    min_avg_iq=min_avg_iq,
-                    max_avg_iq=max_avg_iq,
-                    min_value=min_value,
-                    max_value=max_value,
-                    benchmark_min_max=benchmark_min_max,
+                    scored=scored,
                 )
 
                 # Create per-country Unified summaries and top-3 lists
                 summaries: Dict[str, Dict[str, Any]] = {}
                 per_country_rows: Dict[str, List[Dict[str, Any]]] = {"US": [], "CN": []}
-                # Precompute unified for each entry with same normalization
                 for e in all_entries:
-                    s = calculate_derived_scores(
-                        e,
-                        benchmark_headers,
-                        participation_counts,
-                        max_participation,
-                        min_avg_iq,
-                        max_avg_iq,
-                        min_value,
-                        max_value,
-                        benchmark_min_max=benchmark_min_max,
-                    )
+                    s = scored.scores_for(e)
                     per_country_rows.setdefault(e.country, []).append({
                         "Model": e.name,
                         "Country": e.country,
@@ -1303,16 +1546,59 @@ def run_scraper(args):
                             print(f"  {i}. {r['Model']} — Unified {r['Unified']:.2f}")
                 
             else:  # metadata stage
+                gap_fill_options = dict(
+                    max_calls=getattr(args, "gap_fill_max_calls", 40),
+                    workers=getattr(args, "gap_fill_workers", DEFAULT_GAP_FILL_WORKERS),
+                    token_budget=getattr(args, "gap_fill_token_budget", None),
+                    cost_budget=getattr(args, "gap_fill_cost_budget", None),
+                    priority=getattr(args, "gap_fill_priority", "value"),
+                    known_ranges=BENCHMARK_KNOWN_RANGES,
+                    ttl_policy=getattr(args, "gap_fill_ttl_policy", None),
+                    min_confidence=getattr(args, "gap_fill_min_confidence", "high"),
+                    source_pages=getattr(args, "gap_fill_sources", False),
+                    grouping=getattr(args, "gap_fill_grouping", "model"),
+                    scraper_run_ts=datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+                )
+                gap_fill_mode = getattr(args, "gap_fill_mode", "sync")
+                if getattr(args, "gap_fill_pipelined", False) and not getattr(args, "no_gap_fill", False):
+                    if gap_fill_mode != "sync":
+                        print("\n[gap-fill] --gap-fill-pipelined needs --gap-fill-mode sync; "
+                              "running the pass after enrichment")
+                    else:
+                        try:
+                            pipeline = GapFillPipeline(
+                                us_entries + cn_entries,
+                                benchmark_headers,
+                                canonicalize=canonicalize_benchmark_name,
+                                prior_rows=previous_snapshot_rows(workspace_dir),
+                                **gap_fill_options,
+                            )
+                        except Exception as gap_err:
+                            print(f"[gap-fill] pipelined pass failed to start ({gap_err}); "
+                                  f"running it after enrichment")
+
                 # Enrich detail pages. Share one canonical-name map across both countries
                 # so a benchmark first discovered for a US model isn't duplicated when
-                # the same name shows up for a CN model.
+                # the same name shows up for a CN model. Both countries' pages load
+                # in the background from the start; the merge stays US then CN.
+                detail_pages = DetailPageFetcher(
+                    page,
+                    getattr(args, "detail_workers", DEFAULT_DETAIL_WORKERS),
+                    mode=getattr(args, "detail_fetch", "http"),
+                    headless=not args.debug,
+                )
+                detail_pages.prefetch(e.url for e in us_entries + cn_entries)
                 canonical_header_map: Dict[str, str] = {}
+                on_entry = pipeline.model_ready if pipeline is not None else None
                 us_entries, us_new_headers = enrich_with_metadata(
-                    page, us_entries, benchmark_headers, canonical_header_map
+                    detail_pages, us_entries, benchmark_headers, canonical_header_map, on_entry
                 )
                 cn_entries, cn_new_headers = enrich_with_metadata(
-                    page, cn_entries, benchmark_headers + us_new_headers, canonical_header_map
+                    detail_pages, cn_entries, benchmark_headers + us_new_headers, canonical_header_map, on_entry
                 )
+                detail_pages.close()
+                print(f"\nDetail pages: {detail_pages.fetched} fetched over HTTP, "
+                      f"{detail_pages.browser_loads} loaded in Chromium")
 
                 # Merge new benchmarks into the working header lists
                 discovered_headers: List[str] = []
@@ -1366,14 +1652,16 @@ def run_scraper(args):
                 # is missing, or no candidates exist after the §5/§6 filters.
                 # -------------------------------------------------------------
                 if not getattr(args, "no_gap_fill", False):
-                    scrape_run_ts = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
                     try:
-                        run_gap_filling_pass(
-                            combined_entries,
-                            benchmark_headers,
-                            max_calls=getattr(args, "gap_fill_max_calls", 40),
-                            scraper_run_ts=scrape_run_ts,
-                        )
+                        if pipeline is not None:
+                            pipeline.finish(combined_entries, benchmark_headers)
+                        else:
+                            run_gap_filling_pass(
+                                combined_entries,
+                                benchmark_headers,
+                                mode=gap_fill_mode,
+                                **gap_fill_options,
+                            )
                     except Exception as gap_err:
                         print(f"[gap-fill] pass crashed ({gap_err}); proceeding to Pass 1 unaffected")
                 else:
@@ -1381,41 +1669,27 @@ def run_scraper(args):
 
                 # Rebuild participation counts now that the header set and cell values
                 # have both expanded from detail-page enrichment AND any gap-fills.
+                # The index also answers every "how many of this top 10 report X"
+                # question below with a popcount.
+                participation_index = ParticipationIndex(combined_entries, benchmark_headers)
                 participation_counts, max_participation = build_benchmark_participation(
-                    combined_entries, benchmark_headers
+                    combined_entries, benchmark_headers, participation_index
                 )
 
+                # The cells are final from here on (enrichment, sparse-drop and
+                # gap-fill are done), so parse them into the score matrix once.
+                engine = ScoringEngine(combined_entries, benchmark_headers)
+
                 # Calculate per-benchmark min/max for normalization (exclude single-participant benchmarks)
-                benchmark_min_max = {}
-                for b in benchmark_headers:
-                    if participation_counts.get(b, 0) <= 1:
-                        continue
-                    values = []
-                    for e in combined_entries:
-                        raw_val = e.columns.get(b, "")
-                        if raw_val and raw_val not in MISSING_VALUE_MARKERS:
-                            values.append(parse_to_number(raw_val))
-                    if values:
-                        benchmark_min_max[b] = (min(values), max(values))
+                benchmark_min_max = engine.cohort_ranges(participation_counts)
 
                 # Compute min/max for AvgIQ and Value using normalized benchmark scores
-                avg_iq_values = []
-                value_values = []
-                for e in combined_entries:
-                    scores = calculate_derived_scores(
-                        e,
-                        benchmark_headers,
-                        participation_counts,
-                        max_participation,
-                        benchmark_min_max=benchmark_min_max,
-                    )
-                    avg_iq_values.append(scores["avgIq"])
-                    value_values.append(scores["value"])
-
-                min_avg_iq = min(avg_iq_values) if avg_iq_values else 0
-                max_avg_iq = max(avg_iq_values) if avg_iq_values else 1
-                min_value = min(value_values) if value_values else 0
-                max_value = max(value_values) if value_values else 1
+                if combined_entries:
+                    min_avg_iq, max_avg_iq, min_value, max_value = score_bounds(engine.score(
+                        participation_counts, max_participation, benchmark_min_max=benchmark_min_max
+                    ))
+                else:
+                    min_avg_iq, max_avg_iq, min_value, max_value = 0, 1, 0, 1
 
                 # -----------------------------------------------------------------
                 # Pass 2: two-pass scoring with convergence iteration
@@ -1435,77 +1709,44 @@ def run_scraper(args):
                 #    the qualified set is stable, capped at MAX_QUALIFIED_ITERATIONS
                 #    to prevent oscillation in pathological cases.
                 # If fewer than 3 benchmarks qualify, fall back to Pass 1 silently.
-                QUALIFIED_THRESHOLD = 8
-                MIN_QUALIFIED_FLOOR = 3
-                MAX_QUALIFIED_ITERATIONS = 5
+                QUALIFIED_THRESHOLD = PASS2_QUALIFIED_THRESHOLD
+                MIN_QUALIFIED_FLOOR = PASS2_MIN_QUALIFIED
+                MAX_QUALIFIED_ITERATIONS = PASS2_MAX_ITERATIONS
                 qualified_benchmarks: Optional[set] = None
 
-                def _pass1_unified(e: LeaderboardEntry) -> float:
-                    return calculate_derived_scores(
-                        e,
-                        benchmark_headers,
-                        participation_counts,
-                        max_participation,
-                        min_avg_iq,
-                        max_avg_iq,
-                        min_value,
-                        max_value,
-                        benchmark_min_max=benchmark_min_max,
-                    )["unified"]
+                def _top10_by_unified(scores: List[Dict[str, float]]) -> List[LeaderboardEntry]:
+                    # sorted() is stable, so ties keep cohort order exactly as
+                    # sorting the entries by a per-entry score key did.
+                    order = sorted(range(len(combined_entries)), key=lambda i: scores[i]["unified"], reverse=True)
+                    return [combined_entries[i] for i in order[:PASS2_TOP_N]]
 
                 def _qualified_for_top10(top10: List[LeaderboardEntry]) -> set:
                     """Return benchmarks reported by ≥ QUALIFIED_THRESHOLD of the given top 10."""
-                    out = set()
-                    for b in benchmark_headers:
-                        count = sum(
-                            1 for e in top10
-                            if e.columns.get(b, "") not in MISSING_VALUE_MARKERS
-                        )
-                        if count >= QUALIFIED_THRESHOLD:
-                            out.add(b)
-                    return out
+                    mask = participation_index.mask_of(top10)
+                    return set(participation_index.reported_by(mask, QUALIFIED_THRESHOLD))
+
+                # Ranges, per-model sums and already-seen sets carry over between
+                # iterations; each re-rank only touches the benchmarks that
+                # entered or left the qualified set.
+                pass2_solver = Pass2Solver(engine, BENCHMARK_KNOWN_RANGES, top_n=PASS2_TOP_N)
 
-                def _rank_with_qset(qset: set) -> Tuple[List[LeaderboardEntry], Dict[str, tuple], float, float, float, float]:
-                    """Compute Pass 2 ranking + min/max under the given qualified set.
+                def _rank_with_qset(qset: set) -> Tuple[List[LeaderboardEntry], Dict[str, tuple]]:
+                    """Compute the Pass 2 top 10 under the given qualified set.
 
-                    Returns (top10, pass2_benchmark_min_max, min_iq, max_iq, min_v, max_v).
+                    Returns (top10, pass2_benchmark_min_max).
                     """
-                    bmm: Dict[str, tuple] = {}
-                    for b in qset:
-                        rng = resolve_benchmark_range(b, combined_entries)
-                        if rng is not None:
-                            bmm[b] = rng
-
-                    iqs: List[float] = []
-                    vals: List[float] = []
-                    for e in combined_entries:
-                        s = calculate_derived_scores(
-                            e,
-                            benchmark_headers,
-                            benchmark_min_max=bmm,
-                            qualified_benchmarks=qset,
-                        )
-                        iqs.append(s["avgIq"])
-                        vals.append(s["value"])
-                    miq, maq = (min(iqs), max(iqs)) if iqs else (0.0, 1.0)
-                    mv, mxv = (min(vals), max(vals)) if vals else (0.0, 1.0)
-
-                    def _unified(e: LeaderboardEntry) -> float:
-                        return calculate_derived_scores(
-                            e,
-                            benchmark_headers,
-                            min_avg_iq=miq,
-                            max_avg_iq=maq,
-                            min_value=mv,
-                            max_value=mxv,
-                            benchmark_min_max=bmm,
-                            qualified_benchmarks=qset,
-                        )["unified"]
-
-                    new_top10 = sorted(combined_entries, key=_unified, reverse=True)[:10]
-                    return new_top10, bmm, miq, maq, mv, mxv
-
-                initial_top10 = sorted(combined_entries, key=_pass1_unified, reverse=True)[:10]
+                    ranking = pass2_solver.rank(qset)
+                    return [combined_entries[i] for i in ranking.top], dict(ranking.benchmark_min_max)
+
+                initial_top10 = _top10_by_unified(engine.score(
+                    participation_counts,
+                    max_participation,
+                    min_avg_iq,
+                    max_avg_iq,
+                    min_value,
+                    max_value,
+                    benchmark_min_max=benchmark_min_max,
+                ))
                 print(f"\n--- Pass 2 / Two-pass scoring ---")
                 print(f"Pass 1 Top 10 (used as the seed for the qualified-set search):")
                 for i, e in enumerate(initial_top10, 1):
@@ -1520,12 +1761,13 @@ def run_scraper(args):
                 else:
                     # Iterate: re-derive qualified set from each new Pass 2 top 10 and
                     # re-rank, until the set stops changing.
-                    seen_qsets: List[set] = [qualified_set]
+                    seen_qsets: Set[FrozenSet[str]] = {frozenset(qualified_set)}
                     converged = False
                     pass2_bmm: Dict[str, tuple] = {}
-                    pass2_miq = pass2_maq = pass2_mv = pass2_mxv = 0.0
+                    ranked_qset = qualified_set
                     for iteration in range(1, MAX_QUALIFIED_ITERATIONS + 1):
-                        new_top10, pass2_bmm, pass2_miq, pass2_maq, pass2_mv, pass2_mxv = _rank_with_qset(qualified_set)
+                        ranked_qset = qualified_set
+                        new_top10, pass2_bmm = _rank_with_qset(ranked_qset)
                         new_qset = _qualified_for_top10(new_top10)
                         added = sorted(new_qset - qualified_set)
                         removed = sorted(qualified_set - new_qset)
@@ -1543,7 +1785,7 @@ def run_scraper(args):
                         if removed:
                             print(f"  removed: {', '.join(removed)}")
                         # Detect oscillation: if we've already seen this exact set, stop.
-                        if any(new_qset == prev for prev in seen_qsets):
+                        if frozenset(new_qset) in seen_qsets:
                             print(
                                 f"  → oscillation detected (set repeats a previous iteration); "
                                 f"stopping at iteration {iteration}."
@@ -1551,7 +1793,7 @@ def run_scraper(args):
                             current_top10 = new_top10
                             qualified_set = new_qset
                             break
-                        seen_qsets.append(new_qset)
+                        seen_qsets.add(frozenset(new_qset))
                         qualified_set = new_qset
                         current_top10 = new_top10
                     else:
@@ -1564,47 +1806,46 @@ def run_scraper(args):
 
                     print(f"\nFinal qualified benchmarks ({len(qualified_set)} of {len(benchmark_headers)}, "
                           f"threshold >= {QUALIFIED_THRESHOLD}/10 of Pass 2 Top 10):")
+                    top10_mask = participation_index.mask_of(current_top10)
                     for b in sorted(qualified_set):
-                        count = sum(
-                            1 for e in current_top10
-                            if e.columns.get(b, "") not in MISSING_VALUE_MARKERS
-                        )
+                        count = participation_index.count(b, top10_mask)
                         print(f"  ✓ {b}  ({count}/10)")
 
                     print(f"\nFinal Pass 2 Top 10:")
                     for i, e in enumerate(current_top10, 1):
                         print(f"  {i:>2}. {e.name} ({e.country})")
 
+                    # Normalization bounds for the set the final ranking used,
+                    # recomputed exactly (the solver's running sums are only
+                    # used to rank).
                     benchmark_min_max = pass2_bmm
-                    min_avg_iq = pass2_miq
-                    max_avg_iq = pass2_maq
-                    min_value = pass2_mv
-                    max_value = pass2_mxv
+                    min_avg_iq, max_avg_iq, min_value, max_value = pass2_solver.exact_bounds(ranked_qset)
 
                     print(f"\nPass 2 scoring applied. Non-qualified benchmarks are kept as raw columns "
                           f"but excluded from AvgIQ / Unified.")
 
                 # -----------------------------------------------------------------
-                # From here on, every helper is called with qualified_benchmarks, so
-                # if Pass 2 ran it governs scoring. If Pass 2 fell back, the variable
-                # stays None and the helpers behave exactly as Pass 1.
+                # Final scores, computed once for every sink below. If Pass 2 ran,
+                # qualified_benchmarks governs scoring; if it fell back, the
+                # variable stays None and this is exactly the Pass 1 scoring.
                 # -----------------------------------------------------------------
+                scored = engine.cohort(
+                    participation_counts,
+                    max_participation,
+                    min_avg_iq,
+                    max_avg_iq,
+                    min_value,
+                    max_value,
+                    benchmark_min_max=benchmark_min_max,
+                    qualified_benchmarks=qualified_benchmarks,
+                )
 
                 print(format_table(
                     us_entries,
                     "🇺🇸 United States - Top 10 Models (Enriched)",
                     all_headers,
                     max_col_width=args.max_col_width,
-                    include_derived=True,
-                    benchmark_headers=benchmark_headers,
-                    participation=participation_counts,
-                    max_participation=max_participation,
-                    min_avg_iq=min_avg_iq,
-                    max_avg_iq=max_avg_iq,
-                    min_value=min_value,
-                    max_value=max_value,
-                    benchmark_min_max=benchmark_min_max,
-                    qualified_benchmarks=qualified_benchmarks,
+                    scored=scored,
                 ))
 
                 print(format_table(
@@ -1612,16 +1853,7 @@ def run_scraper(args):
                     "🇨🇳 China - Top 10 Models (Enriched)",
                     all_headers,
                     max_col_width=args.max_col_width,
-                    include_derived=True,
-                    benchmark_headers=benchmark_headers,
-                    participation=participation_counts,
-                    max_participation=max_participation,
-                    min_avg_iq=min_avg_iq,
-                    max_avg_iq=max_avg_iq,
-                    min_value=min_value,
-                    max_value=max_value,
-                    benchmark_min_max=benchmark_min_max,
-                    qualified_benchmarks=qualified_benchmarks,
+                    scored=scored,
                 ))
 
                 # Metadata stage used to also write stage3_us.csv and stage3_cn.csv,
@@ -1636,17 +1868,13 @@ def run_scraper(args):
                     us_entries,
                     cn_entries,
                     all_headers,
-                    benchmark_headers,
-                    participation_counts,
-                    max_participation,
-                    min_avg_iq,
-                    max_avg_iq,
-                    min_value,
-                    max_value,
-                    benchmark_min_max=benchmark_min_max,
-                    qualified_benchmarks=qualified_benchmarks,
+                    scored,
+                )
+                prepend_history(
+                    models_path,
+                    new_entry,
+                    write_legacy=not getattr(args, "no_legacy_models_json", False),
                 )
-                prepend_history(models_path, new_entry)
 
                 # Bump sitemap.xml <lastmod> on the daily-refresh URLs so crawlers
                 # actually see the new content as fresh. Uses the new entry's
@@ -1686,15 +1914,7 @@ def run_scraper(args):
                     us_entries,
                     cn_entries,
                     all_headers,
-                    benchmark_headers,
-                    participation_counts,
-                    max_participation,
-                    min_avg_iq,
-                    max_avg_iq,
-                    min_value,
-                    max_value,
-                    benchmark_min_max=benchmark_min_max,
-                    qualified_benchmarks=qualified_benchmarks,
+                    scored,
                 )
                 dry_path = workspace_dir / f"stage{stage_num}_dryrun.json"
                 with open(dry_path, "w", encoding="utf-8") as f:
@@ -1706,9 +1926,20 @@ def run_scraper(args):
                 print(f"Benchmarks in final set: {len(benchmark_headers)}")
             
         finally:
+            if pipeline is not None:
+                pipeline.close()
+            if detail_pages is not None:
+                detail_pages.close()
             browser.close()
 
 
+def _ttl_policy_arg(path: str) -> TtlPolicy:
+    try:
+        return TtlPolicy.from_file(Path(path))
+    except (OSError, ValueError) as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Scrape llm-stats.com leaderboard with staged architecture"
@@ -1739,6 +1970,13 @@ def main():
              "a preview to stageN_dryrun.json instead."
     )
     
+    parser.add_argument(
+        "--no-legacy-models-json",
+        action="store_true",
+        help="Don't re-export the full-history models.json. The snapshot log, "
+             "latest.json and the archive/ shards are still written."
+    )
+
     parser.add_argument(
         "--max-col-width",
         type=int,
@@ -1752,12 +1990,63 @@ def main():
         help="Run browser in visible mode (not headless)"
     )
 
+    parser.add_argument(
+        "--leaderboard-source",
+        choices=LEADERBOARD_SOURCES,
+        default="dom",
+        help="dom: read the rendered leaderboard table. feed: build the rows from the model records "
+             "the page embeds or fetches, without waiting for the table to render; falls back to "
+             "the table if the records don't cover 10 models per country or a score can't be shown on "
+             "the table's scale (default: dom)."
+    )
+
+    parser.add_argument(
+        "--country-filters",
+        action="store_true",
+        help="Load the leaderboard once per country through its Country filter, plus once for the "
+             "global ranks, instead of reading one unfiltered load (the fallback when that load "
+             "doesn't yield 10 models per country)."
+    )
+
+    parser.add_argument(
+        "--detail-workers",
+        type=int,
+        default=DEFAULT_DETAIL_WORKERS,
+        help=f"Stage 3: model detail pages loaded in parallel (default: {DEFAULT_DETAIL_WORKERS}). "
+             "1 loads them one by one, using the scraper's own page when a browser is needed."
+    )
+
+    parser.add_argument(
+        "--detail-fetch",
+        choices=DETAIL_FETCH_MODES,
+        default="http",
+        help="http: fetch detail pages with a plain HTTP client and use Chromium only for pages "
+             "whose response lacks the Next.js flight payload. browser: load every detail page in "
+             "Chromium, one headless browser per worker (default: http)."
+    )
+
     parser.add_argument(
         "--no-gap-fill",
         action="store_true",
         help="Skip the AI gap-filling pass entirely. Pass 1 and Pass 2 still run."
     )
 
+    parser.add_argument(
+        "--gap-fill-sources",
+        action="store_true",
+        help="Read previously cited source pages before calling OpenAI and fill what a deterministic "
+             f"extractor finds there. Its fills are {EXTRACTED_CONFIDENCE} confidence, so this also "
+             f"needs --gap-fill-min-confidence {EXTRACTED_CONFIDENCE} (default: off)."
+    )
+
+    parser.add_argument(
+        "--gap-fill-min-confidence",
+        choices=CONFIDENCE_LEVELS,
+        default="high",
+        help="Lowest confidence of a gap-fill result that is applied; lower ones are cached "
+             "but dropped (default: high)."
+    )
+
     parser.add_argument(
         "--gap-fill-max-calls",
         type=int,
@@ -1766,6 +2055,74 @@ def main():
              "Set low (e.g. 2) for smoke testing."
     )
 
+    parser.add_argument(
+        "--gap-fill-workers",
+        type=int,
+        default=DEFAULT_GAP_FILL_WORKERS,
+        help=f"OpenAI calls kept in flight at once during gap-filling (default: {DEFAULT_GAP_FILL_WORKERS}). "
+             "All workers share one request/token rate limiter; 1 runs the calls serially."
+    )
+
+    parser.add_argument(
+        "--gap-fill-mode",
+        choices=GAP_FILL_MODES,
+        default="sync",
+        help="sync: call the Responses API now. batch: apply the results of the batch a previous "
+             "run submitted (once finished) and submit this run's lookups through the Batch API; "
+             "the batch id is kept in data/ai_gap_batch.json (default: sync)."
+    )
+
+    parser.add_argument(
+        "--gap-fill-token-budget",
+        type=int,
+        default=None,
+        help="Stop gap-filling before the first OpenAI call predicted to take this run past this many "
+             "tokens (input + output). Default: no token budget."
+    )
+
+    parser.add_argument(
+        "--gap-fill-cost-budget",
+        type=float,
+        default=None,
+        help="Same as --gap-fill-token-budget, in US dollars at the gap_fill_ledger price table. "
+             "Each run's usage is appended to data/ai_gap_ledger.jsonl. Default: no cost budget."
+    )
+
+    parser.add_argument(
+        "--gap-fill-priority",
+        choices=GAP_FILL_PRIORITIES,
+        default="value",
+        help="value: spend the call budget on the lookups whose fills would most change the Pass 2 "
+             "qualified set / top 10 per predicted token (what-if rescoring). heuristic: tier and "
+             "top-cohort order only (default: value)."
+    )
+
+    parser.add_argument(
+        "--gap-fill-pipelined",
+        action="store_true",
+        help="Start gap-fill lookups while detail pages are still being scraped, from each model's "
+             "parsed cells plus the previous snapshot; results are applied after the sparse drop, "
+             "only to cells that are still gaps. Sync mode only."
+    )
+
+    parser.add_argument(
+        "--gap-fill-grouping",
+        choices=GAP_FILL_GROUPINGS,
+        default="model",
+        help="model: one OpenAI call per model. organization: up to 3 models of the same organization "
+             "share a call, since their scores usually come from the same vendor pages; the pass "
+             "reports the calls this saved (default: model)."
+    )
+
+    parser.add_argument(
+        "--gap-fill-ttl-policy",
+        type=_ttl_policy_arg,
+        default=None,
+        metavar="FILE",
+        help="JSON list of cache TTL rules (source_types, confidences, min/max_model_age_days, ttl_days) "
+             "replacing the built-in table in scripts/gap_fill_ttl.py."
+    )
+
     args = parser.parse_args()
     
     run_scraper(args)
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Random access to history snapshots without parsing the whole file.
+
+Every consumer of the history only ever wants one snapshot (usually the
+latest) or a short run of them, but ``json.load(models.json)`` materializes
+all ~180 of them — a 6.8 MB parse and ~10× that in Python objects — just to
+read ``history[0]``. SnapshotReader instead keeps a sidecar byte-offset index
+of where each snapshot lives in the file, mmaps the file, and parses only the
+slices it is asked for.
+
+Three layouts are understood, picked from the file name:
+
+- ``*.delta.ndjson`` — the delta-encoded log (history_delta.py). The index also
+  records which lines are keyframes, so ``get(i)`` replays at most one keyframe
+  interval of deltas.
+- ``*.ndjson`` — the full snapshot log, one snapshot per line.
+- anything else — a models.json-shaped document (models.json, latest.json). For
+  the indent=2 layout history_store writes, element boundaries are found with
+  a handful of ``find`` calls (~6× cheaper than the parse it replaces); any
+  other layout falls back to a string-aware bracket scan. Either only runs
+  when the index is missing or stale.
+
+Indexes are cached next to the file as ``.<name>.idx`` and keyed on its size,
+mtime and inode. The logs only ever grow by appending, so a log that got
+longer in place is indexed incrementally from the old end.
+
+Indices are newest first, matching ``history[i]``: ``get(0)`` is the latest
+snapshot and ``iter_range(a, b)`` yields ``history[a:b]``.
+
+A log line that doesn't decode (the torn tail of an append that died) is
+skipped, as history_store's own readers do: the first time it is parsed it is
+dropped from the index, and the lookup is retried against the lines that
+remain.
+
+Usage:
+    python scripts/snapshot_reader.py [path] [--index N]
+"""
+import argparse
+import bisect
+import json
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from history_delta import KEYFRAME, apply_delta
+
+INDEX_VERSION = 1
+
+# Newest-first site documents, in the order site_document prefers them.
+SITE_DOCUMENTS = ("latest.json", "models.json")
+
+KIND_LOG = "ndjson"
+KIND_DELTA = "delta"
+KIND_DOCUMENT = "document"
+
+# A JSON string (escapes included) or a structural bracket. Matching whole
+# strings in one regex step keeps brackets inside model descriptions from
+# confusing the depth count without a Python-level loop over every byte.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+_HISTORY_KEY = b'"history"'
+_KEYFRAME_PREFIX = ('{"type":"%s"' % KEYFRAME).encode("utf-8")
+
+
+def _kind_for(path: Path) -> str:
+    if path.name.endswith(".delta.ndjson"):
+        return KIND_DELTA
+    if path.suffix == ".ndjson":
+        return KIND_LOG
+    return KIND_DOCUMENT
+
+
+def index_path_for(path: Path) -> Path:
+    return path.with_name(f".{path.name}.idx")
+
+
+# -----------------------------------------------------------------------------
+# Index building
+# -----------------------------------------------------------------------------
+
+
+def _scan_lines(buf, start: int, end: int) -> List[Tuple[int, int]]:
+    spans: List[Tuple[int, int]] = []
+    pos = start
+    while pos < end:
+        nl = buf.find(b"\n", pos, end)
+        stop = end if nl == -1 else nl
+        if buf[pos:stop].strip():
+            spans.append((pos, stop))
+        pos = stop + 1
+    return spans
+
+
+def _scan_indented_document(buf) -> Optional[List[Tuple[int, int]]]:
+    """Fast path for documents written by history_store._write_json (indent=2).
+
+    JSON strings can't hold a raw newline, so in that layout a line that is
+    exactly four spaces and a brace can only be a history element boundary.
+    Returns None if the file isn't laid out that way.
+    """
+    key = buf.find(b'\n  "history": [')
+    if key == -1:
+        return None
+    pos = buf.find(b"\n", key + 1)
+    spans: List[Tuple[int, int]] = []
+    while buf[pos:pos + 6] == b"\n    {":
+        start = pos + 5
+        close = buf.find(b"\n    }", start)
+        if close == -1:
+            return None
+        spans.append((start, close + 6))
+        pos = close + 6
+        if buf[pos:pos + 1] == b",":
+            pos += 1
+    if not spans or buf[pos:pos + 4] != b"\n  ]":
+        return None
+    return spans
+
+
+def _scan_document(buf) -> List[Tuple[int, int]]:
+    """Return the byte spans of each element of the top-level ``history`` array."""
+    spans = _scan_indented_document(buf)
+    if spans is not None:
+        return spans
+    spans = []
+    depth = 0
+    array_depth = None   # depth inside the history array, once found
+    key_pending = False  # saw "history" at depth 1; next "[" opens the array
+    elem_start = 0
+    for m in _TOKEN.finditer(buf):
+        tok = buf[m.start():m.start() + 1]
+        if tok == b'"':
+            if depth == 1 and array_depth is None and m.group() == _HISTORY_KEY:
+                key_pending = True
+            continue
+        if tok in (b"{", b"["):
+            depth += 1
+            if key_pending and tok == b"[":
+                array_depth = depth
+                key_pending = False
+            elif array_depth is not None and depth == array_depth + 1:
+                elem_start = m.start()
+        else:
+            if array_depth is not None:
+                if depth == array_depth + 1:
+                    spans.append((elem_start, m.end()))
+                elif depth == array_depth:
+                    break
+            depth -= 1
+    return spans
+
+
+def _keyframe_positions(buf, spans: List[Tuple[int, int]], offset: int = 0) -> List[int]:
+    plen = len(_KEYFRAME_PREFIX)
+    return [
+        offset + pos
+        for pos, (start, _) in enumerate(spans)
+        if buf[start:start + plen] == _KEYFRAME_PREFIX
+    ]
+
+
+def _file_key(path: Path) -> Dict[str, int]:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def _load_index(index_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if index.get("version") != INDEX_VERSION:
+        return None
+    return index
+
+
+def _save_index(index_path: Path, index: Dict[str, Any]) -> None:
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        tmp_path.replace(index_path)
+    except OSError as e:
+        # A read-only checkout still works, it just re-scans every time.
+        print(f"Warning: could not write snapshot index {index_path.name} ({e})")
+
+
+# -----------------------------------------------------------------------------
+# Reader
+# -----------------------------------------------------------------------------
+
+
+class _Unreadable(Exception):
+    """A log line failed to decode and has been dropped from the index."""
+
+
+class SnapshotReader:
+    """Lazy, index-backed view of the snapshots in one history file."""
+
+    def __init__(self, path: Path, use_index_cache: bool = True):
+        self.path = Path(path)
+        self.kind = _kind_for(self.path)
+        self._use_index_cache = use_index_cache
+        self._file = open(self.path, "rb")
+        try:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Zero-length files can't be mapped.
+            self._buf = b""
+        self._spans, self._keyframes = self._ensure_index()
+
+    # -- index -------------------------------------------------------------
+
+    def _ensure_index(self) -> Tuple[List[Tuple[int, int]], List[int]]:
+        key = _file_key(self.path)
+        index_path = index_path_for(self.path)
+        cached = _load_index(index_path) if self._use_index_cache else None
+
+        if cached and cached.get("kind") == self.kind:
+            spans = [tuple(s) for s in cached["spans"]]
+            keyframes = cached.get("keyframes", [])
+            if all(cached.get(k) == v for k, v in key.items()):
+                return spans, keyframes
+            # Logs are append-only: same inode, larger size, old end on a line
+            # boundary means only the tail needs scanning.
+            old_size = cached.get("size", 0)
+            if (
+                self.kind != KIND_DOCUMENT
+                and cached.get("inode") == key["inode"]
+                and 0 < old_size <= key["size"]
+                and self._buf[old_size - 1:old_size] == b"\n"
+            ):
+                tail = _scan_lines(self._buf, old_size, key["size"])
+                if self.kind == KIND_DELTA:
+                    keyframes = keyframes + _keyframe_positions(self._buf, tail, len(spans))
+                spans = spans + tail
+                self._write_index(key, spans, keyframes)
+                return spans, keyframes
+
+        if self.kind == KIND_DOCUMENT:
+            spans = _scan_document(self._buf)
+        else:
+            spans = _scan_lines(self._buf, 0, len(self._buf))
+        keyframes = _keyframe_positions(self._buf, spans) if self.kind == KIND_DELTA else []
+        self._write_index(key, spans, keyframes)
+        return spans, keyframes
+
+    def _write_index(self, key: Dict[str, int], spans, keyframes: List[int]) -> None:
+        if not self._use_index_cache:
+            return
+        _save_index(
+            index_path_for(self.path),
+            {"version": INDEX_VERSION, "kind": self.kind, **key,
+             "spans": [list(s) for s in spans], "keyframes": keyframes},
+        )
+
+    # -- access ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def _file_pos(self, i: int) -> int:
+        """Map a newest-first index to a position in file order."""
+        n = len(self._spans)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"snapshot index {i} out of range ({n} snapshots)")
+        # Logs are stored oldest first; documents newest first.
+        return i if self.kind == KIND_DOCUMENT else n - 1 - i
+
+    def _parse(self, pos: int) -> Dict[str, Any]:
+        start, end = self._spans[pos]
+        try:
+            return json.loads(self._buf[start:end])
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            if self.kind == KIND_DOCUMENT:
+                raise
+            # Same policy as history_store._decode_line.
+            print(f"Warning: skipping unreadable line in {self.path.name} ({e})")
+            self._drop(pos)
+            raise _Unreadable from e
+
+    def _drop(self, pos: int) -> None:
+        """Forget the line at file position ``pos`` and save the pruned index."""
+        del self._spans[pos]
+        self._keyframes = [k - (k > pos) for k in self._keyframes if k != pos]
+        self._write_index(_file_key(self.path), self._spans, self._keyframes)
+
+    def _decode_forward(self, first: int, last: int) -> Iterator[Dict[str, Any]]:
+        """Yield decoded delta-log snapshots at file positions first..last."""
+        k = bisect.bisect_right(self._keyframes, first) - 1
+        if k < 0:
+            # Maybe the keyframe is there but torn: parsing drops it, and the caller retries.
+            for pos in range(first + 1):
+                self._parse(pos)
+            raise ValueError(f"{self.path.name} does not start with a keyframe")
+        current: Optional[Dict[str, Any]] = None
+        for pos in range(self._keyframes[k], last + 1):
+            record = self._parse(pos)
+            if record.get("type") == KEYFRAME:
+                current = record["snapshot"]
+            else:
+                current = apply_delta(current, record)
+            if pos >= first:
+                yield current
+
+    def get(self, i: int) -> Dict[str, Any]:
+        """Return ``history[i]`` (0 = latest)."""
+        while True:
+            pos = self._file_pos(i)
+            try:
+                if self.kind == KIND_DELTA:
+                    return next(self._decode_forward(pos, pos))
+                return self._parse(pos)
+            except _Unreadable:
+                continue
+
+    @property
+    def since_keyframe(self) -> int:
+        """Delta log only: records written since (and including) the last keyframe."""
+        return len(self._spans) - self._keyframes[-1] if self._keyframes else 0
+
+    def latest(self) -> Dict[str, Any]:
+        """Return the newest snapshot."""
+        return self.get(0)
+
+    def iter_range(self, a: int, b: int) -> Iterator[Dict[str, Any]]:
+        """Yield ``history[a:b]``, newest first."""
+        a, b, _ = slice(a, b).indices(len(self._spans))
+        if self.kind == KIND_DELTA:
+            while a < min(b, len(self._spans)):
+                first, last = self._file_pos(min(b, len(self._spans)) - 1), self._file_pos(a)
+                try:
+                    decoded = list(self._decode_forward(first, last))
+                except _Unreadable:
+                    continue
+                yield from reversed(decoded)
+                return
+            return
+        i = a
+        while i < min(b, len(self._spans)):
+            try:
+                snapshot = self._parse(self._file_pos(i))
+            except _Unreadable:
+                continue  # the next older line now sits at i
+            yield snapshot
+            i += 1
+
+    def close(self) -> None:
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._file.close()
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def site_document(workspace_dir: Path) -> Optional[Path]:
+    """The published document to read the latest snapshot from, or None.
+
+    latest.json is rewritten on every run; models.json only while the legacy
+    export is on (``--no-legacy-models-json`` leaves it stale or absent), so it
+    is only the fallback for a tree that hasn't published latest.json yet.
+    """
+    for name in SITE_DOCUMENTS:
+        path = Path(workspace_dir) / name
+        if path.exists():
+            return path
+    return None
+
+
+def read_latest(path: Path) -> Dict[str, Any]:
+    """Return the newest snapshot in ``path``, raising ValueError if there is none."""
+    with SnapshotReader(path) as reader:
+        try:
+            return reader.latest()
+        except IndexError:
+            raise ValueError(f"No history entries in {Path(path).name}") from None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a history file through the snapshot index")
+    parser.add_argument("path", nargs="?", default=str(Path(__file__).resolve().parent.parent / "models.json"))
+    parser.add_argument("--index", type=int, default=0, help="Snapshot to print (0 = latest)")
+    args = parser.parse_args()
+
+    with SnapshotReader(Path(args.path)) as reader:
+        print(f"{reader.path.name}: {len(reader)} snapshots ({reader.kind})")
+        if len(reader):
+            snapshot = reader.get(args.index)
+            teams = snapshot.get("teams", {})
+            counts = ", ".join(f"{code} {len(rows)}" for code, rows in teams.items())
+            print(f"history[{args.index}]: {snapshot.get('timestamp', '?')} — {counts}")
+
+
+if __name__ == "__main__":
+    main()